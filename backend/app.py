@@ -5,19 +5,36 @@ import requests
 import google.auth.transport.requests
 from flask import Flask, session, Response as FlaskResponse, abort, redirect, request, jsonify, send_from_directory
 from flask_cors import CORS
-from google.oauth2 import id_token, credentials as google_credentials
+from google.oauth2 import id_token
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
 from pip._vendor import cachecontrol
 from functools import wraps
-from datetime import datetime, timezone
-from dateutil.parser import parse
+from html import escape
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import func, insert, select, update
+import base64
+import queue
+import threading
+import time
 import uuid
 import json
+import numpy as np
 
 from config import config
-from models import db, Event, AvailabilitySlot, Response, init_app
+from models import db, Event, AvailabilitySlot, AvailabilityBitmap, AvailabilityChange, Response, init_app
+from availability_storage import anonymous_name, insert_ignoring_conflicts, participant_key, resolve_slot_indices
 from meta_middleware import MetaTagMiddleware
+from slot_grid import MINUTES_PER_DAY, SLOT_MINUTES, SlotGrid, parse_time
+from best_times import MAX_LIMIT as MAX_BEST_TIMES_LIMIT, find_best_times
+from event_cache import EventCache, EventMetadata, load_event_metadata, load_event_version, render_page
+from calendar_cache import CalendarCache, merge_events
+from slot_counts import apply_deltas as apply_slot_count_deltas, read_counts as read_slot_counts
+from notifications import NotificationBus
+from instrumentation import Instrumentation, query_budget
+from metrics import AVAILABILITY_ROWS_WRITTEN, MetricsExporter, render as render_metrics
+from cache_invalidation import CacheInvalidator
+from calendar_service import credentials_from_session, fetch_busy_intervals, fetch_calendar_events, get_calendar_service
 
 # === Flask App Factory ===
 def create_app(config_name='default'):
@@ -32,6 +49,7 @@ def create_app(config_name='default'):
     
     # Initialize extensions
     db.init_app(app)
+    app.extensions['instrumentation'] = Instrumentation(app, db)
     
     # Configure CORS
     CORS(app, 
@@ -68,6 +86,59 @@ def create_app(config_name='default'):
         redirect_uri=redirect_uri
     )
     
+    # === Event Metadata Cache ===
+    event_cache = EventCache(
+        load_event_metadata,
+        max_size=app.config['EVENT_CACHE_SIZE'],
+        ttl=app.config['EVENT_CACHE_TTL']
+    )
+    app.extensions['event_cache'] = event_cache
+    
+    # === Calendar Cache ===
+    calendar_cache = CalendarCache(
+        ttl=app.config['CALENDAR_CACHE_TTL'],
+        max_users=app.config['CALENDAR_CACHE_MAX_USERS']
+    )
+    app.extensions['calendar_cache'] = calendar_cache
+    
+    # === Cross-Worker Notifications ===
+    notification_bus = NotificationBus(db)
+    app.extensions['notification_bus'] = notification_bus
+    
+    @app.before_request
+    def start_notification_listener():
+        notification_bus.ensure_listening()
+    
+    # === Cross-Worker Cache Invalidation ===
+    event_versions = EventCache(
+        load_event_version,
+        max_size=app.config['EVENT_VERSION_CACHE_SIZE'],
+        ttl=app.config['EVENT_VERSION_CACHE_TTL']
+    )
+    app.extensions['event_versions'] = event_versions
+    
+    # Keyed by (event ID, site root); loaded by event_page
+    crawler_pages = EventCache(
+        None,
+        max_size=app.config['CRAWLER_PAGE_CACHE_SIZE'],
+        ttl=app.config['CRAWLER_PAGE_CACHE_TTL']
+    )
+    app.extensions['crawler_pages'] = crawler_pages
+    
+    cache_invalidator = CacheInvalidator(notification_bus)
+    cache_invalidator.register('event', event_cache, crawler_pages)
+    cache_invalidator.register('availability', event_versions)
+    app.extensions['cache_invalidator'] = cache_invalidator
+    
+    # === Metrics ===
+    metrics_exporter = MetricsExporter(db, {
+        'event': event_cache,
+        'event_version': event_versions,
+        'calendar': calendar_cache,
+        'crawler_page': crawler_pages
+    })
+    app.extensions['instrumentation'].listeners.append(metrics_exporter.record_request)
+    
     # === Auth Decorator ===
     def login_is_required(function):
         @wraps(function)
@@ -77,6 +148,256 @@ def create_app(config_name='default'):
             return function(*args, **kwargs)
         return wrapper
     
+    # === Availability Helpers ===
+    def format_slot_id(event, slot):
+        """
+        Build the client slot ID for a slot row (anything with slot_index and
+        date/day_of_week/start_time), using the grid index when it has one
+        """
+        if slot.slot_index is not None:
+            return event.grid.slot_id(slot.slot_index)
+        if event.event_type == 'daysOfWeek':
+            return f"{slot.day_of_week}-{slot.start_time}"
+        return f"{slot.date}-{slot.start_time}"
+
+    def resolve_slot_ids(event, selected_slots):
+        """
+        Map client slot IDs to {slot index: AvailabilitySlot id} for an event,
+        creating any missing slots (see resolve_slot_indices). Raises
+        ValueError for slots that are not on the grid.
+        """
+        # Map and de-duplicate the requested slots, preserving order
+        return resolve_slot_indices(event, dict.fromkeys(event.grid.slot_index(slot_id) for slot_id in selected_slots))
+
+    def insert_responses(event_id, slot_ids, user_id, user_name):
+        """Insert one Response row per slot in a single bulk statement"""
+        if not slot_ids:
+            return
+        db.session.execute(insert(Response), [{
+            'event_id': event_id,
+            'slot_id': slot_id,
+            'user_id': user_id,
+            'user_name': user_name,
+            'is_available': True
+        } for slot_id in slot_ids])
+
+    def write_responses(event, user_id, user_name, selected_slots, replace):
+        """
+        Store a user's selected slots as Response rows, either replacing or
+        extending what was stored before. The stored slot set is diffed
+        against the submitted one so only changed rows are written.
+        Returns the added and removed slot indices, and the retained ones
+        when the participant's display name changed (otherwise empty).
+        """
+        # Signed-in users are identified by ID, anonymous ones by name
+        if user_id:
+            user_filter = Response.user_id == user_id
+        else:
+            user_filter = (Response.user_id.is_(None)) & (Response.user_name == user_name)
+
+        submitted = resolve_slot_ids(event, selected_slots)
+        existing = dict(db.session.execute(
+            select(Response.slot_id, AvailabilitySlot.slot_index)
+            .join(AvailabilitySlot, Response.slot_id == AvailabilitySlot.id)
+            .where(Response.event_id == event.id, user_filter)
+        ).all())
+        submitted_ids = set(submitted.values())
+
+        removed = [slot_id for slot_id in existing if slot_id not in submitted_ids] if replace else []
+        added = [index for index, slot_id in submitted.items() if slot_id not in existing]
+
+        if removed:
+            Response.query.filter(
+                Response.event_id == event.id,
+                user_filter,
+                Response.slot_id.in_(removed)
+            ).delete(synchronize_session=False)
+
+        # Keep the display name on retained rows in sync when a signed-in user renames
+        renamed = []
+        retained = [slot_id for slot_id in existing if slot_id not in removed]
+        if user_id and retained and Response.query.filter(
+            Response.event_id == event.id,
+            user_filter,
+            Response.user_name != user_name
+        ).update({Response.user_name: user_name}, synchronize_session=False) > 0:
+            renamed = [existing[slot_id] for slot_id in retained if existing[slot_id] is not None]
+
+        insert_responses(event.id, [submitted[index] for index in added], user_id, user_name)
+        # Legacy slots off the grid have no index and are not counted
+        return added, [existing[slot_id] for slot_id in removed if existing[slot_id] is not None], renamed
+
+    def apply_availability_changes(event_id, user_id, user_name, added, removed, renamed=()):
+        """
+        Apply the side effects of a user's availability write in the current
+        transaction: bump the event version (invalidating it in every worker),
+        adjust the per-slot counts, append the added and removed slot indices
+        to the delta-sync change log and publish them to the event's live streams.
+        `renamed` are slots the participant kept under a new display name; they
+        are logged and published as added again so clients pick up the name.
+        A write that changed nothing leaves the event untouched.
+        """
+        if not (added or removed or renamed):
+            return
+
+        # Bump the version first: the row lock it takes serializes writers per
+        # event, so change log ids are allocated in commit order
+        db.session.execute(update(Event).where(Event.id == event_id).values(version=Event.version + 1))
+        cache_invalidator.publish(event_id, 'availability')
+        apply_slot_count_deltas(event_id, added, removed)
+
+        changes = [(index, True) for index in [*added, *renamed]] + [(index, False) for index in removed]
+        if not changes:
+            return
+
+        change_ids = db.session.scalars(insert(AvailabilityChange).returning(AvailabilityChange.id), [{
+            'event_id': event_id,
+            'slot_index': index,
+            'user_id': user_id,
+            'user_name': user_name,
+            'is_available': is_available
+        } for index, is_available in changes]).all()
+
+        # Push the delta to live streams once the transaction commits; deltas
+        # too large for a notification tell the streams to resync instead
+        cursor = max(change_ids)
+        topic = f"availability:{event_id}"
+        if not notification_bus.publish(topic, {
+            'cursor': cursor,
+            'userId': user_id,
+            'userName': user_name,
+            'added': [*added, *renamed],
+            'removed': list(removed)
+        }):
+            notification_bus.publish(topic, {'cursor': cursor, 'resync': True})
+
+    def record_rows_written(added, removed):
+        """Count the availability rows a committed write touched (one bitmap, or one Response per slot)"""
+        storage = app.config['AVAILABILITY_STORAGE']
+        AVAILABILITY_ROWS_WRITTEN.labels(storage=storage).inc(1 if use_bitmap_storage() else len(added) + len(removed))
+
+    def latest_change_id(event_id):
+        """Get the delta-sync cursor for the current state of an event (0 before any change)"""
+        latest = select(func.max(AvailabilityChange.id)).where(AvailabilityChange.event_id == event_id).scalar_subquery()
+        # After its whole log was pruned, an event's cursor stays at the pruning horizon
+        return db.session.scalar(
+            select(func.coalesce(latest, Event.changes_pruned_through)).where(Event.id == event_id)
+        )
+
+    # === Conditional GET Helpers ===
+    def availability_etag(event_id):
+        """Strong ETag for the availability of an event, derived from its version counter"""
+        return f"{event_id}-{event_versions.get(event_id)}"
+
+    def not_modified(etag):
+        """304 response for a request whose If-None-Match already matches `etag`, or None"""
+        if not request.if_none_match.contains(etag):
+            return None
+        return with_etag(FlaskResponse(status=304), etag)
+
+    def with_etag(response, etag):
+        """Tag a response and make clients revalidate it on every use"""
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    # === Bitmap Storage Helpers ===
+    def use_bitmap_storage():
+        """Whether availability is stored as one AvailabilityBitmap per participant"""
+        return app.config['AVAILABILITY_STORAGE'] == 'bitmap'
+
+    def write_bitmap(event, user_id, user_name, selected_slots, replace):
+        """
+        Store a user's selected slots in their bitmap, either replacing or
+        extending what was stored before. Returns the added and removed slot
+        indices, and the retained ones when the participant's display name
+        changed (otherwise empty).
+        """
+        grid = event.grid
+        submitted = grid.mask(selected_slots)
+
+        # Same participant key as write_responses and the unique indexes on availability_bitmaps
+        if user_id:
+            user_filter = AvailabilityBitmap.user_id == user_id
+        else:
+            user_filter = (AvailabilityBitmap.user_id.is_(None)) & (AvailabilityBitmap.user_name == user_name)
+
+        def load_bitmap():
+            # Locked so concurrent writes for the same participant apply in turn
+            return AvailabilityBitmap.query.filter(
+                AvailabilityBitmap.event_id == event.id, user_filter
+            ).with_for_update().first()
+
+        bitmap = load_bitmap()
+        if bitmap is None:
+            created = db.session.execute(
+                insert_ignoring_conflicts(AvailabilityBitmap).values(
+                    event_id=event.id,
+                    user_id=user_id,
+                    user_name=user_name,
+                    bits=grid.pack(submitted)
+                ).returning(AvailabilityBitmap.id)
+            ).first()
+            if created:
+                return grid.indices(submitted), [], []
+            # A concurrent first submission for this participant won the insert
+            bitmap = load_bitmap()
+
+        stored = SlotGrid.unpack(bitmap.bits)
+        mask = submitted if replace else stored | submitted
+        renamed = grid.indices(mask & stored) if bitmap.user_name != user_name else []
+        if mask != stored:
+            bitmap.bits = grid.pack(mask)
+        bitmap.user_name = user_name
+
+        return grid.indices(mask & ~stored), grid.indices(stored & ~mask), renamed
+
+    def load_bitmaps(event_id):
+        """Get every participant bitmap for an event in response order"""
+        return AvailabilityBitmap.query.filter_by(event_id=event_id).order_by(
+            AvailabilityBitmap.created_at, AvailabilityBitmap.id
+        ).all()
+
+    def load_availability_matrix(event, grid):
+        """
+        Build a participants x slots boolean matrix for an event from
+        whichever storage mode is active. Returns (display names, matrix);
+        participants are told apart by participant_key, so two of them may
+        share a name.
+        """
+        if use_bitmap_storage():
+            bitmaps = load_bitmaps(event.id)
+            participants = {}
+            for bitmap in bitmaps:
+                participants.setdefault(participant_key(bitmap.user_id, bitmap.user_name), bitmap.user_name)
+            user_index = {key: index for index, key in enumerate(participants)}
+            matrix = np.zeros((len(participants), grid.size), dtype=bool)
+            for bitmap in bitmaps:
+                bits = np.unpackbits(np.frombuffer(bitmap.bits, dtype=np.uint8), bitorder='little')
+                row = user_index[participant_key(bitmap.user_id, bitmap.user_name)]
+                matrix[row, :min(grid.size, len(bits))] |= bits[:grid.size].astype(bool)
+            return list(participants.values()), matrix
+
+        anonymous = anonymous_name(Response)
+        rows = db.session.execute(
+            select(Response.user_id, anonymous, func.max(Response.user_name).label('user_name'), AvailabilitySlot.slot_index)
+            .join(AvailabilitySlot, Response.slot_id == AvailabilitySlot.id)
+            .where(Response.event_id == event.id, AvailabilitySlot.slot_index.isnot(None))
+            .group_by(Response.user_id, anonymous, AvailabilitySlot.slot_index)
+            .order_by(func.min(Response.created_at))
+        ).all()
+
+        participants = {}
+        for row in rows:
+            participants.setdefault((row[0], row[1]), row.user_name)
+        user_index = {key: index for index, key in enumerate(participants)}
+        user_rows = [user_index[(row[0], row[1])] for row in rows]
+        slot_columns = [row.slot_index for row in rows]
+
+        matrix = np.zeros((len(participants), grid.size), dtype=bool)
+        matrix[user_rows, slot_columns] = True
+        return list(participants.values()), matrix
+
     # === Routes ===
     @app.route('/api/login')
     def login():
@@ -158,14 +479,37 @@ def create_app(config_name='default'):
         
         return jsonify(user_info)
     
+    @app.route('/api/metrics', methods=['GET'])
+    def get_metrics():
+        """Prometheus metrics aggregated over every worker process"""
+        token = app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f"Bearer {token}":
+            return abort(401)
+        body, content_type = render_metrics()
+        return FlaskResponse(body, headers={'Content-Type': content_type})
+    
+    @app.route('/api/calendar/cache/stats', methods=['GET'])
+    @login_is_required
+    def get_calendar_cache_stats():
+        """Get hit/miss counters of the calendar events cache"""
+        return jsonify({
+            "success": True,
+            "data": calendar_cache.stats()
+        }), 200
+    
     @app.route('/api/calendar/events', methods=['GET'])
     @login_is_required
     def get_calendar_events():
-        """Get calendar events for a specific date range"""
+        """
+        Get calendar events for a specific date range.
+        With mode=freebusy only the merged busy intervals are returned, as
+        [start, end] pairs of Unix epoch seconds, using a single FreeBusy query.
+        """
         try:
             # Get date range from query parameters
             start_date = request.args.get('startDate')
             end_date = request.args.get('endDate')
+            mode = request.args.get('mode', 'events')
             
             if not start_date or not end_date:
                 return jsonify({
@@ -182,81 +526,71 @@ def create_app(config_name='default'):
                 }), 401
             
             # Create credentials object
-            creds = google_credentials.Credentials(
-                token=creds_data['token'],
-                refresh_token=creds_data['refresh_token'],
-                token_uri=creds_data['token_uri'],
-                client_id=creds_data['client_id'],
-                client_secret=creds_data['client_secret'],
-                scopes=creds_data['scopes']
-            )
+            creds = credentials_from_session(creds_data)
+            
+            try:
+                start = date.fromisoformat(start_date)
+                end = date.fromisoformat(end_date)
+            except ValueError:
+                return jsonify({
+                    "success": False,
+                    "message": "startDate and endDate must be YYYY-MM-DD dates"
+                }), 400
             
-            # Build calendar service
-            service = build('calendar', 'v3', credentials=creds)
+            # Shared calendar client; requests are made with the user's credentials
+            service = get_calendar_service(app.config['CALENDAR_API_ROOT_URL'])
             
-            # Get calendar list
-            calendar_list = service.calendarList().list().execute()
-            all_events = []
+            if mode == 'freebusy':
+                busy, failed_calendars = fetch_busy_intervals(
+                    service,
+                    creds,
+                    f"{start.isoformat()}T00:00:00Z",
+                    f"{end.isoformat()}T23:59:59Z",
+                    timeout=app.config['CALENDAR_REQUEST_TIMEOUT']
+                )
+                return jsonify({
+                    "success": True,
+                    "data": {
+                        "busy": busy,
+                        "partial": bool(failed_calendars),
+                        "failedCalendars": failed_calendars
+                    }
+                }), 200
             
-            # Convert dates to ISO format
-            time_min = f"{start_date}T00:00:00Z"
-            time_max = f"{end_date}T23:59:59Z"
+            # Reuse cached days and only fetch the missing spans
+            if calendar_cache.enabled:
+                cached_events, missing_spans = calendar_cache.lookup(session['google_id'], start, end)
+            else:
+                cached_events, missing_spans = [], [(start, end)]
             
-            # Fetch events from each calendar
-            for calendar_entry in calendar_list.get('items', []):
-                cal_id = calendar_entry['id']
-                cal_name = calendar_entry.get('summary', 'Unnamed Calendar')
-                
-                # # Skip task calendars
-                # if 'tasks' in cal_name.lower():
-                #     continue
-                
-                events = service.events().list(
-                    calendarId=cal_id,
-                    timeMin=time_min,
-                    timeMax=time_max,
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute().get('items', [])
+            all_events = list(cached_events)
+            failed_calendars = []
+            for span_start, span_end in missing_spans:
+                # Fetch events from all calendars concurrently
+                events, failed = fetch_calendar_events(
+                    service,
+                    creds,
+                    f"{span_start.isoformat()}T00:00:00Z",
+                    f"{span_end.isoformat()}T23:59:59Z",
+                    max_workers=app.config['CALENDAR_FETCH_WORKERS'],
+                    timeout=app.config['CALENDAR_REQUEST_TIMEOUT']
+                )
+                all_events.extend(events)
+                failed_calendars.extend(name for name in failed if name not in failed_calendars)
                 
-                for event in events:
-                    # # Skip all-day events and tasks
-                    # if 'date' in event['start'] or event.get('eventType') == 'default':
-                    #     continue
-                    
-                    # Get event start and end times
-                    start = event['start'].get('dateTime')
-                    end = event['end'].get('dateTime')
-                    
-                    # Skip if no specific time (all-day event)
-                    if not start or not end:
-                        continue
-                    
-                    # Parse dates
-                    try:
-                        start_dt = parse(start)
-                        end_dt = parse(end)
-                        
-                        # Convert to local time if needed
-                        if start_dt.tzinfo is None:
-                            start_dt = start_dt.replace(tzinfo=timezone.utc)
-                        if end_dt.tzinfo is None:
-                            end_dt = end_dt.replace(tzinfo=timezone.utc)
-                        
-                        all_events.append({
-                            'summary': event.get('summary', 'No Title'),
-                            'start': start_dt.isoformat(),
-                            'end': end_dt.isoformat(),
-                            'calendar': cal_name
-                        })
-                    except Exception as e:
-                        print(f"Error parsing event date: {str(e)}")
-                        continue
+                # Only complete results are cached
+                if calendar_cache.enabled and not failed:
+                    calendar_cache.store(session['google_id'], span_start, span_end, events)
+            
+            if cached_events:
+                all_events = merge_events(all_events)
             
             return jsonify({
                 "success": True,
                 "data": {
-                    "events": all_events
+                    "events": all_events,
+                    "partial": bool(failed_calendars),
+                    "failedCalendars": failed_calendars
                 }
             }), 200
             
@@ -313,6 +647,13 @@ def create_app(config_name='default'):
             # Get creator's name from session
             creator_name = data['creatorName'] if 'creatorName' in data else 'Anonymous'
             
+            # Normalize the time range to minutes since midnight for the slot grid
+            try:
+                start_minute = parse_time(data['timeRange']['start'])
+                end_minute = parse_time(data['timeRange']['end']) or MINUTES_PER_DAY
+            except (KeyError, AttributeError, ValueError):
+                return jsonify({"success": False, "message": "Invalid time range"}), 400
+            
             # Generate a unique ID for the event
             event_id = str(uuid.uuid4())
             created_at = datetime.now()
@@ -324,6 +665,9 @@ def create_app(config_name='default'):
                 event_type=event_type,
                 time_start=data['timeRange']['start'],
                 time_end=data['timeRange']['end'],
+                start_minute=start_minute,
+                end_minute=end_minute,
+                slot_minutes=SLOT_MINUTES,
                 specific_days=json.dumps(data.get('specificDays', [])) if event_type == 'specificDays' else None,
                 days_of_week=json.dumps(data.get('daysOfWeek', [])) if event_type == 'daysOfWeek' else None,
                 created_at=created_at,
@@ -352,14 +696,21 @@ def create_app(config_name='default'):
                     )
                     db.session.add(slot)
                     
+            # Snapshot before commit so reading it back does not reload the row
+            metadata = EventMetadata(new_event)
+            # Drop anything other workers hold under this ID once the event exists
+            cache_invalidator.publish(new_event.id, 'event')
             db.session.commit()
             
+            # Prime the metadata cache for the requests that follow creation
+            event_cache.put(metadata.id, metadata)
+            
             return jsonify({
                 "success": True,
                 "message": "Event created successfully",
                 "data": {
                     "eventId": event_id,
-                    "event": new_event.to_dict()
+                    "event": metadata.to_dict()
                 }
             }), 201
             
@@ -376,15 +727,19 @@ def create_app(config_name='default'):
         """Get event details by ID"""
         try:
             # Get event details by ID
-            event = Event.query.filter_by(id=event_id).first()
+            event = event_cache.get(event_id)
             if not event:
                 return jsonify({"success": False, "message": "Event not found"}), 404
             event_data = event.to_dict()
             
-            return jsonify({
+            # Event metadata never changes after creation, so the body itself is the validator
+            response = jsonify({
                 "success": True,
                 "data": event_data
-            }), 200
+            })
+            response.add_etag()
+            response.headers['Cache-Control'] = 'no-cache'
+            return response.make_conditional(request)
         
         except Exception as e:
             app.logger.error(f"Error retrieving event: {str(e)}")
@@ -394,6 +749,7 @@ def create_app(config_name='default'):
             }), 500
     
     @app.route('/api/events/<event_id>/availability', methods=['POST'])
+    @query_budget(12)  # fixed statement count for any number of slots or days (tests/test_query_budget.py)
     def submit_availability(event_id):
         """
         Submit availability for an event
@@ -420,78 +776,29 @@ def create_app(config_name='default'):
                     return jsonify({"success": False, "message": f"Missing required field: {field}"}), 400
             
             # Get event and validate it exists
-            event = Event.query.filter_by(id=event_id).first()
+            event = event_cache.get(event_id)
             if not event:
                 return jsonify({"success": False, "message": "Event not found"}), 404
             
-            # Get or create availability slots
-            for slot_id in data['selectedSlots']:
-                if event.event_type == 'daysOfWeek':
-                    # Parse the slot ID (format: "DAY-HH:mm")
-                    # Handle potential -undefined suffix
-                    clean_slot_id = slot_id.split('-undefined')[0]
-                    day_of_week, time_str = clean_slot_id.split('-')
-                    
-                    # Find or create the slot
-                    slot = AvailabilitySlot.query.filter_by(
-                        event_id=event_id,
-                        day_of_week=day_of_week,
-                        start_time=time_str
-                    ).first()
-                    
-                    if not slot:
-                        # Create new slot if it doesn't exist
-                        slot = AvailabilitySlot(
-                            event_id=event_id,
-                            day_of_week=day_of_week,
-                            start_time=time_str,
-                            end_time=time_str  # You might want to calculate this based on slot duration
-                        )
-                        db.session.add(slot)
-                        db.session.flush()  # Get the slot ID
-                else:  # specificDays event
-                    # Parse the slot ID (format: "YYYY-MM-DD-HH:mm")
-                    parts = slot_id.split('-')
-                    date_str = '-'.join(parts[:3])  # Join YYYY-MM-DD
-                    time_str = parts[3]  # Get HH:mm
-                    
-                    date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    
-                    # Find or create the slot
-                    slot = AvailabilitySlot.query.filter_by(
-                        event_id=event_id,
-                        date=date,
-                        start_time=time_str
-                    ).first()
-                    
-                    if not slot:
-                        # Create new slot if it doesn't exist
-                        slot = AvailabilitySlot(
-                            event_id=event_id,
-                            date=date,
-                            start_time=time_str,
-                            end_time=time_str  # You might want to calculate this based on slot duration
-                        )
-                        db.session.add(slot)
-                        db.session.flush()  # Get the slot ID
-                
-                # Create response
-                response = Response(
-                    event_id=event_id,
-                    slot_id=slot.id,
-                    user_id=data.get('userId'),
-                    user_name=data['userName'],
-                    is_available=True
-                )
-                db.session.add(response)
+            if use_bitmap_storage():
+                added, removed, renamed = write_bitmap(event, data.get('userId'), data['userName'], data['selectedSlots'], replace=False)
+            else:
+                # Resolve all slots in bulk and insert the new responses in one statement
+                added, removed, renamed = write_responses(event, data.get('userId'), data['userName'], data['selectedSlots'], replace=False)
             
+            # Keep the per-slot counts and change log in step within the same transaction
+            apply_availability_changes(event_id, data.get('userId'), data['userName'], added, removed, renamed)
             db.session.commit()
+            record_rows_written(added, removed)
             
             return jsonify({
                 "success": True,
                 "message": "Availability submitted successfully"
             }), 201
             
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({"success": False, "message": f"Invalid slot: {str(e)}"}), 400
         except Exception as e:
             db.session.rollback()
             print(f"Error submitting availability: {str(e)}")
@@ -502,41 +809,116 @@ def create_app(config_name='default'):
 
     @app.route('/api/events/<event_id>/responses', methods=['GET'])
     def get_event_responses(event_id):
-        """Get all responses for an event"""
+        """
+        Get all responses for an event, along with a cursor for delta sync.
+        With ?since=<cursor> only the changes after that cursor are returned,
+        at most one per participant and slot, and removals as tombstones:
+        {
+            "cursor": 42,
+            "changes": [{"slotId": "Monday-09:00", "userId": null, "userName": "Bob", "isAvailable": false}, ...]
+        }
+        A cursor older than the pruned part of the change log gets a 410.
+        """
         try:
             # Get event and validate it exists
-            event = Event.query.filter_by(id=event_id).first()
+            event = event_cache.get(event_id)
             if not event:
                 return jsonify({"success": False, "message": "Event not found"}), 404
             
-            # Get unique users who have responded
-            unique_users = db.session.query(Response.user_name).filter_by(event_id=event_id).distinct().count()
-            
-            # Get all responses with slot information
-            responses = db.session.query(Response, AvailabilitySlot).join(
-                AvailabilitySlot,
-                Response.slot_id == AvailabilitySlot.id
-            ).filter(Response.event_id == event_id).all()
-            
-            # Format response data
-            formatted_responses = []
-            for response, slot in responses:
-                response_data = response.to_dict()
-                # Add slot information based on event type
-                if event.event_type == 'daysOfWeek':
-                    response_data['slotId'] = f"{slot.day_of_week}-{slot.start_time}"
-                else:
-                    response_data['slotId'] = f"{slot.date}-{slot.start_time}"
-                formatted_responses.append(response_data)
+            # Skip the availability queries entirely when the client is up to date
+            etag = availability_etag(event_id)
+            cached = not_modified(etag)
+            if cached:
+                return cached
             
-            return jsonify({
+            if 'since' in request.args:
+                try:
+                    since = int(request.args['since'])
+                except ValueError:
+                    return jsonify({"success": False, "message": "since must be an integer cursor"}), 400
+                
+                # Changes after an old cursor may have been pruned; the client must reload in full
+                pruned_through = db.session.scalar(select(Event.changes_pruned_through).where(Event.id == event_id))
+                if since < pruned_through:
+                    return jsonify({"success": False, "message": "Cursor has expired; reload without since"}), 410
+                
+                # Keep only the latest change per (participant, slot), in log order
+                latest = {}
+                cursor = since
+                for change in db.session.scalars(
+                    select(AvailabilityChange)
+                    .where(AvailabilityChange.event_id == event_id, AvailabilityChange.id > since)
+                    .order_by(AvailabilityChange.id)
+                ):
+                    # Same participant identity as the writers: user ID, or name when anonymous
+                    key = (change.user_id, change.user_name if change.user_id is None else None, change.slot_index)
+                    latest.pop(key, None)
+                    latest[key] = change
+                    cursor = change.id
+                
+                grid = event.grid
+                return with_etag(jsonify({
+                    "success": True,
+                    "data": {
+                        "cursor": cursor,
+                        "changes": [{
+                            'slotId': grid.slot_id(change.slot_index),
+                            'userId': change.user_id,
+                            'userName': change.user_name,
+                            'isAvailable': change.is_available
+                        } for change in latest.values()]
+                    }
+                }), etag), 200
+            
+            # Take the cursor first so changes committed while reading are sent again on the next sync
+            cursor = latest_change_id(event_id)
+            
+            if use_bitmap_storage():
+                # Expand each participant bitmap into one entry per available slot
+                grid = event.grid
+                bitmaps = load_bitmaps(event_id)
+                unique_users = len({participant_key(bitmap.user_id, bitmap.user_name) for bitmap in bitmaps})
+                
+                formatted_responses = []
+                for bitmap in bitmaps:
+                    bitmap_data = bitmap.to_dict()
+                    for index in grid.indices(SlotGrid.unpack(bitmap.bits)):
+                        formatted_responses.append({
+                            'id': None,
+                            'eventId': event_id,
+                            'slotId': grid.slot_id(index),
+                            'userId': bitmap_data['userId'],
+                            'userName': bitmap_data['userName'],
+                            'isAvailable': True,
+                            'createdAt': bitmap_data['updatedAt']
+                        })
+            else:
+                # Get unique users who have responded
+                unique_users = db.session.query(Response.user_id, anonymous_name(Response)).filter_by(event_id=event_id).distinct().count()
+                
+                # Get all responses with slot information
+                responses = db.session.query(Response, AvailabilitySlot).join(
+                    AvailabilitySlot,
+                    Response.slot_id == AvailabilitySlot.id
+                ).filter(Response.event_id == event_id).all()
+                
+                # Format response data
+                formatted_responses = []
+                for response, slot in responses:
+                    response_data = response.to_dict()
+                    # Add slot information based on event type
+                    response_data['slotId'] = format_slot_id(event, slot)
+                    formatted_responses.append(response_data)
+            
+            return with_etag(jsonify({
                 "success": True,
                 "data": {
+                    "cursor": cursor,
                     "totalResponses": len(formatted_responses),
                     "uniqueUsers": unique_users,
                     "responses": formatted_responses
                 }
-            }), 200
+            }), etag), 200
             
         except Exception as e:
             print(f"Error getting responses: {str(e)}")
@@ -545,10 +927,366 @@ def create_app(config_name='default'):
                 "message": f"Failed to get responses: {str(e)}"
             }), 500
     
+    @app.route('/api/events/<event_id>/heatmap', methods=['GET'])
+    def get_event_heatmap(event_id):
+        """
+        Get aggregated availability for an event.
+        Returns a single roster of participants and, for each slot with at least
+        one response, the number of participants and their indices in the roster:
+        {
+            "users": ["Alice", "Bob"],
+            "uniqueUsers": 2,
+            "slots": [{"slotId": "Monday-09:00", "count": 2, "users": [0, 1]}, ...]
+        }
+        With ?participants=false only the counts are returned, read from the
+        slot_counts summary table instead of aggregating every response:
+        {"slots": [{"slotId": "Monday-09:00", "count": 2}, ...]}
+        """
+        try:
+            # Get event and validate it exists
+            event = event_cache.get(event_id)
+            if not event:
+                return jsonify({"success": False, "message": "Event not found"}), 404
+            
+            # Skip the availability queries entirely when the client is up to date
+            etag = availability_etag(event_id)
+            cached = not_modified(etag)
+            if cached:
+                return cached
+            
+            if request.args.get('participants', 'true').lower() == 'false':
+                grid = event.grid
+                return with_etag(jsonify({
+                    "success": True,
+                    "data": {
+                        "slots": [{
+                            "slotId": grid.slot_id(slot_index),
+                            "count": count
+                        } for slot_index, count in read_slot_counts(event_id)]
+                    }
+                }), etag), 200
+            
+            if use_bitmap_storage():
+                # Aggregate directly over the participant bitmaps
+                grid = event.grid
+                users = []
+                user_index = {}
+                participants_by_index = {}
+                for bitmap in load_bitmaps(event_id):
+                    key = participant_key(bitmap.user_id, bitmap.user_name)
+                    if key not in user_index:
+                        user_index[key] = len(users)
+                        users.append(bitmap.user_name)
+                    for slot_index in grid.indices(SlotGrid.unpack(bitmap.bits)):
+                        participants_by_index.setdefault(slot_index, set()).add(user_index[key])
+                
+                slots = {
+                    grid.slot_id(slot_index): list(participants_by_index[slot_index])
+                    for slot_index in sorted(participants_by_index)
+                }
+            else:
+                # Roster ordered by when each participant first responded;
+                # participants are told apart the way the writers do (participant_key)
+                anonymous = anonymous_name(Response)
+                roster = db.session.execute(
+                    select(Response.user_id, anonymous, func.max(Response.user_name))
+                    .where(Response.event_id == event_id)
+                    .group_by(Response.user_id, anonymous)
+                    .order_by(func.min(Response.created_at), func.max(Response.user_name))
+                ).all()
+                users = [user_name for _, _, user_name in roster]
+                user_index = {(user_id, anonymous_user): index for index, (user_id, anonymous_user, _) in enumerate(roster)}
+                
+                # One row per (slot, participant), de-duplicated by the database
+                rows = db.session.execute(
+                    select(
+                        AvailabilitySlot.slot_index,
+                        AvailabilitySlot.date,
+                        AvailabilitySlot.day_of_week,
+                        AvailabilitySlot.start_time,
+                        Response.user_id,
+                        anonymous.label('anonymous_name')
+                    )
+                    .join(AvailabilitySlot, Response.slot_id == AvailabilitySlot.id)
+                    .where(Response.event_id == event_id)
+                    .group_by(
+                        AvailabilitySlot.id,
+                        AvailabilitySlot.slot_index,
+                        AvailabilitySlot.date,
+                        AvailabilitySlot.day_of_week,
+                        AvailabilitySlot.start_time,
+                        Response.user_id,
+                        anonymous
+                    )
+                ).all()
+                
+                slots = {}
+                for row in rows:
+                    slots.setdefault(format_slot_id(event, row), []).append(user_index[(row.user_id, row.anonymous_name)])
+            
+            return with_etag(jsonify({
+                "success": True,
+                "data": {
+                    "users": users,
+                    "uniqueUsers": len(users),
+                    "slots": [{
+                        "slotId": slot_id,
+                        "count": len(participants),
+                        "users": sorted(participants)
+                    } for slot_id, participants in slots.items()]
+                }
+            }), etag), 200
+            
+        except Exception as e:
+            print(f"Error getting heatmap: {str(e)}")
+            return jsonify({
+                "success": False,
+                "message": f"Failed to get heatmap: {str(e)}"
+            }), 500
+    
+    @app.route('/api/events/<event_id>/best-times', methods=['GET'])
+    def get_best_times(event_id):
+        """
+        Rank meeting windows by how many participants are available.
+        Query parameters:
+            duration: window length in minutes (default 60, multiple of 15)
+            required: participant name that must attend (may be repeated)
+            minAttendees: minimum number of attendees (default 1)
+            limit: maximum number of windows returned (default 10, at most 100)
+        """
+        try:
+            # Get event and validate it exists
+            event = event_cache.get(event_id)
+            if not event:
+                return jsonify({"success": False, "message": "Event not found"}), 404
+            
+            # Skip the availability queries entirely when the client is up to date
+            etag = availability_etag(event_id)
+            cached = not_modified(etag)
+            if cached:
+                return cached
+            
+            try:
+                duration = int(request.args.get('duration', 60))
+                min_attendees = int(request.args.get('minAttendees', 1))
+                limit = int(request.args.get('limit', 10))
+            except ValueError:
+                return jsonify({"success": False, "message": "duration, minAttendees and limit must be integers"}), 400
+            if min_attendees < 1:
+                return jsonify({"success": False, "message": "minAttendees must be at least 1"}), 400
+            if not 1 <= limit <= MAX_BEST_TIMES_LIMIT:
+                return jsonify({"success": False, "message": f"limit must be between 1 and {MAX_BEST_TIMES_LIMIT}"}), 400
+            required_users = request.args.getlist('required')
+            
+            grid = event.grid
+            users, matrix = load_availability_matrix(event, grid)
+            
+            try:
+                windows = find_best_times(grid, users, matrix, duration, required_users, min_attendees, limit)
+            except ValueError as e:
+                return jsonify({"success": False, "message": str(e)}), 400
+            
+            return with_etag(jsonify({
+                "success": True,
+                "data": {
+                    "duration": duration,
+                    "uniqueUsers": len(users),
+                    "windows": windows
+                }
+            }), etag), 200
+            
+        except Exception as e:
+            print(f"Error finding best times: {str(e)}")
+            return jsonify({
+                "success": False,
+                "message": f"Failed to find best times: {str(e)}"
+            }), 500
+    
+    @app.route('/api/events/<event_id>/conflicts', methods=['GET'])
+    @login_is_required
+    def get_event_conflicts(event_id):
+        """
+        Project the signed-in user's calendar busy time onto an event's slot grid.
+        Query parameters:
+            timeZone: IANA time zone the event times are in (default UTC)
+            weekOf: any date (YYYY-MM-DD) of the week to use for daysOfWeek events (default today)
+        Returns a base64 bitmap where bit i is set when slot index i is busy.
+        """
+        try:
+            # Get event and validate it exists
+            event = event_cache.get(event_id)
+            if not event:
+                return jsonify({"success": False, "message": "Event not found"}), 404
+            
+            # Get credentials from session
+            creds_data = session.get('credentials')
+            if not creds_data:
+                return jsonify({
+                    "success": False,
+                    "message": "Not authenticated with Google Calendar"
+                }), 401
+            
+            try:
+                tz = ZoneInfo(request.args.get('timeZone', 'UTC'))
+                week_of = date.fromisoformat(request.args['weekOf']) if 'weekOf' in request.args else date.today()
+            except (ValueError, ZoneInfoNotFoundError):
+                return jsonify({"success": False, "message": "Invalid timeZone or weekOf"}), 400
+            
+            grid = event.grid
+            slot_intervals = grid.slot_intervals(grid.day_dates(week_of), tz)
+            if not slot_intervals:
+                busy, failed_calendars = [], []
+            else:
+                # Busy time over the whole grid in one FreeBusy query
+                busy, failed_calendars = fetch_busy_intervals(
+                    get_calendar_service(app.config['CALENDAR_API_ROOT_URL']),
+                    credentials_from_session(creds_data),
+                    datetime.fromtimestamp(min(start for start, _ in slot_intervals), timezone.utc).isoformat(),
+                    datetime.fromtimestamp(max(end for _, end in slot_intervals), timezone.utc).isoformat(),
+                    timeout=app.config['CALENDAR_REQUEST_TIMEOUT']
+                )
+            
+            mask = grid.busy_mask(slot_intervals, busy)
+            
+            return jsonify({
+                "success": True,
+                "data": {
+                    "size": grid.size,
+                    "slotsPerDay": grid.slots_per_day,
+                    "busyCount": mask.bit_count(),
+                    "bitmap": base64.b64encode(grid.pack(mask)).decode('ascii'),
+                    "partial": bool(failed_calendars),
+                    "failedCalendars": failed_calendars
+                }
+            }), 200
+            
+        except Exception as e:
+            print(f"Error projecting calendar conflicts: {str(e)}")
+            return jsonify({
+                "success": False,
+                "message": f"Failed to get calendar conflicts: {str(e)}"
+            }), 500
+    
+    # Each open stream holds a worker thread; cap them so reads and writes keep theirs
+    app.extensions['stream_slots'] = threading.BoundedSemaphore(app.config['STREAM_MAX_CONNECTIONS'])
+    
+    @app.route('/api/events/<event_id>/stream', methods=['GET'])
+    def stream_event(event_id):
+        """
+        Server-Sent Events stream of availability changes for an event, pushed
+        as they are committed by any worker. Each message carries the delta-sync
+        cursor as its id:
+            event: changes
+            data: {"cursor": 42, "userId": null, "userName": "Bob", "added": ["Monday-09:00"], "removed": []}
+        When the stream cannot describe a change (a reconnect with Last-Event-ID
+        or ?since=<cursor> that missed changes, a lost notification or a slow
+        reader) it sends a resync; the client should then fetch
+        /api/events/<id>/responses?since=<the last cursor it applied>:
+            event: resync
+            data: {}
+        When the worker already has STREAM_MAX_CONNECTIONS open streams it
+        answers 503 with Retry-After; the client should poll meanwhile.
+        """
+        event = event_cache.get(event_id)
+        if not event:
+            return jsonify({"success": False, "message": "Event not found"}), 404
+        
+        try:
+            since = int(request.headers.get('Last-Event-ID') or request.args.get('since') or -1)
+        except ValueError:
+            return jsonify({"success": False, "message": "since must be an integer cursor"}), 400
+        
+        stream_slots = app.extensions['stream_slots']
+        if not stream_slots.acquire(blocking=False):
+            response = jsonify({"success": False, "message": "Too many open streams, retry later"})
+            response.headers['Retry-After'] = str(app.config['STREAM_RETRY_AFTER_SECONDS'])
+            return response, 503
+        
+        grid = event.grid
+        topic = f"availability:{event_id}"
+        heartbeat = app.config['STREAM_HEARTBEAT_SECONDS']
+        deadline = time.monotonic() + app.config['STREAM_MAX_SECONDS']
+        
+        # Subscribe before reading the cursor so no change falls in between
+        messages = queue.Queue(maxsize=app.config['STREAM_QUEUE_SIZE'])
+        
+        def deliver(data):
+            try:
+                messages.put_nowait(data)
+            except queue.Full:
+                # Slow reader: replace the backlog with a single resync
+                with messages.mutex:
+                    messages.queue.clear()
+                    messages.queue.append({'resync': True})
+                    messages.not_empty.notify()
+        
+        closed = threading.Lock()
+        
+        def close():
+            # Runs from the generator or, if it never started, when the server closes the response
+            if closed.acquire(blocking=False):
+                notification_bus.unsubscribe(topic, deliver)
+                notification_bus.unsubscribe(NotificationBus.RECONNECTED, deliver)
+                stream_slots.release()
+        
+        notification_bus.subscribe(topic, deliver)
+        notification_bus.subscribe(NotificationBus.RECONNECTED, deliver)
+        try:
+            cursor = latest_change_id(event_id)
+        except Exception:
+            close()
+            raise
+        finally:
+            # Do not hold a database connection for the lifetime of the stream
+            db.session.remove()
+        
+        def format_message(name, data, message_id=None):
+            lines = [f"event: {name}"]
+            if message_id is not None:
+                lines.append(f"id: {message_id}")
+            lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+            return "\n".join(lines) + "\n\n"
+        
+        def generate():
+            try:
+                yield "retry: 3000\n\n"
+                if 0 <= since < cursor:
+                    yield format_message('resync', {})
+                
+                while time.monotonic() < deadline:
+                    try:
+                        data = messages.get(timeout=heartbeat)
+                    except queue.Empty:
+                        # Comment line keeps proxies from timing out and detects closed clients
+                        yield ": keepalive\n\n"
+                        continue
+                    
+                    if data is None or data.get('resync'):
+                        yield format_message('resync', {})
+                    elif data['cursor'] > cursor:
+                        yield format_message('changes', {
+                            'cursor': data['cursor'],
+                            'userId': data['userId'],
+                            'userName': data['userName'],
+                            'added': [grid.slot_id(index) for index in data['added']],
+                            'removed': [grid.slot_id(index) for index in data['removed']]
+                        }, data['cursor'])
+            finally:
+                close()
+        
+        response = FlaskResponse(generate(), mimetype='text/event-stream')
+        response.call_on_close(close)
+        response.headers['Cache-Control'] = 'no-cache'
+        # Tell nginx not to buffer the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
     @app.route('/api/events/<event_id>/availability', methods=['PUT'])
+    @query_budget(12)  # fixed statement count for any number of slots or days (tests/test_query_budget.py)
     def update_availability(event_id):
         """
         Update availability for an event (replace all previous slots for this user).
+        Only the difference between the stored and submitted slots is written.
         Expected payload:
         {
             "userName": "John Doe",
@@ -570,70 +1308,31 @@ def create_app(config_name='default'):
             user_name = data['userName']
 
             # Get event and validate it exists
-            event = Event.query.filter_by(id=event_id).first()
+            event = event_cache.get(event_id)
             if not event:
                 return jsonify({"success": False, "message": "Event not found"}), 404
 
-            # Delete all previous responses for this user/event
-            if user_id:
-                Response.query.filter_by(event_id=event_id, user_id=user_id).delete()
+            # Only touch the rows that changed and apply them in a single transaction
+            if use_bitmap_storage():
+                added, removed, renamed = write_bitmap(event, user_id, user_name, data['selectedSlots'], replace=True)
             else:
-                Response.query.filter_by(event_id=event_id, user_name=user_name).delete()
-            db.session.commit()
-
-            # Insert new responses (same as POST logic)
-            for slot_id in data['selectedSlots']:
-                if event.event_type == 'daysOfWeek':
-                    clean_slot_id = slot_id.split('-undefined')[0]
-                    day_of_week, time_str = clean_slot_id.split('-')
-                    slot = AvailabilitySlot.query.filter_by(
-                        event_id=event_id,
-                        day_of_week=day_of_week,
-                        start_time=time_str
-                    ).first()
-                    if not slot:
-                        slot = AvailabilitySlot(
-                            event_id=event_id,
-                            day_of_week=day_of_week,
-                            start_time=time_str,
-                            end_time=time_str
-                        )
-                        db.session.add(slot)
-                        db.session.flush()
-                else:
-                    parts = slot_id.split('-')
-                    date_str = '-'.join(parts[:3])
-                    time_str = parts[3]
-                    date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                    slot = AvailabilitySlot.query.filter_by(
-                        event_id=event_id,
-                        date=date,
-                        start_time=time_str
-                    ).first()
-                    if not slot:
-                        slot = AvailabilitySlot(
-                            event_id=event_id,
-                            date=date,
-                            start_time=time_str,
-                            end_time=time_str
-                        )
-                        db.session.add(slot)
-                        db.session.flush()
-                response = Response(
-                    event_id=event_id,
-                    slot_id=slot.id,
-                    user_id=user_id,
-                    user_name=user_name,
-                    is_available=True
-                )
-                db.session.add(response)
+                added, removed, renamed = write_responses(event, user_id, user_name, data['selectedSlots'], replace=True)
+            apply_availability_changes(event_id, user_id, user_name, added, removed, renamed)
             db.session.commit()
+            record_rows_written(added, removed)
 
             return jsonify({
                 "success": True,
-                "message": "Availability updated successfully"
+                "message": "Availability updated successfully",
+                "data": {
+                    "added": len(added),
+                    "removed": len(removed)
+                }
             }), 200
 
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({"success": False, "message": f"Invalid slot: {str(e)}"}), 400
         except Exception as e:
             db.session.rollback()
             print(f"Error updating availability: {str(e)}")
@@ -642,40 +1341,28 @@ def create_app(config_name='default'):
                 "message": f"Failed to update availability: {str(e)}"
             }), 500
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-    
     # Apply meta tag middleware for dynamic SEO
     # app.wsgi_app = MetaTagMiddleware(app.wsgi_app)
 
-    @app.route("/e/<event_id>")
-    def event_page(event_id):
-        """Serve crawler-friendly HTML with meta tags for event previews"""
-
-        # Get event data from database
-        try:
-            event = Event.query.filter_by(id=event_id).first()
-            if not event:
-                return FlaskResponse("Event not found", status=404)
+    def render_crawler_page(event_id, url_root):
+        """Build the crawler HTML with meta tags for an event, or None if it does not exist"""
+        event = event_cache.get(event_id)
+        if not event:
+            return None
+        event_data = event.to_dict()
 
-            event_data = event.to_dict()
-        except Exception as e:
-            print(f"Error fetching event: {e}")
-            return FlaskResponse("Error loading event", status=500)
-
-        # Build meta tag values
-        event_name = event_data.get('name', 'Whenly Event')
-        event_url = f"{request.url_root.rstrip('/')}/e/{event_id}"
+        # Build meta tag values (escaped, the name and creator are user input)
+        event_name = escape(event_data.get('name') or 'Whenly Event')
+        event_url = escape(f"{url_root.rstrip('/')}/e/{event_id}")
         
         if event_data.get('creatorName') is not None and event_data.get('creatorName') != '':
-            creator_name = event_data.get('creatorName', 'Someone')
+            creator_name = escape(event_data.get('creatorName', 'Someone'))
             description = f"{creator_name} wants to find a time to meet."
         else:
             description = f"Find a time to meet."
 
         # Build simple crawler HTML
-        html = f"""
+        return f"""
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -701,7 +1388,26 @@ def create_app(config_name='default'):
         </html>
         """
 
-        return FlaskResponse(html, mimetype="text/html")
+    @app.route("/e/<event_id>")
+    def event_page(event_id):
+        """Serve crawler-friendly HTML with meta tags for event previews"""
+
+        # Rendered pages are cached per worker; a burst of unfurls loads the event once
+        url_root = request.url_root
+        try:
+            page = crawler_pages.get((event_id, url_root), lambda: render_page(render_crawler_page(event_id, url_root)))
+        except Exception as e:
+            print(f"Error fetching event: {e}")
+            return FlaskResponse("Error loading event", status=500)
+        if page is None:
+            return FlaskResponse("Event not found", status=404)
+
+        # Let crawlers and the nginx micro-cache reuse the page, then revalidate with the ETag
+        body, etag = page
+        response = FlaskResponse(body, mimetype="text/html")
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f"public, max-age={app.config['CRAWLER_PAGE_MAX_AGE']}"
+        return response.make_conditional(request)
 
     # Static file serving for assets
     @app.route("/<path:filename>")
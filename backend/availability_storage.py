@@ -0,0 +1,193 @@
+from datetime import date
+
+from sqlalchemy import case, delete, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from event_cache import EventMetadata
+from models import db, AvailabilityBitmap, AvailabilitySlot, Event, Response
+from slot_grid import SlotGrid, format_time
+
+
+def participant_key(user_id, user_name):
+    """
+    Identity of a participant, as the availability writes and the unique
+    indexes on availability_bitmaps see it: signed-in users by ID, anonymous
+    ones by name.
+    """
+    return (user_id, user_name if user_id is None else None)
+
+
+def anonymous_name(model):
+    """SQL expression for the second half of participant_key over a Response or AvailabilityBitmap"""
+    return case((model.user_id.is_(None), model.user_name), else_=None)
+
+
+def insert_ignoring_conflicts(model):
+    """INSERT statement that skips rows violating a unique index (Postgres/SQLite)"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+
+def resolve_slot_indices(event, indices):
+    """
+    Map slot indices of an event's grid to {slot index: AvailabilitySlot id},
+    creating any missing slots. `event` is anything with id, event_type and
+    grid (an EventMetadata). Issues a constant number of queries regardless
+    of how many slots are requested: one select for the event's existing
+    slots, at most one multi-row insert for the missing ones and, if that
+    insert skipped any, one update and one reload.
+    """
+    indices = list(indices)
+    if not indices:
+        return {}
+    grid = event.grid
+
+    def load_existing():
+        return dict(db.session.query(AvailabilitySlot.slot_index, AvailabilitySlot.id).filter(
+            AvailabilitySlot.event_id == event.id,
+            AvailabilitySlot.slot_index.isnot(None)
+        ).all())
+
+    slot_ids = load_existing()
+
+    missing = [index for index in indices if index not in slot_ids]
+    if missing:
+        rows = []
+        for index in missing:
+            day, time_str = grid.slot_key(index)
+            rows.append({
+                'event_id': event.id,
+                'slot_index': index,
+                'date': date.fromisoformat(day) if event.event_type == 'specificDays' else None,
+                'day_of_week': day if event.event_type == 'daysOfWeek' else None,
+                'start_time': time_str,
+                'end_time': format_time(grid.start_minute + (index % grid.slots_per_day + 1) * grid.slot_minutes)
+            })
+
+        # RETURNING the slot index lets the driver batch the insert without
+        # having to preserve parameter order. Rows skipped because of a
+        # conflict with a concurrent submitter are picked up below.
+        created = db.session.execute(
+            insert_ignoring_conflicts(AvailabilitySlot).returning(
+                AvailabilitySlot.slot_index,
+                AvailabilitySlot.id
+            ),
+            rows
+        ).all()
+        slot_ids.update(dict(created))
+
+        skipped = [row for row in rows if row['slot_index'] not in slot_ids]
+        if skipped:
+            # The per-day rows create_event adds have no slot index but can
+            # hold the same (day, start time) as a grid cell; adopt them all
+            # in one statement. Rows a concurrent submitter adopted or
+            # inserted first already have an index and are just reloaded.
+            if event.event_type == 'specificDays':
+                day_column, day_key = AvailabilitySlot.date, 'date'
+            else:
+                day_column, day_key = AvailabilitySlot.day_of_week, 'day_of_week'
+
+            def matches(row):
+                return (day_column == row[day_key]) & (AvailabilitySlot.start_time == row['start_time'])
+
+            db.session.execute(
+                update(AvailabilitySlot).where(
+                    AvailabilitySlot.event_id == event.id,
+                    AvailabilitySlot.slot_index.is_(None),
+                    tuple_(day_column, AvailabilitySlot.start_time).in_([(row[day_key], row['start_time']) for row in skipped])
+                ).values(
+                    slot_index=case(*((matches(row), row['slot_index']) for row in skipped)),
+                    end_time=case(*((matches(row), row['end_time']) for row in skipped))
+                ).execution_options(synchronize_session=False)
+            )
+            slot_ids.update(load_existing())
+
+    return {index: slot_ids[index] for index in indices}
+
+
+def _rows_to_bitmaps(event):
+    """Replace an event's bitmaps with its responses rows, one bitmap per participant"""
+    participants = {}
+    for row in db.session.execute(
+        select(Response.user_id, Response.user_name, Response.created_at, AvailabilitySlot.slot_index)
+        .join(AvailabilitySlot, Response.slot_id == AvailabilitySlot.id)
+        .where(Response.event_id == event.id, AvailabilitySlot.slot_index.isnot(None))
+        .order_by(Response.created_at, Response.id)
+    ):
+        participant = participants.setdefault(participant_key(row.user_id, row.user_name), {
+            'event_id': event.id,
+            'user_id': row.user_id,
+            'user_name': row.user_name,
+            'created_at': row.created_at,
+            'updated_at': row.created_at,
+            'mask': 0
+        })
+        participant['mask'] |= 1 << row.slot_index
+        participant['updated_at'] = max(participant['updated_at'], row.created_at)
+
+    db.session.execute(delete(AvailabilityBitmap).where(AvailabilityBitmap.event_id == event.id))
+    rows = []
+    for participant in participants.values():
+        participant['bits'] = event.grid.pack(participant.pop('mask'))
+        rows.append(participant)
+    if rows:
+        db.session.execute(insert(AvailabilityBitmap), rows)
+    return len(rows)
+
+
+def _bitmaps_to_rows(event):
+    """Replace an event's responses rows with one row per slot set in its bitmaps"""
+    bitmaps = [
+        (bitmap, event.grid.indices(SlotGrid.unpack(bitmap.bits)))
+        for bitmap in AvailabilityBitmap.query.filter_by(event_id=event.id).order_by(AvailabilityBitmap.id)
+    ]
+    slot_ids = resolve_slot_indices(event, sorted({index for _, indices in bitmaps for index in indices}))
+
+    db.session.execute(delete(Response).where(Response.event_id == event.id))
+    rows = [{
+        'event_id': event.id,
+        'slot_id': slot_ids[index],
+        'user_id': bitmap.user_id,
+        'user_name': bitmap.user_name,
+        'is_available': True,
+        'created_at': bitmap.created_at
+    } for bitmap, indices in bitmaps for index in indices]
+    if rows:
+        db.session.execute(insert(Response), rows)
+    return len(rows)
+
+
+def convert(storage, event_id=None, batch_size=500, progress=None):
+    """
+    Copy participant availability into the given storage mode ('rows' or
+    'bitmap') from the other one, for one event or all of them. The target
+    storage of each converted event is replaced; the source is left in
+    place, so switching AVAILABILITY_STORAGE back needs no conversion until
+    new writes arrive. Commits every `batch_size` events. Returns the
+    number of rows written.
+    """
+    convert_event = _rows_to_bitmaps if storage == 'bitmap' else _bitmaps_to_rows
+
+    if event_id:
+        event_ids = [event_id]
+    else:
+        # Events with data in either storage, so stale target rows are cleared too
+        event_ids = sorted(set().union(*(
+            db.session.scalars(select(column).distinct()) for column in (Response.event_id, AvailabilityBitmap.event_id)
+        )))
+
+    written = 0
+    for number, converted_id in enumerate(event_ids, 1):
+        event = db.session.get(Event, converted_id)
+        if event is not None:
+            written += convert_event(EventMetadata(event))
+        if number % batch_size == 0:
+            db.session.commit()
+            if progress:
+                progress(number, len(event_ids), written)
+    db.session.commit()
+    return written
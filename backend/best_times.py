@@ -0,0 +1,68 @@
+import numpy as np
+
+from slot_grid import format_time
+
+# Upper bound on the number of windows one request may ask for
+MAX_LIMIT = 100
+
+
+def find_best_times(grid, users, matrix, duration, required_users=(), min_attendees=1, limit=10):
+    """
+    Rank contiguous windows of `duration` minutes by how many users are
+    available for the whole window.
+
+    `matrix` is a users x grid.size boolean array (row i belongs to users[i];
+    names may repeat when participants share one).
+    Windows never span two days. Windows missing any of `required_users` or
+    with fewer than `min_attendees` attendees are dropped. Returns at most
+    `limit` windows ordered by attendee count, then by position in the grid.
+    """
+    if duration <= 0 or duration % grid.slot_minutes:
+        raise ValueError(f"duration must be a positive multiple of {grid.slot_minutes} minutes")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    window = duration // grid.slot_minutes
+    if not users or not grid.days or window > grid.slots_per_day:
+        return []
+
+    # users x days x slots, with a zero column so window sums can be taken from
+    # the cumulative sum in one subtraction
+    by_day = matrix.reshape(len(users), len(grid.days), grid.slots_per_day).astype(np.int32)
+    cumulative = np.concatenate(
+        (np.zeros(by_day.shape[:2] + (1,), dtype=np.int32), np.cumsum(by_day, axis=2)),
+        axis=2
+    )
+    # attends[u, d, s] is True when user u is free for every slot of the window starting at s on day d
+    attends = (cumulative[:, :, window:] - cumulative[:, :, :-window]) == window
+    counts = attends.sum(axis=0)
+
+    eligible = counts >= max(min_attendees, 1)
+    for user_name in required_users:
+        # Several participants may share a name; all of them are required
+        rows = [index for index, name in enumerate(users) if name == user_name]
+        if not rows:
+            return []
+        eligible &= attends[rows].all(axis=0)
+
+    day_indices, start_indices = np.nonzero(eligible)
+    if not len(day_indices):
+        return []
+
+    # Stable sort keeps grid order among windows with the same count
+    order = np.argsort(-counts[day_indices, start_indices], kind='stable')[:limit]
+
+    results = []
+    for position in order:
+        day_index, start_index = int(day_indices[position]), int(start_indices[position])
+        start_minute = grid.start_minute + start_index * grid.slot_minutes
+        attendee_rows = np.nonzero(attends[:, day_index, start_index])[0]
+        results.append({
+            'day': grid.days[day_index],
+            'startTime': format_time(start_minute),
+            'endTime': format_time((start_minute + duration) % (24 * 60)),
+            'slotId': grid.slot_id(day_index * grid.slots_per_day + start_index),
+            'count': int(counts[day_index, start_index]),
+            'attendees': [users[row] for row in attendee_rows]
+        })
+    return results
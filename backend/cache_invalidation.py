@@ -0,0 +1,36 @@
+class CacheInvalidator:
+    """
+    Event-scoped invalidation of the in-process caches of every worker.
+
+    Caches register under a scope ('event' for event metadata, 'availability'
+    for anything derived from participants' availability) and must provide
+    invalidate(event_id) and clear(). Writers call publish() inside their
+    transaction; once it commits, every worker (this one synchronously)
+    evicts the event from the caches of that scope. If a worker's listener
+    loses its connection, notifications may have been missed, so all
+    registered caches are cleared when it reconnects.
+    """
+
+    TOPIC = 'invalidate'
+
+    def __init__(self, bus):
+        self.bus = bus
+        self._caches = []  # (scope, cache)
+        bus.subscribe(self.TOPIC, self._invalidate)
+        bus.subscribe(bus.RECONNECTED, self._clear)
+
+    def register(self, scope, *caches):
+        self._caches.extend((scope, cache) for cache in caches)
+
+    def publish(self, event_id, scope):
+        """Invalidate an event in every worker's caches of `scope` when the current transaction commits"""
+        self.bus.publish(self.TOPIC, {'eventId': event_id, 'scope': scope}, deliver_locally=True)
+
+    def _invalidate(self, data):
+        for scope, cache in self._caches:
+            if scope == data['scope']:
+                cache.invalidate(data['eventId'])
+
+    def _clear(self, data):
+        for _, cache in self._caches:
+            cache.clear()
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+
+def date_range(start, end):
+    """Yield every date from start to end inclusive"""
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+class CalendarCache:
+    """
+    Per-user cache of calendar events with TTL expiry and LRU eviction.
+
+    Events are stored in UTC day buckets, so a request for any date range can
+    reuse every fresh day cached by earlier requests (including sub-ranges of
+    a larger range) and only the missing spans of days need to be fetched.
+    """
+
+    def __init__(self, ttl, max_users):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.hits = 0
+        self.misses = 0
+        # user key -> {date: (fetched_at, [event, ...])}, least recently used first
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_users > 0
+
+    def lookup(self, user_key, start, end):
+        """
+        Get cached events for the dates start..end.
+        Returns (cached events, [(span start, span end), ...] of dates that must be fetched).
+        """
+        now = time.monotonic()
+        events = []
+        missing = []
+        with self._lock:
+            days = self._users.get(user_key)
+            if days is not None:
+                self._users.move_to_end(user_key)
+
+            for day in date_range(start, end):
+                entry = days.get(day) if days else None
+                if entry and now - entry[0] < self.ttl:
+                    self.hits += 1
+                    events.extend(entry[1])
+                    continue
+
+                self.misses += 1
+                # Extend the current span or start a new one
+                if missing and missing[-1][1] == day - timedelta(days=1):
+                    missing[-1] = (missing[-1][0], day)
+                else:
+                    missing.append((day, day))
+
+        return events, missing
+
+    def store(self, user_key, start, end, events):
+        """Cache the complete set of events fetched for the dates start..end"""
+        buckets = {day: [] for day in date_range(start, end)}
+        for event in events:
+            event_start = datetime.fromisoformat(event['start']).astimezone(timezone.utc)
+            # An event ending exactly at midnight does not occupy the next day
+            event_end = datetime.fromisoformat(event['end']).astimezone(timezone.utc) - timedelta(microseconds=1)
+            for day in date_range(max(event_start.date(), start), min(max(event_end, event_start).date(), end)):
+                buckets[day].append(event)
+
+        now = time.monotonic()
+        with self._lock:
+            days = self._users.setdefault(user_key, {})
+            self._users.move_to_end(user_key)
+            # Drop expired days while we hold the entry
+            for day in [day for day, entry in days.items() if now - entry[0] >= self.ttl]:
+                del days[day]
+            days.update((day, (now, bucket)) for day, bucket in buckets.items())
+
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def stats(self):
+        """Get hit/miss counters (counted per requested day)"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': self.hits / requests if requests else 0.0,
+                'users': len(self._users),
+                'ttl': self.ttl
+            }
+
+
+def merge_events(events):
+    """De-duplicate events that were cached under several days and sort them by start"""
+    unique = {}
+    for event in events:
+        unique.setdefault((event['calendar'], event['summary'], event['start'], event['end']), event)
+    return sorted(unique.values(), key=lambda event: datetime.fromisoformat(event['start']))
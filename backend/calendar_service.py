@@ -0,0 +1,228 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+import google_auth_httplib2
+import httplib2
+from dateutil.parser import parse
+from google.oauth2 import credentials as google_credentials
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+import metrics
+
+# FreeBusy accepts at most this many calendars per query
+FREEBUSY_MAX_CALENDARS = 50
+
+# Calendar API clients built from the bundled discovery document, keyed by API root URL
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_calendar_service(root_url=None):
+    """
+    Get the process-wide Calendar API client, built once from the discovery
+    document bundled with google-api-python-client (no network fetch).
+
+    The client is not bound to any user: run requests through execute() to
+    make a call with a user's credentials.
+    `root_url` points the client at another API root, e.g. a local stub.
+    """
+    with _services_lock:
+        if root_url not in _services:
+            client_options = {'api_endpoint': root_url} if root_url else None
+            _services[root_url] = build_from_document(
+                get_static_doc('calendar', 'v3'),
+                http=httplib2.Http(),
+                client_options=client_options
+            )
+        return _services[root_url]
+
+
+def credentials_from_session(creds_data):
+    """Create a Credentials object from the dict stored in the session"""
+    return google_credentials.Credentials(
+        token=creds_data['token'],
+        refresh_token=creds_data['refresh_token'],
+        token_uri=creds_data['token_uri'],
+        client_id=creds_data['client_id'],
+        client_secret=creds_data['client_secret'],
+        scopes=creds_data['scopes']
+    )
+
+
+def authorized_http(creds, timeout):
+    """
+    Create an authorized HTTP client for one upstream call. httplib2 is not
+    thread-safe, so every concurrent request needs its own client.
+    """
+    return google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=timeout))
+
+
+def execute(request, operation, creds, timeout):
+    """Execute a Calendar API request with the user's credentials, recording its latency and failures"""
+    started = time.monotonic()
+    try:
+        return request.execute(http=authorized_http(creds, timeout))
+    except Exception:
+        metrics.CALENDAR_ERRORS.labels(operation=operation, reason='error').inc()
+        raise
+    finally:
+        metrics.CALENDAR_LATENCY.labels(operation=operation).observe(time.monotonic() - started)
+
+
+def parse_event(event, calendar_name):
+    """Convert a Calendar API event resource to our event dict, or None for all-day events"""
+    # Get event start and end times
+    start = event['start'].get('dateTime')
+    end = event['end'].get('dateTime')
+
+    # Skip if no specific time (all-day event)
+    if not start or not end:
+        return None
+
+    # Parse dates
+    try:
+        start_dt = parse(start)
+        end_dt = parse(end)
+
+        # Convert to local time if needed
+        if start_dt.tzinfo is None:
+            start_dt = start_dt.replace(tzinfo=timezone.utc)
+        if end_dt.tzinfo is None:
+            end_dt = end_dt.replace(tzinfo=timezone.utc)
+    except Exception as e:
+        print(f"Error parsing event date: {str(e)}")
+        return None
+
+    return {
+        'summary': event.get('summary', 'No Title'),
+        'start': start_dt.isoformat(),
+        'end': end_dt.isoformat(),
+        'calendar': calendar_name
+    }
+
+
+def list_calendars(service, creds, timeout):
+    """Get (calendar id, calendar name) for every calendar in the user's calendar list"""
+    calendar_list = execute(service.calendarList().list(), 'calendarList.list', creds, timeout)
+    return [
+        (entry['id'], entry.get('summary', 'Unnamed Calendar'))
+        for entry in calendar_list.get('items', [])
+    ]
+
+
+def fetch_calendar_events(service, creds, time_min, time_max, max_workers, timeout):
+    """
+    Fetch timed events from every calendar of the user concurrently.
+
+    Each request gets its own pool of up to `max_workers` threads, so one
+    user's calendars never queue behind another request's. Every calendar
+    is fetched with its own HTTP client and may run for `timeout` seconds
+    from when its fetch starts; calendars still queued `timeout` seconds
+    after the request began are cancelled. Failed, timed out and cancelled
+    calendars are skipped so the caller still gets partial results.
+    Returns (events, names of calendars that could not be fetched).
+    """
+    calendars = list_calendars(service, creds, timeout)
+    if not calendars:
+        return [], []
+    started = {}
+
+    def fetch(cal_id, cal_name):
+        started[cal_id] = time.monotonic()
+        events = execute(service.events().list(
+            calendarId=cal_id,
+            timeMin=time_min,
+            timeMax=time_max,
+            singleEvents=True,
+            orderBy='startTime'
+        ), 'events.list', creds, timeout).get('items', [])
+        return [parsed for parsed in (parse_event(event, cal_name) for event in events) if parsed]
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(calendars)), thread_name_prefix='calendar')
+    queued_at = time.monotonic()
+    futures = [(executor.submit(fetch, cal_id, cal_name), cal_id, cal_name) for cal_id, cal_name in calendars]
+
+    timed_out = set()
+    pending = {future: cal_id for future, cal_id, _ in futures}
+    while pending:
+        now = time.monotonic()
+        for future, cal_id in list(pending.items()):
+            if future.done():
+                del pending[future]
+            elif now - started.get(cal_id, queued_at) >= timeout:
+                # Not started yet: drop it from the queue. Started: leave it to its socket timeout.
+                future.cancel()
+                timed_out.add(future)
+                del pending[future]
+        if pending:
+            deadline = min(started.get(cal_id, queued_at) for cal_id in pending.values()) + timeout
+            wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    all_events = []
+    failed_calendars = []
+    # Collect in calendar list order so the output is stable
+    for future, _, cal_name in futures:
+        if future not in timed_out and future.exception() is None:
+            all_events.extend(future.result())
+            continue
+        if future in timed_out:
+            metrics.CALENDAR_ERRORS.labels(operation='events.list', reason='timeout').inc()
+            print(f"Timed out fetching calendar {cal_name}")
+        else:
+            print(f"Error fetching calendar {cal_name}: {str(future.exception())}")
+        failed_calendars.append(cal_name)
+
+    return all_events, failed_calendars
+
+
+def merge_intervals(intervals):
+    """Merge overlapping or touching (start, end) intervals into a sorted list of [start, end] pairs"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def fetch_busy_intervals(service, creds, time_min, time_max, timeout):
+    """
+    Fetch the user's busy time across all calendars with the FreeBusy API.
+
+    All calendars are queried in a single FreeBusy call (chunked at
+    FREEBUSY_MAX_CALENDARS), which returns only busy intervals instead of
+    full event resources. Returns (merged [start, end] pairs as integer Unix
+    epoch seconds, names of calendars that could not be queried).
+    """
+    calendars = list_calendars(service, creds, timeout)
+
+    intervals = []
+    failed_calendars = []
+    for offset in range(0, len(calendars), FREEBUSY_MAX_CALENDARS):
+        chunk = calendars[offset:offset + FREEBUSY_MAX_CALENDARS]
+        result = execute(service.freebusy().query(body={
+            'timeMin': time_min,
+            'timeMax': time_max,
+            'items': [{'id': cal_id} for cal_id, _ in chunk]
+        }), 'freebusy.query', creds, timeout)
+
+        busy_by_calendar = result.get('calendars', {})
+        for cal_id, cal_name in chunk:
+            entry = busy_by_calendar.get(cal_id, {})
+            if entry.get('errors'):
+                metrics.CALENDAR_ERRORS.labels(operation='freebusy.query', reason='calendar_error').inc()
+                print(f"Error querying free/busy for calendar {cal_name}: {entry['errors']}")
+                failed_calendars.append(cal_name)
+                continue
+            for busy in entry.get('busy', []):
+                intervals.append((
+                    int(datetime.fromisoformat(busy['start']).timestamp()),
+                    int(datetime.fromisoformat(busy['end']).timestamp())
+                ))
+
+    return merge_intervals(intervals), failed_calendars
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, delete, select, update
+
+from models import db, AvailabilityChange, Event
+
+
+def prune(retention_days, batch_size=10000, progress=None):
+    """
+    Delete availability_changes rows older than `retention_days`, oldest
+    first, committing every `batch_size` rows. Each affected event's
+    changes_pruned_through is moved up to the last id deleted, so delta
+    sync clients holding an older cursor are told to reload in full.
+    Returns the number of rows deleted.
+    """
+    before = datetime.utcnow() - timedelta(days=retention_days)
+    events = Event.__table__
+    deleted = 0
+    while True:
+        rows = db.session.execute(
+            select(AvailabilityChange.id, AvailabilityChange.event_id)
+            .where(AvailabilityChange.created_at < before)
+            .order_by(AvailabilityChange.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return deleted
+
+        # Ids are deleted in increasing order, so the last one seen per event is its new horizon
+        pruned_through = {row.event_id: row.id for row in rows}
+        db.session.execute(
+            update(events)
+            .where(events.c.id == bindparam('pruned_event_id'))
+            .values(changes_pruned_through=bindparam('pruned_through')),
+            [{'pruned_event_id': event_id, 'pruned_through': change_id} for event_id, change_id in pruned_through.items()]
+        )
+        db.session.execute(
+            delete(AvailabilityChange).where(AvailabilityChange.id.in_([row.id for row in rows]))
+        )
+        db.session.commit()
+
+        deleted += len(rows)
+        if progress:
+            progress(deleted)
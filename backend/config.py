@@ -1,9 +1,45 @@
 import os
 from dotenv import load_dotenv
 
+from db_pool import InstrumentedQueuePool
+
 # Load environment variables from .env file if present
 load_dotenv()
 
+
+def engine_options(database_uri, pool_size, max_overflow):
+    """
+    SQLAlchemy engine options for the configured database. Every gunicorn
+    worker has its own pool, so the server needs about
+    workers * (pool_size + max_overflow) connections, plus one LISTEN
+    connection per worker. pool_size should cover the threads per worker.
+    """
+    options = {
+        # Test connections on checkout so a Postgres restart does not surface as errors
+        'pool_pre_ping': os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        # Replace connections before server or proxy idle timeouts close them
+        'pool_recycle': int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    if not database_uri or not database_uri.startswith("postgresql"):
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv("DB_POOL_SIZE", str(pool_size))),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", str(max_overflow))),
+        # Seconds a request waits for a free connection before failing
+        'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        # Checkouts waiting at least this long are logged
+        'slow_checkout_seconds': float(os.getenv("DB_SLOW_CHECKOUT_MS", "100")) / 1000,
+    })
+
+    # Server-side cap on any single statement, in milliseconds (0 disables)
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+    if statement_timeout:
+        options['connect_args'] = {'options': f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
 class Config:
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "dev_secret")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
@@ -17,17 +53,80 @@ class Config:
     # CORS configuration
     CORS_ORIGINS = os.getenv("CORS_ORIGINS").split(",")
     CORS_SUPPORTS_CREDENTIALS = True
+    
+    # Availability storage: 'rows' (one Response row per slot) or 'bitmap'
+    # (one packed AvailabilityBitmap per participant)
+    AVAILABILITY_STORAGE = os.getenv("AVAILABILITY_STORAGE", "rows")
+    
+    # Parsed event metadata cache: max number of events and seconds an entry is reused
+    EVENT_CACHE_SIZE = int(os.getenv("EVENT_CACHE_SIZE", "1024"))
+    EVENT_CACHE_TTL = int(os.getenv("EVENT_CACHE_TTL", "300"))
+    # Per-event version cache used to answer conditional GETs; entries are
+    # invalidated across workers on every write, the TTL is only a backstop
+    EVENT_VERSION_CACHE_SIZE = int(os.getenv("EVENT_VERSION_CACHE_SIZE", "4096"))
+    EVENT_VERSION_CACHE_TTL = int(os.getenv("EVENT_VERSION_CACHE_TTL", "60"))
+    # Rendered crawler pages (/e/<event_id>): max number of pages and seconds a
+    # page is reused in-process, and the max-age sent to crawlers and nginx
+    CRAWLER_PAGE_CACHE_SIZE = int(os.getenv("CRAWLER_PAGE_CACHE_SIZE", "1024"))
+    CRAWLER_PAGE_CACHE_TTL = int(os.getenv("CRAWLER_PAGE_CACHE_TTL", "300"))
+    CRAWLER_PAGE_MAX_AGE = int(os.getenv("CRAWLER_PAGE_MAX_AGE", "60"))
+    
+    # Google Calendar proxy: calendars fetched in parallel per request, and the
+    # seconds each fetch may run (slower calendars are left out of the result)
+    CALENDAR_FETCH_WORKERS = int(os.getenv("CALENDAR_FETCH_WORKERS", "8"))
+    CALENDAR_REQUEST_TIMEOUT = float(os.getenv("CALENDAR_REQUEST_TIMEOUT", "5"))
+    # Override the Calendar API root (e.g. a local stub for network-isolated tests)
+    CALENDAR_API_ROOT_URL = os.getenv("CALENDAR_API_ROOT_URL") or None
+    # Per-user calendar events cache: seconds a fetched day stays fresh (0 disables)
+    # and the number of users kept before least recently used ones are evicted
+    CALENDAR_CACHE_TTL = int(os.getenv("CALENDAR_CACHE_TTL", "300"))
+    CALENDAR_CACHE_MAX_USERS = int(os.getenv("CALENDAR_CACHE_MAX_USERS", "1000"))
+    
+    # Live availability streams (SSE): seconds between keepalive comments, seconds
+    # before the server closes a stream (browsers reconnect automatically) and
+    # the number of undelivered messages buffered before a stream resyncs
+    STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+    STREAM_MAX_SECONDS = float(os.getenv("STREAM_MAX_SECONDS", "600"))
+    STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+    # Open streams per worker process, each holding a thread (default: half the
+    # gunicorn threads), and the Retry-After seconds sent when they are all taken
+    STREAM_MAX_CONNECTIONS = int(os.getenv("STREAM_MAX_CONNECTIONS", str(max(1, int(os.getenv("GUNICORN_THREADS", "8")) // 2))))
+    STREAM_RETRY_AFTER_SECONDS = int(os.getenv("STREAM_RETRY_AFTER_SECONDS", "30"))
+    
+    # Request instrumentation: requests issuing more SQL statements than the
+    # budget (overridable per view with @query_budget) or slower than
+    # SLOW_REQUEST_MS are logged
+    QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "20"))
+    SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "1000"))
+    
+    # Bearer token required by /api/metrics (unset: no authentication, keep it off the public proxy)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SESSION_COOKIE_SECURE = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=10)
 
 class ProductionConfig(Config):
     DEBUG = False
     SESSION_COOKIE_SECURE = True
+    # Sized for the default 8 threads per gunicorn worker
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=8, max_overflow=4)
 
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
     'default': DevelopmentConfig
-}
\ No newline at end of file
+}
+
+
+def connections_per_worker(config_name):
+    """
+    Postgres connections one gunicorn worker may hold under a config: its
+    pool at full overflow plus the notification listener. None when the
+    database is not pooled (SQLite).
+    """
+    options = config[config_name].SQLALCHEMY_ENGINE_OPTIONS
+    if 'pool_size' not in options:
+        return None
+    return options['pool_size'] + options['max_overflow'] + 1
\ No newline at end of file
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that measures how long each checkout waits for a connection
+    (including opening a new one) so the pool can be sized against the
+    number of gunicorn workers and threads. Checkouts slower than
+    `slow_checkout_seconds` and checkouts that find every connection in use
+    are logged with the pool status.
+    """
+
+    def __init__(self, creator, slow_checkout_seconds=0.1, **kw):
+        super().__init__(creator, **kw)
+        self.slow_checkout_seconds = slow_checkout_seconds
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.slow_checkouts = 0
+        self.saturated_checkouts = 0
+        self._last_saturation_log = 0.0
+        self._stats_lock = threading.Lock()
+
+    def recreate(self):
+        # Keep the instrumentation when the engine is disposed (e.g. after a fork)
+        pool = super().recreate()
+        pool.slow_checkout_seconds = self.slow_checkout_seconds
+        return pool
+
+    def _do_get(self):
+        started = time.monotonic()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            print(f"Database pool checkout timed out after {time.monotonic() - started:.3f}s ({self.status()})")
+            raise
+        waited = time.monotonic() - started
+
+        saturated = self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+        log_saturation = False
+        with self._stats_lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if waited >= self.slow_checkout_seconds:
+                self.slow_checkouts += 1
+            if saturated:
+                self.saturated_checkouts += 1
+                # At most one saturation message every 10 seconds
+                if started - self._last_saturation_log >= 10:
+                    self._last_saturation_log = started
+                    log_saturation = True
+
+        if waited >= self.slow_checkout_seconds:
+            print(f"Slow database pool checkout: waited {waited:.3f}s ({self.status()})")
+        elif log_saturation:
+            print(f"Database pool saturated: every connection is checked out ({self.status()})")
+        return connection
+
+    def stats(self):
+        """Get checkout counters and the current pool utilization"""
+        with self._stats_lock:
+            return {
+                'size': self.size(),
+                'maxOverflow': self._max_overflow,
+                'checkedOut': self.checkedout(),
+                'checkedIn': self.checkedin(),
+                'overflow': self.overflow(),
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'slowCheckouts': self.slow_checkouts,
+                'saturatedCheckouts': self.saturated_checkouts,
+                'waitSecondsTotal': self.wait_seconds_total,
+                'waitSecondsMax': self.wait_seconds_max
+            }
@@ -0,0 +1,167 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from models import db, Event
+from slot_grid import SlotGrid
+
+
+class EventMetadata:
+    """
+    Read-only snapshot of an Event's metadata. The JSON day lists are parsed
+    and the slot grid is built once, when the snapshot is taken.
+    """
+
+    def __init__(self, event):
+        self.id = event.id
+        self.name = event.name
+        self.event_type = event.event_type
+        self.time_start = event.time_start
+        self.time_end = event.time_end
+        self.specific_days = event.specific_days
+        self.days_of_week = event.days_of_week
+        self.grid = SlotGrid.for_event(event)
+        self._data = event.to_dict()
+
+    def to_dict(self):
+        """Convert to the same dictionary as Event.to_dict()"""
+        return dict(self._data)
+
+
+def load_event_metadata(event_id):
+    """Load an EventMetadata snapshot from the database, or None if the event does not exist"""
+    event = Event.query.filter_by(id=event_id).first()
+    return EventMetadata(event) if event else None
+
+
+def load_event_version(event_id):
+    """Load an event's availability version from the database, or None if the event does not exist"""
+    return db.session.scalar(select(Event.version).where(Event.id == event_id))
+
+
+def render_page(html):
+    """Encode a rendered page and tag it, giving the (body, etag) pair the crawler page cache holds"""
+    if html is None:
+        return None
+    body = html.encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()
+
+
+class EventCache:
+    """
+    Bounded in-process read-through LRU cache of values derived from one
+    event: its metadata, its availability version, its rendered crawler
+    pages. Keys are event IDs, or tuples that start with the event ID.
+
+    Entries leave the cache through LRU eviction, the TTL, or invalidate()
+    (called on every worker through the CacheInvalidator), so the TTL only
+    bounds staleness if a notification is lost. Concurrent misses for the
+    same key wait for a single load, and a load that races with an
+    invalidation is returned but not stored. None (a missing event) is never
+    cached, so an event created on another worker is found immediately.
+    """
+
+    def __init__(self, load, max_size, ttl):
+        self.load = load  # key -> value, or None
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (cached_at, value), least recently used first
+        self._entries = OrderedDict()
+        # event ID -> its cached keys, so invalidate() need not scan every entry
+        self._event_keys = {}
+        # key -> lock held while the value is loaded
+        self._loading = {}
+        # Bumped by every invalidation, to detect loads that raced with one
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        return None
+
+    def get(self, key, load=None):
+        """
+        Get the value for a key, calling load() (default: the cache's loader
+        with the key) on a miss. Returns None if the loader does.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry:
+                return entry[1]
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            # Another request may have loaded the value while this one waited
+            with self._lock:
+                entry = self._lookup(key)
+                if entry:
+                    return entry[1]
+                self.misses += 1
+                generation = self._generation
+
+            try:
+                value = load() if load else self.load(key)
+                if value is not None:
+                    with self._lock:
+                        if generation == self._generation:
+                            self._store(key, value)
+                return value
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is loading:
+                        del self._loading[key]
+
+    @staticmethod
+    def _event_id(key):
+        return key[0] if isinstance(key, tuple) else key
+
+    def _store(self, key, value):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        self._event_keys.setdefault(self._event_id(key), set()).add(key)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            keys = self._event_keys[self._event_id(evicted)]
+            keys.discard(evicted)
+            if not keys:
+                del self._event_keys[self._event_id(evicted)]
+
+    def put(self, key, value):
+        """Add or replace the cached value for a key"""
+        with self._lock:
+            self._store(key, value)
+
+    def invalidate(self, event_id):
+        """Drop every entry of an event after it changes"""
+        with self._lock:
+            self._generation += 1
+            for key in self._event_keys.pop(event_id, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._event_keys.clear()
+
+    def stats(self):
+        """Get hit/miss counters"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRatio': self.hits / requests if requests else 0.0,
+                'size': len(self._entries)
+            }
@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import sys
+
+# Gunicorn settings, overridable through the environment.
+#
+# gthread workers serve each request on a thread, so a slow upstream call
+# (Google Calendar can take seconds) or an open live-update stream only ties
+# up one thread instead of a whole worker. The backend's blocking clients are
+# thread-safe as used: psycopg2 connections come from SQLAlchemy's pool and
+# Calendar API calls use a fresh httplib2 client per request.
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+# Each gthread worker already serves `threads` requests at once, so the sync
+# worker rule of thumb (2 * CPUs + 1) would only multiply database
+# connections; see on_starting for the connection check
+workers = int(os.getenv("GUNICORN_WORKERS") or os.getenv("WEB_CONCURRENCY") or str(min(multiprocessing.cpu_count(), 4)))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# With gthread this is the worker heartbeat timeout, not a per-request limit,
+# so long-lived streams are not killed by it
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+# Create the app in each worker so database connections and the notification
+# listener thread are never shared across a fork
+preload_app = False
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+
+def check_database_connections(server):
+    """
+    Refuse to start when the workers could open more Postgres connections
+    than the server accepts (DB_MAX_CONNECTIONS, Postgres' max_connections;
+    default 100 like Postgres itself, minus its 3 superuser-reserved ones).
+    """
+    from config import connections_per_worker
+
+    per_worker = connections_per_worker(os.getenv("FLASK_CONFIG", "production"))
+    if per_worker is None:
+        return
+    available = int(os.getenv("DB_MAX_CONNECTIONS", "100")) - 3
+    needed = server.cfg.workers * per_worker
+    if needed > available:
+        sys.exit(
+            f"{server.cfg.workers} workers x {per_worker} connections (pool size + overflow + listener) "
+            f"= {needed} exceeds the {available} Postgres connections available; lower GUNICORN_WORKERS, "
+            f"DB_POOL_SIZE or DB_MAX_OVERFLOW, or raise max_connections and DB_MAX_CONNECTIONS"
+        )
+
+
+def on_starting(server):
+    check_database_connections(server)
+
+    # Prometheus multiprocess mode: workers write their samples to a shared
+    # directory (PROMETHEUS_MULTIPROC_DIR) that /api/metrics aggregates
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    # Samples from a previous run would be counted again
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
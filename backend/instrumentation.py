@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event as sa_event
+
+
+def query_budget(limit):
+    """Override QUERY_BUDGET for a single view (apply below @app.route)"""
+    def decorator(function):
+        function.query_budget = limit
+        return function
+    return decorator
+
+
+class Instrumentation:
+    """
+    Per-request timing and SQL accounting.
+
+    before_request/after_request hooks measure each request's wall time, and
+    SQLAlchemy cursor events add up the time, number of statements and rows
+    returned by the database while it runs. Every response carries the
+    numbers in a Server-Timing header, and they are aggregated per endpoint
+    (see stats()). A request that issues more statements than its query
+    budget is logged with its most repeated statement, which is usually the
+    N+1 loop that caused it. Rows are counted from the DB-API rowcount, which
+    SQLite does not report for SELECTs.
+    """
+
+    def __init__(self, app, db):
+        self.query_budget = app.config['QUERY_BUDGET']
+        self.slow_request_seconds = app.config['SLOW_REQUEST_MS'] / 1000
+        self._endpoints = {}
+        self._lock = threading.Lock()
+        # Called with (endpoint, method, status, wall seconds, queries) after every request
+        self.listeners = []
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        with app.app_context():
+            sa_event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            sa_event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _start_request(self):
+        g.request_timing = {
+            'started': time.perf_counter(),
+            'db_seconds': 0.0,
+            'queries': 0,
+            'rows': 0,
+            'statements': Counter()
+        }
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is discarded with it when the statement raises
+        context._query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not has_request_context() or 'request_timing' not in g:
+            return
+        elapsed = time.perf_counter() - context._query_started
+        timing = g.request_timing
+        timing['db_seconds'] += elapsed
+        timing['queries'] += 1
+        timing['statements'][statement] += 1
+        if cursor.rowcount > 0:
+            timing['rows'] += cursor.rowcount
+
+    def _finish_request(self, response):
+        timing = g.pop('request_timing', None)
+        if timing is None:
+            return response
+
+        wall_seconds = time.perf_counter() - timing['started']
+        endpoint = request.endpoint or 'unmatched'
+
+        response.headers['Server-Timing'] = (
+            f'app;dur={(wall_seconds - timing["db_seconds"]) * 1000:.1f}, '
+            f'db;dur={timing["db_seconds"] * 1000:.1f};desc="{timing["queries"]} queries, {timing["rows"]} rows"'
+        )
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', self.query_budget)
+        over_budget = timing['queries'] > budget
+        if over_budget:
+            message = f"Query budget exceeded: {request.method} {endpoint} issued {timing['queries']} queries (budget {budget})"
+            statement, count = timing['statements'].most_common(1)[0]
+            if count > 1:
+                message += f"; likely N+1, repeated {count}x: {' '.join(statement.split())[:200]}"
+            print(message)
+        elif wall_seconds >= self.slow_request_seconds:
+            print(
+                f"Slow request: {request.method} {endpoint} took {wall_seconds * 1000:.0f}ms "
+                f"({timing['db_seconds'] * 1000:.0f}ms in {timing['queries']} queries)"
+            )
+
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0,
+                'wallSeconds': 0.0,
+                'dbSeconds': 0.0,
+                'queries': 0,
+                'rows': 0,
+                'overBudget': 0
+            })
+            stats['requests'] += 1
+            stats['wallSeconds'] += wall_seconds
+            stats['dbSeconds'] += timing['db_seconds']
+            stats['queries'] += timing['queries']
+            stats['rows'] += timing['rows']
+            stats['overBudget'] += int(over_budget)
+
+        for listener in self.listeners:
+            listener(endpoint, request.method, response.status_code, wall_seconds, timing['queries'])
+        return response
+
+    def stats(self):
+        """Get the aggregated counters for every endpoint"""
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._endpoints.items()}
@@ -1,12 +1,127 @@
+import json
+import os
+import time
+
+import click
+from flask import current_app
 from flask_migrate import Migrate
 from flask.cli import FlaskGroup
+from sqlalchemy import func
 from app import create_app
-from models import db
+from availability_storage import convert as convert_availability
+from change_log import prune as prune_change_log
+from models import db, Event
+from replay import load_log, replay, synthetic_log
+from seed_data import seed
+from slot_counts import rebuild as rebuild_slot_counts
 
-app = create_app()
+app = create_app(os.getenv("FLASK_CONFIG", "default"))
 migrate = Migrate(app, db)
 
 cli = FlaskGroup(app)
 
+
+@cli.command('rebuild-slot-counts')
+@click.option('--event-id', default=None, help='Only rebuild the counts of this event.')
+def rebuild_slot_counts_command(event_id):
+    """Recompute the slot_counts summary from the stored availability."""
+    rows = rebuild_slot_counts(current_app.config['AVAILABILITY_STORAGE'], event_id)
+    db.session.commit()
+    click.echo(f"Rebuilt {rows} slot count rows")
+
+
+@cli.command('convert-availability')
+@click.option('--to', 'storage', type=click.Choice(['rows', 'bitmap']), required=True,
+              help='Storage mode to convert the stored availability into.')
+@click.option('--event-id', default=None, help='Only convert the availability of this event.')
+@click.option('--batch-size', default=500, show_default=True, help='Events converted per commit.')
+def convert_availability_command(storage, event_id, batch_size):
+    """Copy participant availability between the rows and bitmap storage modes."""
+    def progress(done, total, rows):
+        click.echo(f"{done}/{total} events, {rows} rows written")
+
+    rows = convert_availability(storage, event_id, batch_size, progress)
+    click.echo(f"Converted availability to {storage} storage: {rows} rows written")
+    if storage != current_app.config['AVAILABILITY_STORAGE']:
+        click.echo(f"Set AVAILABILITY_STORAGE={storage} and restart the backend to use it")
+
+
+@cli.command('prune-availability-changes')
+@click.option('--days', default=30, show_default=True, help='Keep changes made within this many days.')
+@click.option('--batch-size', default=10000, show_default=True, help='Rows deleted per commit.')
+def prune_availability_changes_command(days, batch_size):
+    """Delete old delta-sync change log entries."""
+    rows = prune_change_log(days, batch_size, lambda deleted: click.echo(f"{deleted} rows deleted"))
+    click.echo(f"Pruned {rows} availability change rows older than {days} days")
+
+
+@cli.command('seed-data')
+@click.option('--events', default=1000, show_default=True, help='Number of events to generate.')
+@click.option('--participants', default=10, show_default=True, help='Average participants per event.')
+@click.option('--max-days', default=7, show_default=True, help='Maximum days per event.')
+@click.option('--batch-size', default=1000, show_default=True, help='Events loaded per COPY and commit.')
+@click.option('--seed', 'random_seed', default=None, type=int, help='Random seed for a reproducible dataset.')
+def seed_data_command(events, participants, max_days, batch_size, random_seed):
+    """Bulk load synthetic events and availability for capacity testing."""
+    storage = current_app.config['AVAILABILITY_STORAGE']
+    started = time.monotonic()
+
+    def progress(done, totals):
+        rows = totals['responses'] + totals['availability_bitmaps']
+        click.echo(f"{done}/{events} events, {rows} availability rows ({time.monotonic() - started:.0f}s)")
+
+    totals = seed(storage, events, participants, max_days, batch_size, random_seed, progress)
+    for table, rows in totals.items():
+        click.echo(f"{table}: {rows} rows")
+    click.echo(f"Seeded in {time.monotonic() - started:.1f}s")
+
+
+@cli.command('replay')
+@click.argument('base_url')
+@click.option('--log', 'log_path', type=click.Path(exists=True, dir_okay=False),
+              help='JSON lines of {method, path, body, timestamp} or an access log (default: a synthetic log).')
+@click.option('--rate', default=None, type=float,
+              help='Requests per second, instead of the times recorded in the log [default: 50 for a synthetic log].')
+@click.option('--speed', default=1.0, show_default=True, help='Speed-up of the recorded request times.')
+@click.option('--duration', default=None, type=float,
+              help='Seconds to run [default: 60 at a fixed rate, the whole log at recorded times].')
+@click.option('--concurrency', default=100, show_default=True, help='Worker threads, i.e. maximum requests in flight.')
+@click.option('--requests', 'request_count', default=10000, show_default=True, help='Size of a synthetic log.')
+@click.option('--sample-events', default=1000, show_default=True, help='Events a synthetic log is spread over.')
+@click.option('--write-fraction', default=0.1, show_default=True, help='Share of availability submissions in a synthetic log.')
+@click.option('--save-log', type=click.Path(dir_okay=False), help='Write the synthetic log here for later runs.')
+@click.option('--seed', 'random_seed', default=None, type=int, help='Random seed for the synthetic log.')
+def replay_command(base_url, log_path, rate, speed, duration, concurrency, request_count, sample_events,
+                   write_fraction, save_log, random_seed):
+    """Replay a request log against a running instance at its recorded times or a target rate."""
+    if log_path:
+        entries = load_log(log_path)
+    else:
+        events = Event.query.order_by(func.random()).limit(sample_events).all()
+        if not events:
+            raise click.ClickException("No events in the database; run seed-data first or pass --log")
+        entries = synthetic_log(events, request_count, write_fraction, random_seed)
+        if save_log:
+            with open(save_log, 'w') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+    if not entries:
+        raise click.ClickException("The log has no replayable requests")
+
+    if rate is None and any(entry.get('offset') is None for entry in entries):
+        if log_path:
+            raise click.ClickException("The log does not record request times; pass --rate")
+        rate = 50.0
+    if rate is not None and duration is None:
+        duration = 60.0
+
+    if rate is None:
+        click.echo(f"Replaying {len(entries)} requests at {speed:g}x their recorded times against {base_url}...")
+    else:
+        click.echo(f"Replaying {len(entries)} requests at {rate:g}/s for {duration:g}s against {base_url}...")
+    result = replay(base_url, entries, rate, duration, concurrency, speed)
+    click.echo(json.dumps(result, indent=2))
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,121 @@
+import os
+import threading
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# With several gunicorn workers, PROMETHEUS_MULTIPROC_DIR must point to a
+# directory shared by all of them (and be set before this module is
+# imported); every worker writes its samples there and /api/metrics
+# aggregates them. Without it, metrics cover the current process only.
+
+# Metrics without labels open their sample files as soon as they are built,
+# so the directory must exist before anything below runs. gunicorn.conf.py
+# also creates it, but `manage.py` commands import the app without gunicorn.
+if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+REQUESTS = Counter(
+    'whenly_http_requests_total', 'HTTP requests handled',
+    ['method', 'endpoint', 'status']
+)
+REQUEST_LATENCY = Histogram(
+    'whenly_http_request_duration_seconds', 'HTTP request latency',
+    ['method', 'endpoint'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+REQUEST_DB_QUERIES = Histogram(
+    'whenly_http_request_db_queries', 'SQL statements issued per HTTP request',
+    ['endpoint'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    'whenly_db_pool_connections', 'Database pool connections by state',
+    ['state'], multiprocess_mode='livesum'
+)
+DB_POOL_CAPACITY = Gauge(
+    'whenly_db_pool_capacity', 'Maximum connections the database pools may open (size + overflow)',
+    multiprocess_mode='livesum'
+)
+DB_POOL_CHECKOUTS = Counter('whenly_db_pool_checkouts_total', 'Database pool checkouts')
+DB_POOL_CHECKOUT_WAIT = Counter('whenly_db_pool_checkout_wait_seconds_total', 'Time spent waiting for a pooled connection')
+DB_POOL_TIMEOUTS = Counter('whenly_db_pool_checkout_timeouts_total', 'Database pool checkouts that timed out')
+
+CACHE_REQUESTS = Counter(
+    'whenly_cache_requests_total', 'In-process cache lookups (calendar lookups count one per day)',
+    ['cache', 'result']
+)
+
+CALENDAR_LATENCY = Histogram(
+    'whenly_calendar_request_duration_seconds', 'Google Calendar API request latency',
+    ['operation'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+CALENDAR_ERRORS = Counter(
+    'whenly_calendar_errors_total', 'Failed Google Calendar API requests',
+    ['operation', 'reason']
+)
+
+AVAILABILITY_ROWS_WRITTEN = Counter(
+    'whenly_availability_rows_written_total', 'Availability rows inserted, updated or deleted',
+    ['storage']
+)
+
+
+def render():
+    """Get (body, content type) of the metrics of every worker process"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsExporter:
+    """
+    Exports the counters kept by the database pool and the in-process caches.
+
+    Those objects count in plain attributes; after every request the
+    exporter adds whatever changed since the previous request to the
+    Prometheus counters of this process and refreshes the pool gauges.
+    """
+
+    def __init__(self, db, caches):
+        self.db = db
+        self.caches = caches  # name -> object with stats() returning hits/misses
+        self._last = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint, method, status, wall_seconds, queries):
+        REQUESTS.labels(method=method, endpoint=endpoint, status=status).inc()
+        REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(wall_seconds)
+        REQUEST_DB_QUERIES.labels(endpoint=endpoint).observe(queries)
+        self.sync()
+
+    def sync(self):
+        with self._lock:
+            for name, cache in self.caches.items():
+                stats = cache.stats()
+                self._add(CACHE_REQUESTS.labels(cache=name, result='hit'), ('cache', name, 'hits'), stats['hits'])
+                self._add(CACHE_REQUESTS.labels(cache=name, result='miss'), ('cache', name, 'misses'), stats['misses'])
+
+            pool = self.db.engine.pool
+            if not hasattr(pool, 'stats'):
+                return
+            stats = pool.stats()
+            DB_POOL_CONNECTIONS.labels(state='checked_out').set(stats['checkedOut'])
+            DB_POOL_CONNECTIONS.labels(state='checked_in').set(stats['checkedIn'])
+            DB_POOL_CAPACITY.set(stats['size'] + max(stats['maxOverflow'], 0))
+            self._add(DB_POOL_CHECKOUTS, ('pool', 'checkouts'), stats['checkouts'])
+            self._add(DB_POOL_CHECKOUT_WAIT, ('pool', 'wait'), stats['waitSecondsTotal'])
+            self._add(DB_POOL_TIMEOUTS, ('pool', 'timeouts'), stats['timeouts'])
+
+    def _add(self, counter, key, total):
+        # Counters restart when a pool is recreated, so never go backwards
+        delta = total - self._last.get(key, 0)
+        if delta > 0:
+            counter.inc(delta)
+        self._last[key] = total
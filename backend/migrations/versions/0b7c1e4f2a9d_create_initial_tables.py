@@ -0,0 +1,78 @@
+"""Create the initial events, availability_slots and responses tables
+
+Revision ID: 0b7c1e4f2a9d
+Revises: 
+Create Date: 2025-05-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7c1e4f2a9d'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+BASE_TABLES = {'events', 'availability_slots', 'responses'}
+
+
+def upgrade():
+    # Schema the app used to create with db.create_all() before migrations
+    # owned it. Databases created that way have these tables but no
+    # alembic_version row; adopt them as they are so the upgrade can go on.
+    existing = set(sa.inspect(op.get_bind()).get_table_names()) - {'alembic_version'}
+    if existing:
+        if existing == BASE_TABLES:
+            return
+        raise RuntimeError(
+            "The database already has tables (%s) but no migration history, and they are not the "
+            "schema of an older version of the app. Find the revision they match and run "
+            "`python manage.py db stamp <revision>` before upgrading." % ', '.join(sorted(existing))
+        )
+
+    op.create_table(
+        'events',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('time_start', sa.String(length=20), nullable=False),
+        sa.Column('time_end', sa.String(length=20), nullable=False),
+        sa.Column('specific_days', sa.Text(), nullable=True),
+        sa.Column('days_of_week', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('created_by', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'availability_slots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=36), nullable=False),
+        sa.Column('date', sa.Date(), nullable=True),
+        sa.Column('day_of_week', sa.String(length=20), nullable=True),
+        sa.Column('start_time', sa.String(length=20), nullable=False),
+        sa.Column('end_time', sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'responses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=36), nullable=False),
+        sa.Column('slot_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=255), nullable=True),
+        sa.Column('user_name', sa.String(length=255), nullable=False),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.ForeignKeyConstraint(['slot_id'], ['availability_slots.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('responses')
+    op.drop_table('availability_slots')
+    op.drop_table('events')
@@ -0,0 +1,30 @@
+"""Track pruned availability_changes per event
+
+Revision ID: 5c8e1a7d3f20
+Revises: b91d3e6f4c27
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e1a7d3f20'
+down_revision = 'b91d3e6f4c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('changes_pruned_through', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_index('ix_availability_changes_created_at', 'availability_changes', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_availability_changes_created_at', table_name='availability_changes')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('changes_pruned_through')
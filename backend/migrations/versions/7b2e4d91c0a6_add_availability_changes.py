@@ -0,0 +1,37 @@
+"""Add availability_changes log for delta sync
+
+Revision ID: 7b2e4d91c0a6
+Revises: c3f1a7e2b9d4
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4d91c0a6'
+down_revision = 'c3f1a7e2b9d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'availability_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=36), nullable=False),
+        sa.Column('slot_index', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=255), nullable=True),
+        sa.Column('user_name', sa.String(length=255), nullable=False),
+        sa.Column('is_available', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_availability_changes_event_id_id', 'availability_changes', ['event_id', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_availability_changes_event_id_id', table_name='availability_changes')
+    op.drop_table('availability_changes')
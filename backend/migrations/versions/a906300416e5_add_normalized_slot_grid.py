@@ -0,0 +1,114 @@
+"""Add normalized slot grid columns to events and availability_slots
+
+Revision ID: a906300416e5
+Revises: d5a9d8b3d0b1
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a906300416e5'
+down_revision = 'd5a9d8b3d0b1'
+branch_labels = None
+depends_on = None
+
+# Grid layout at the time of this migration (see slot_grid.SlotGrid)
+SLOT_MINUTES = 15
+
+
+def _minutes(value):
+    value = value.strip()
+    if value.upper().endswith(('AM', 'PM')):
+        parsed = datetime.strptime(value, '%I:%M %p')
+    else:
+        parsed = datetime.strptime(value, '%H:%M')
+    return parsed.hour * 60 + parsed.minute
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('start_minute', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('end_minute', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('slot_minutes', sa.Integer(), nullable=True))
+
+    with op.batch_alter_table('availability_slots', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('slot_index', sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    events = bind.execute(sa.text(
+        "SELECT id, event_type, time_start, time_end, specific_days, days_of_week FROM events"
+    )).all()
+
+    for event in events:
+        try:
+            start = _minutes(event.time_start)
+            end = _minutes(event.time_end) or 24 * 60
+        except ValueError:
+            continue  # Unparseable time range; the grid falls back to the strings
+
+        bind.execute(
+            sa.text("UPDATE events SET start_minute = :start, end_minute = :end, slot_minutes = :slot WHERE id = :id"),
+            {'start': start, 'end': end, 'slot': SLOT_MINUTES, 'id': event.id}
+        )
+
+        # Index the grid-aligned slots; the per-day slots created with the
+        # event's full time range stay off the grid
+        days = json.loads((event.days_of_week if event.event_type == 'daysOfWeek' else event.specific_days) or '[]')
+        day_index = {day: index for index, day in enumerate(days)}
+        times = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(start, end, SLOT_MINUTES)]
+        time_index = {time_str: index for index, time_str in enumerate(times)}
+
+        slots = bind.execute(sa.text(
+            "SELECT id, date, day_of_week, start_time FROM availability_slots WHERE event_id = :event_id"
+        ).columns(
+            sa.column('id', sa.Integer),
+            sa.column('date', sa.Date),
+            sa.column('day_of_week', sa.String),
+            sa.column('start_time', sa.String)
+        ), {'event_id': event.id}).all()
+
+        updates = []
+        for slot in slots:
+            day = slot.day_of_week if event.event_type == 'daysOfWeek' else str(slot.date)
+            if day in day_index and slot.start_time in time_index:
+                updates.append({
+                    'id': slot.id,
+                    'slot_index': day_index[day] * len(times) + time_index[slot.start_time]
+                })
+        if updates:
+            bind.execute(sa.text("UPDATE availability_slots SET slot_index = :slot_index WHERE id = :id"), updates)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_availability_slots_event_slot_index', 'availability_slots', ['event_id', 'slot_index'],
+            unique=True,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text('slot_index IS NOT NULL'),
+            sqlite_where=sa.text('slot_index IS NOT NULL')
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_availability_slots_event_slot_index',
+            table_name='availability_slots',
+            if_exists=True,
+            postgresql_concurrently=True
+        )
+
+    with op.batch_alter_table('availability_slots', schema=None) as batch_op:
+        batch_op.drop_column('slot_index')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('slot_minutes')
+        batch_op.drop_column('end_minute')
+        batch_op.drop_column('start_minute')
@@ -0,0 +1,77 @@
+"""Add unique participant indexes to availability_bitmaps
+
+Revision ID: b91d3e6f4c27
+Revises: e8d06b5f3a17
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91d3e6f4c27'
+down_revision = 'e8d06b5f3a17'
+branch_labels = None
+depends_on = None
+
+# (name, columns, partial index predicate)
+INDEXES = [
+    ('uq_availability_bitmaps_event_user_id', ['event_id', 'user_id'], 'user_id IS NOT NULL'),
+    ('uq_availability_bitmaps_event_user_name', ['event_id', 'user_name'], 'user_id IS NULL'),
+]
+
+
+def upgrade():
+    # Merge duplicate bitmaps left behind by concurrent first submissions so
+    # the unique indexes can be built: OR each participant's bitmaps into the
+    # oldest one, then drop the others.
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT b.id, b.event_id, b.user_id, b.user_name, b.bits FROM availability_bitmaps b "
+        "JOIN (SELECT event_id, COALESCE(user_id, user_name) AS participant FROM availability_bitmaps "
+        "GROUP BY event_id, user_id IS NULL, COALESCE(user_id, user_name) HAVING COUNT(*) > 1) d "
+        "ON b.event_id = d.event_id AND COALESCE(b.user_id, b.user_name) = d.participant "
+        "ORDER BY b.id"
+    )).all()
+
+    merged = {}
+    for row in rows:
+        key = (row.event_id, row.user_id is None, row.user_id or row.user_name)
+        if key not in merged:
+            merged[key] = {'id': row.id, 'bits': bytes(row.bits), 'drop': []}
+            continue
+        keep = merged[key]
+        bits = bytes(row.bits)
+        length = max(len(keep['bits']), len(bits))
+        keep['bits'] = bytes(
+            a | b for a, b in zip(keep['bits'].ljust(length, b'\0'), bits.ljust(length, b'\0'))
+        )
+        keep['drop'].append(row.id)
+
+    for keep in merged.values():
+        if not keep['drop']:
+            continue
+        bind.execute(sa.text("UPDATE availability_bitmaps SET bits = :bits WHERE id = :id"), {'bits': keep['bits'], 'id': keep['id']})
+        bind.execute(
+            sa.text("DELETE FROM availability_bitmaps WHERE id IN :ids").bindparams(sa.bindparam('ids', expanding=True)),
+            {'ids': keep['drop']}
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name, 'availability_bitmaps', columns,
+                unique=True,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where),
+                sqlite_where=sa.text(where)
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='availability_bitmaps', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,46 @@
+"""Add slot_counts summary table
+
+Revision ID: c3f1a7e2b9d4
+Revises: a906300416e5
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1a7e2b9d4'
+down_revision = 'a906300416e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'slot_counts',
+        sa.Column('event_id', sa.String(length=36), nullable=False),
+        sa.Column('slot_index', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('event_id', 'slot_index')
+    )
+
+    # Populate from the response rows; with AVAILABILITY_STORAGE=bitmap run
+    # `python manage.py rebuild-slot-counts` after upgrading instead. Counts
+    # distinct participants as slot_counts.rebuild does: signed-in users by
+    # ID, anonymous ones by name.
+    op.execute(
+        "INSERT INTO slot_counts (event_id, slot_index, count) "
+        "SELECT event_id, slot_index, COUNT(*) FROM ("
+        "SELECT DISTINCT responses.event_id, availability_slots.slot_index, responses.user_id, "
+        "CASE WHEN responses.user_id IS NULL THEN responses.user_name END AS anonymous_name "
+        "FROM responses JOIN availability_slots ON responses.slot_id = availability_slots.id "
+        "WHERE availability_slots.slot_index IS NOT NULL"
+        ") participants "
+        "GROUP BY event_id, slot_index"
+    )
+
+
+def downgrade():
+    op.drop_table('slot_counts')
@@ -0,0 +1,62 @@
+"""Add composite indexes on availability_slots and responses
+
+Revision ID: d5a9d8b3d0b1
+Revises: fe52f246ce81
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9d8b3d0b1'
+down_revision = 'fe52f246ce81'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, unique, partial index predicate)
+INDEXES = [
+    ('uq_availability_slots_event_day_start', 'availability_slots',
+     ['event_id', 'day_of_week', 'start_time'], True, 'day_of_week IS NOT NULL'),
+    ('uq_availability_slots_event_date_start', 'availability_slots',
+     ['event_id', 'date', 'start_time'], True, 'date IS NOT NULL'),
+    ('ix_responses_event_user_id', 'responses', ['event_id', 'user_id'], False, None),
+    ('ix_responses_event_user_name', 'responses', ['event_id', 'user_name'], False, None),
+    ('ix_responses_slot_id', 'responses', ['slot_id'], False, None),
+]
+
+
+def upgrade():
+    # Merge duplicate slots left behind by concurrent submitters so the unique
+    # indexes can be built: point responses at the lowest slot id of each
+    # (event, day, time) group, then drop the others.
+    duplicates = (
+        "SELECT id, MIN(id) OVER (PARTITION BY event_id, day_of_week, date, start_time) AS keep_id "
+        "FROM availability_slots"
+    )
+    op.execute(
+        f"UPDATE responses SET slot_id = d.keep_id FROM ({duplicates}) AS d "
+        "WHERE responses.slot_id = d.id AND d.id <> d.keep_id"
+    )
+    op.execute(
+        f"DELETE FROM availability_slots WHERE id IN (SELECT id FROM ({duplicates}) AS d WHERE d.id <> d.keep_id)"
+    )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=unique,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
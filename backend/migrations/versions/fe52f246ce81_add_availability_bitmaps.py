@@ -0,0 +1,122 @@
+"""Add availability_bitmaps table and convert existing responses
+
+Revision ID: fe52f246ce81
+Revises: fe943ea809fa
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fe52f246ce81'
+down_revision = 'fe943ea809fa'
+branch_labels = None
+depends_on = None
+
+# Grid layout at the time of this migration (see slot_grid.SlotGrid)
+SLOT_MINUTES = 15
+
+
+def _minutes(value):
+    value = value.strip()
+    if value.upper().endswith(('AM', 'PM')):
+        parsed = datetime.strptime(value, '%I:%M %p')
+    else:
+        parsed = datetime.strptime(value, '%H:%M')
+    return parsed.hour * 60 + parsed.minute
+
+
+def _grid(event):
+    """Return (day index map, time index map, size) for an events row"""
+    days = json.loads((event.days_of_week if event.event_type == 'daysOfWeek' else event.specific_days) or '[]')
+    start, end = _minutes(event.time_start), _minutes(event.time_end)
+    if end == 0:
+        end = 24 * 60
+    times = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(start, end, SLOT_MINUTES)]
+    return (
+        {day: index for index, day in enumerate(days)},
+        {time_str: index for index, time_str in enumerate(times)},
+        len(days) * len(times)
+    )
+
+
+def upgrade():
+    op.create_table(
+        'availability_bitmaps',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=255), nullable=True),
+        sa.Column('user_name', sa.String(length=255), nullable=False),
+        sa.Column('bits', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_availability_bitmaps_event_id', 'availability_bitmaps', ['event_id'])
+
+    # Convert existing responses rows into one bitmap per (event, participant)
+    bind = op.get_bind()
+    bitmaps_table = sa.table(
+        'availability_bitmaps',
+        sa.column('event_id', sa.String),
+        sa.column('user_id', sa.String),
+        sa.column('user_name', sa.String),
+        sa.column('bits', sa.LargeBinary),
+        sa.column('created_at', sa.DateTime),
+        sa.column('updated_at', sa.DateTime)
+    )
+
+    events = bind.execute(sa.text(
+        "SELECT id, event_type, time_start, time_end, specific_days, days_of_week "
+        "FROM events WHERE id IN (SELECT DISTINCT event_id FROM responses)"
+    )).all()
+
+    for event in events:
+        day_index, time_index, size = _grid(event)
+        rows = bind.execute(sa.text(
+            "SELECT r.user_id, r.user_name, r.created_at, s.date, s.day_of_week, s.start_time "
+            "FROM responses r JOIN availability_slots s ON r.slot_id = s.id "
+            "WHERE r.event_id = :event_id ORDER BY r.created_at"
+        ).columns(
+            sa.column('user_id', sa.String),
+            sa.column('user_name', sa.String),
+            sa.column('created_at', sa.DateTime),
+            sa.column('date', sa.Date),
+            sa.column('day_of_week', sa.String),
+            sa.column('start_time', sa.String)
+        ), {'event_id': event.id}).all()
+
+        participants = {}
+        for row in rows:
+            day = row.day_of_week if event.event_type == 'daysOfWeek' else str(row.date)
+            if day not in day_index or row.start_time not in time_index:
+                continue  # Slot is not on the event grid
+            key = row.user_id or row.user_name
+            participant = participants.setdefault(key, {
+                'user_id': row.user_id,
+                'user_name': row.user_name,
+                'created_at': row.created_at,
+                'mask': 0
+            })
+            participant['mask'] |= 1 << (day_index[day] * len(time_index) + time_index[row.start_time])
+
+        if participants:
+            op.bulk_insert(bitmaps_table, [{
+                'event_id': event.id,
+                'user_id': participant['user_id'],
+                'user_name': participant['user_name'],
+                'bits': participant['mask'].to_bytes((size + 7) // 8, 'little'),
+                'created_at': participant['created_at'],
+                'updated_at': participant['created_at']
+            } for participant in participants.values()])
+
+
+def downgrade():
+    op.drop_index('ix_availability_bitmaps_event_id', table_name='availability_bitmaps')
+    op.drop_table('availability_bitmaps')
@@ -1,7 +1,7 @@
 """Add creator_name column for events
 
 Revision ID: fe943ea809fa
-Revises: 
+Revises: 0b7c1e4f2a9d
 Create Date: 2025-05-21 01:12:08.920031
 
 """
@@ -11,12 +11,17 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = 'fe943ea809fa'
-down_revision = None
+down_revision = '0b7c1e4f2a9d'
 branch_labels = None
 depends_on = None
 
 
 def upgrade():
+    # Databases created with db.create_all() already have the column
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('events')}
+    if 'creator_name' in columns:
+        return
+
     # ### commands auto generated by Alembic - please adjust! ###
     with op.batch_alter_table('events', schema=None) as batch_op:
         batch_op.add_column(sa.Column('creator_name', sa.String(length=255), nullable=True))
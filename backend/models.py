@@ -26,15 +26,24 @@ class Event(db.Model):
     event_type = db.Column(db.String(50), nullable=False)  # 'specificDays' or 'daysOfWeek'
     time_start = db.Column(db.String(20), nullable=False)  # Format: 'HH:MM AM/PM'
     time_end = db.Column(db.String(20), nullable=False)    # Format: 'HH:MM AM/PM'
+    # Normalized slot grid, computed once in create_event (see slot_grid.SlotGrid)
+    start_minute = db.Column(db.Integer)  # Minutes since midnight of time_start
+    end_minute = db.Column(db.Integer)    # Minutes since midnight of time_end (1440 for midnight)
+    slot_minutes = db.Column(db.Integer)  # Width of one grid cell
     specific_days = db.Column(db.Text)  # JSON string of dates ['YYYY-MM-DD', ...]
     days_of_week = db.Column(db.Text)   # JSON string of days ['Monday', 'Wednesday', ...]
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.String(255))  # User email of creator
     creator_name = db.Column(db.String(255))  # Name of the creator
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Bumped on every availability write
+    changes_pruned_through = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Highest availability_changes id pruned
     
     # Relationships
     availability_slots = db.relationship('AvailabilitySlot', backref='event', lazy=True, cascade="all, delete-orphan")
     responses = db.relationship('Response', backref='event', lazy=True, cascade="all, delete-orphan")
+    availability_bitmaps = db.relationship('AvailabilityBitmap', backref='event', lazy=True, cascade="all, delete-orphan")
+    slot_counts = db.relationship('SlotCount', backref='event', lazy=True, cascade="all, delete-orphan")
+    availability_changes = db.relationship('AvailabilityChange', backref='event', lazy=True, cascade="all, delete-orphan")
     
     def to_dict(self):
         """Convert model to dictionary"""
@@ -59,6 +68,27 @@ class AvailabilitySlot(db.Model):
     Represents a single time slot for availability in an event
     """
     __tablename__ = 'availability_slots'
+    __table_args__ = (
+        # One slot per (event, day, time); also stops concurrent submitters creating duplicates
+        db.Index(
+            'uq_availability_slots_event_day_start', 'event_id', 'day_of_week', 'start_time',
+            unique=True,
+            postgresql_where=db.text('day_of_week IS NOT NULL'),
+            sqlite_where=db.text('day_of_week IS NOT NULL')
+        ),
+        db.Index(
+            'uq_availability_slots_event_date_start', 'event_id', 'date', 'start_time',
+            unique=True,
+            postgresql_where=db.text('date IS NOT NULL'),
+            sqlite_where=db.text('date IS NOT NULL')
+        ),
+        db.Index(
+            'uq_availability_slots_event_slot_index', 'event_id', 'slot_index',
+            unique=True,
+            postgresql_where=db.text('slot_index IS NOT NULL'),
+            sqlite_where=db.text('slot_index IS NOT NULL')
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.String(36), db.ForeignKey('events.id'), nullable=False)
@@ -66,6 +96,7 @@ class AvailabilitySlot(db.Model):
     day_of_week = db.Column(db.String(20), nullable=True)  # For daysOfWeek events
     start_time = db.Column(db.String(20), nullable=False)  # Format: 'HH:MM AM/PM'
     end_time = db.Column(db.String(20), nullable=False)    # Format: 'HH:MM AM/PM'
+    slot_index = db.Column(db.Integer, nullable=True)  # Index in the event's SlotGrid (null for off-grid slots)
     
     # Relationships
     responses = db.relationship('Response', backref='slot', lazy=True)
@@ -78,7 +109,8 @@ class AvailabilitySlot(db.Model):
             'date': self.date.isoformat() if self.date else None,
             'dayOfWeek': self.day_of_week,
             'startTime': self.start_time,
-            'endTime': self.end_time
+            'endTime': self.end_time,
+            'slotIndex': self.slot_index
         }
 
 
@@ -87,6 +119,12 @@ class Response(db.Model):
     Represents a user's response for an event's availability
     """
     __tablename__ = 'responses'
+    __table_args__ = (
+        # The leading event_id column also serves event-wide lookups
+        db.Index('ix_responses_event_user_id', 'event_id', 'user_id'),
+        db.Index('ix_responses_event_user_name', 'event_id', 'user_name'),
+        db.Index('ix_responses_slot_id', 'slot_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.String(36), db.ForeignKey('events.id'), nullable=False)
@@ -106,4 +144,91 @@ class Response(db.Model):
             'userName': self.user_name,
             'isAvailable': self.is_available,
             'createdAt': self.created_at.isoformat() if self.created_at else None
-        } 
\ No newline at end of file
+        }
+
+
+class AvailabilityBitmap(db.Model):
+    """
+    Represents a user's availability for an event as a single packed bitmap.
+    Bit i is set when the user is available for slot index i of the event's
+    SlotGrid (see slot_grid.py).
+    """
+    __tablename__ = 'availability_bitmaps'
+    __table_args__ = (
+        # One bitmap per participant: signed-in users by ID, anonymous ones by name
+        db.Index(
+            'uq_availability_bitmaps_event_user_id', 'event_id', 'user_id',
+            unique=True,
+            postgresql_where=db.text('user_id IS NOT NULL'),
+            sqlite_where=db.text('user_id IS NOT NULL')
+        ),
+        db.Index(
+            'uq_availability_bitmaps_event_user_name', 'event_id', 'user_name',
+            unique=True,
+            postgresql_where=db.text('user_id IS NULL'),
+            sqlite_where=db.text('user_id IS NULL')
+        ),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.String(36), db.ForeignKey('events.id'), nullable=False, index=True)
+    user_id = db.Column(db.String(255), nullable=True)  # User ID or email (optional for anonymous responses)
+    user_name = db.Column(db.String(255), nullable=False)  # Name provided by the user
+    bits = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            'id': self.id,
+            'eventId': self.event_id,
+            'userId': self.user_id,
+            'userName': self.user_name,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class SlotCount(db.Model):
+    """
+    Number of participants available for each slot of an event. Maintained
+    incrementally by the availability handlers (see slot_counts.py) and
+    rebuilt with `python manage.py rebuild-slot-counts`.
+    """
+    __tablename__ = 'slot_counts'
+    
+    event_id = db.Column(db.String(36), db.ForeignKey('events.id'), primary_key=True)
+    slot_index = db.Column(db.Integer, primary_key=True)  # Index in the event's SlotGrid
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            'eventId': self.event_id,
+            'slotIndex': self.slot_index,
+            'count': self.count
+        }
+
+
+class AvailabilityChange(db.Model):
+    """
+    Append-only log of availability changes for delta sync. Each row records
+    a participant gaining (is_available=True) or losing (a tombstone,
+    is_available=False) one slot; the id doubles as the client's cursor.
+    Old rows are pruned (see change_log.py); events.changes_pruned_through
+    records the highest pruned id, so cursors from before it can be refused.
+    """
+    __tablename__ = 'availability_changes'
+    __table_args__ = (
+        db.Index('ix_availability_changes_event_id_id', 'event_id', 'id'),
+        db.Index('ix_availability_changes_created_at', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.String(36), db.ForeignKey('events.id'), nullable=False)
+    slot_index = db.Column(db.Integer, nullable=False)  # Index in the event's SlotGrid
+    user_id = db.Column(db.String(255), nullable=True)
+    user_name = db.Column(db.String(255), nullable=False)
+    is_available = db.Column(db.Boolean, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,165 @@
+import json
+import os
+import select
+import threading
+import time
+
+from sqlalchemy import event as sa_event, text
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+# Single Postgres channel every message is sent on; the topic travels in the payload
+CHANNEL = 'whenly'
+
+
+class NotificationBus:
+    """
+    Fan-out of small JSON messages to subscribers in every worker process.
+
+    On Postgres, publish() calls pg_notify() inside the caller's transaction,
+    so a message is only delivered if and when that transaction commits. A
+    daemon thread per process LISTENs on a dedicated connection and hands
+    each message to the callbacks subscribed to its topic. On other databases
+    (SQLite in development) there is a single process to reach, so messages
+    are held on the session and dispatched locally after commit.
+
+    Messages sent while the listener is disconnected are lost; after it
+    reconnects, subscribers of RECONNECTED are called so they can resync.
+    """
+
+    RECONNECTED = '__reconnected__'
+
+    def __init__(self, db):
+        self.db = db
+        self._subscribers = {}  # topic -> [callback, ...]
+        self._lock = threading.Lock()
+        self._engine = None
+        self._thread = None
+        self._pid = None
+        sa_event.listen(db.session, 'after_commit', self._flush_local)
+        sa_event.listen(db.session, 'after_soft_rollback', self._discard_local)
+
+    @property
+    def uses_postgres(self):
+        return self.db.engine.dialect.name == 'postgresql'
+
+    def publish(self, topic, data, deliver_locally=False):
+        """
+        Queue a message for delivery when the current transaction commits.
+        With `deliver_locally`, subscribers in this process are also called
+        synchronously right after the commit instead of waiting for the
+        listener (they may then see the message twice).
+        Returns False (and sends nothing) if the encoded message is too large.
+        """
+        payload = json.dumps({'topic': topic, 'data': data}, separators=(',', ':'))
+        if len(payload.encode('utf-8')) > MAX_PAYLOAD_BYTES:
+            return False
+
+        if self.uses_postgres:
+            self.db.session.execute(text("SELECT pg_notify(:channel, :payload)"), {
+                'channel': CHANNEL,
+                'payload': payload
+            })
+        if deliver_locally or not self.uses_postgres:
+            self.db.session.info.setdefault('pending_notifications', []).append(payload)
+        return True
+
+    def subscribe(self, topic, callback):
+        """Call `callback(data)` for every message published on `topic` (from the listener thread)"""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._subscribers.pop(topic, None)
+
+    def ensure_listening(self):
+        """
+        Start the listener thread in this process if it is not running. Called
+        per request rather than at import so the thread is started in each
+        worker after gunicorn forks, not in the master.
+        """
+        if not self.uses_postgres:
+            return
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            # Flask-SQLAlchemy resolves the engine through the app context, which the thread does not have
+            self._engine = self.db.engine
+            self._thread = threading.Thread(target=self._listen, name='notification-listener', daemon=True)
+            self._thread.start()
+
+    def _dispatch(self, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            print(f"Ignoring malformed notification: {payload[:200]}")
+            return
+        self._deliver(message.get('topic'), message.get('data'))
+
+    def _deliver(self, topic, data):
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, ()))
+        for callback in callbacks:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"Error in notification subscriber for {topic}: {str(e)}")
+
+    def _flush_local(self, session):
+        for payload in session.info.pop('pending_notifications', ()):
+            self._dispatch(payload)
+
+    def _discard_local(self, session, previous_transaction):
+        session.info.pop('pending_notifications', None)
+
+    def _connect(self):
+        """Open a connection outside the pool that is dedicated to LISTEN"""
+        connection = self._engine.raw_connection()
+        dbapi_connection = connection.driver_connection
+        connection.detach()
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return dbapi_connection
+
+    def _listen(self):
+        delay = 1
+        connected_before = False
+        while True:
+            connection = None
+            try:
+                connection = self._connect()
+                if connected_before:
+                    self._deliver(self.RECONNECTED, None)
+                connected_before = True
+                delay = 1
+
+                while True:
+                    # Wake up periodically so a dead connection is noticed
+                    if select.select([connection], [], [], 30) == ([], [], []):
+                        with connection.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._dispatch(connection.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Notification listener error, reconnecting in {delay}s: {str(e)}")
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
@@ -0,0 +1,217 @@
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from slot_grid import SlotGrid
+
+# Request line and time of a gunicorn or nginx access log entry
+ACCESS_LOG_REQUEST = re.compile(r'"(GET|HEAD) (\S+) HTTP/[\d.]+"')
+ACCESS_LOG_TIME = re.compile(r'\[(\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2} [+-]\d{4})\]')
+
+
+def _parse_timestamp(value):
+    """Seconds since the epoch of a JSON log timestamp (epoch seconds or ISO 8601)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def load_log(path):
+    """
+    Read a request log: JSON lines of {"method", "path", "body"}, or a
+    gunicorn/nginx access log. Access logs do not record request bodies, so
+    only their GET and HEAD requests are replayed.
+
+    Entries keep the time they were recorded as an `offset` in seconds from
+    the first one, read from a JSON "offset" (seconds) or "timestamp" (epoch
+    seconds or ISO 8601) or the access log time. It is None when the log
+    does not record one, and entries are ordered by it when they all do.
+    """
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                entry = json.loads(line)
+                if entry.get('offset') is not None:
+                    at = float(entry['offset'])
+                elif entry.get('timestamp') is not None:
+                    at = _parse_timestamp(entry['timestamp'])
+                else:
+                    at = None
+                entries.append({
+                    'method': entry.get('method', 'GET').upper(),
+                    'path': entry['path'],
+                    'body': entry.get('body'),
+                    'offset': at
+                })
+                continue
+            match = ACCESS_LOG_REQUEST.search(line)
+            if match:
+                logged_at = ACCESS_LOG_TIME.search(line)
+                entries.append({
+                    'method': match.group(1),
+                    'path': match.group(2),
+                    'body': None,
+                    'offset': datetime.strptime(logged_at.group(1), '%d/%b/%Y:%H:%M:%S %z').timestamp() if logged_at else None
+                })
+
+    if entries and all(entry['offset'] is not None for entry in entries):
+        entries.sort(key=lambda entry: entry['offset'])
+        first = entries[0]['offset']
+        for entry in entries:
+            entry['offset'] -= first
+    else:
+        for entry in entries:
+            entry['offset'] = None
+    return entries
+
+
+def synthetic_log(events, count, write_fraction=0.1, seed=None):
+    """
+    Build a request mix over the given Event rows: mostly event, responses
+    and heatmap reads, crawler page hits, and `write_fraction` availability
+    submissions from new participants.
+    """
+    rng = random.Random(seed)
+    grids = [(event.id, SlotGrid.for_event(event)) for event in events]
+    reads = [
+        ('/api/events/{}', 40),
+        ('/api/events/{}/responses', 25),
+        ('/api/events/{}/heatmap', 15),
+        ('/api/events/{}/best-times', 10),
+        ('/e/{}', 10)
+    ]
+    entries = []
+    for number in range(count):
+        event_id, grid = rng.choice(grids)
+        if grid.size and rng.random() < write_fraction:
+            start = rng.randrange(grid.size)
+            selected = [grid.slot_id(index) for index in range(start, min(grid.size, start + rng.randint(1, 16)))]
+            entries.append({
+                'method': 'POST',
+                'path': f'/api/events/{event_id}/availability',
+                'body': {'userName': f'Replay {number}', 'selectedSlots': selected}
+            })
+            continue
+        template = rng.choices([path for path, _ in reads], weights=[weight for _, weight in reads])[0]
+        entries.append({'method': 'GET', 'path': template.format(event_id), 'body': None})
+    return entries
+
+
+def _schedule(entries, rate, duration, speed):
+    """(seconds from the start, entry) for every request to send, in order"""
+    if rate is None:
+        # Recorded times, compressed or stretched by `speed`
+        for entry in entries:
+            due = entry['offset'] / speed
+            if duration is not None and due >= duration:
+                return
+            yield due, entry
+        return
+    # A fixed rate, cycling through the log
+    for sent in itertools.count():
+        due = sent / rate
+        if due >= duration:
+            return
+        yield due, entries[sent % len(entries)]
+
+
+def replay(base_url, entries, rate=None, duration=None, concurrency=100, speed=1.0):
+    """
+    Send the log entries to `base_url`. Without a `rate`, each entry is sent
+    at the time it was recorded (see load_log), divided by `speed`, once
+    through the log or for at most `duration` seconds. With a `rate`, the
+    entries are sent at that many requests per second for `duration`
+    seconds, cycling through the log.
+
+    Requests are started on schedule whether or not earlier ones have
+    finished (open loop). They run on a pool of `concurrency` threads with
+    one HTTP session each; a request that finds every thread busy is counted
+    as skipped, which means the target cannot keep up.
+    """
+    if rate is None and any(entry.get('offset') is None for entry in entries):
+        raise ValueError("The log does not record request times; give a rate")
+    if rate is not None and duration is None:
+        raise ValueError("A fixed rate needs a duration")
+
+    base_url = base_url.rstrip('/')
+    latencies = []
+    statuses = Counter()
+    errors = Counter()
+    scheduled = 0
+    skipped = 0
+    in_flight = 0
+    max_lag = 0.0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def start_session():
+        local.session = requests.Session()
+
+    def send(entry):
+        nonlocal in_flight
+        try:
+            started = time.perf_counter()
+            try:
+                response = local.session.request(entry['method'], base_url + entry['path'], json=entry['body'], timeout=30)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[response.status_code] += 1
+            except requests.RequestException as e:
+                with lock:
+                    errors[type(e).__name__] += 1
+        finally:
+            with lock:
+                in_flight -= 1
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='replay', initializer=start_session)
+    started = time.perf_counter()
+    try:
+        for due, entry in _schedule(entries, rate, duration, speed):
+            delay = started + due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                max_lag = max(max_lag, -delay)
+
+            scheduled += 1
+            with lock:
+                if in_flight >= concurrency:
+                    skipped += 1
+                    continue
+                in_flight += 1
+            executor.submit(send, entry)
+    finally:
+        executor.shutdown(wait=True)
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 1) if ordered else None
+
+    return {
+        'scheduled': scheduled,
+        'completed': len(ordered),
+        'skipped': skipped,
+        'errors': dict(errors),
+        'statuses': dict(sorted(statuses.items())),
+        'achievedRate': round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        'maxScheduleLagMs': round(max_lag * 1000, 1),
+        'p50Ms': percentile(50),
+        'p95Ms': percentile(95),
+        'p99Ms': percentile(99),
+        'maxMs': round(ordered[-1] * 1000, 1) if ordered else None
+    }
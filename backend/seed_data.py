@@ -0,0 +1,196 @@
+import csv
+import io
+import json
+import random
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from models import db, AvailabilityBitmap, AvailabilitySlot, Event, Response, SlotCount
+from slot_grid import DAYS_OF_WEEK, SLOT_MINUTES, SlotGrid, format_time
+
+
+def copy_rows(model, columns, rows):
+    """
+    Bulk load rows (tuples in `columns` order) into a model's table in the
+    current transaction. Postgres gets a single COPY ... FROM STDIN per call;
+    other databases fall back to an executemany INSERT.
+    """
+    if not rows:
+        return 0
+    table = model.__table__
+
+    if db.engine.dialect.name != 'postgresql':
+        db.session.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+        return len(rows)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # An unquoted empty field is NULL in COPY's CSV format
+        writer.writerow(['\\x' + value.hex() if isinstance(value, bytes) else value for value in row])
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def _twelve_hour(minute):
+    """Format minutes since midnight as 'HH:MM AM/PM', as the event form sends it"""
+    hour = minute // 60 % 24
+    return f"{hour % 12 or 12:02d}:{minute % 60:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+class DatasetGenerator:
+    """
+    Random but reproducible events and availability shaped like real usage:
+    a few days per event, a working-hours time range, and participants who
+    each mark a contiguous block on most days. Participant counts vary
+    around the requested average.
+    """
+
+    def __init__(self, participants, max_days, seed=None):
+        self.random = random.Random(seed)
+        self.participants = participants
+        self.max_days = max_days
+        self.today = date.today()
+
+    def event(self):
+        rng = self.random
+        start_minute = rng.randint(7, 10) * 60
+        end_minute = start_minute + rng.randint(4, 10) * 60
+        if rng.random() < 0.8:
+            first = self.today + timedelta(days=rng.randint(-60, 60))
+            days = [(first + timedelta(days=offset)).isoformat() for offset in range(rng.randint(1, self.max_days))]
+            event_type = 'specificDays'
+        else:
+            days = sorted(rng.sample(DAYS_OF_WEEK, rng.randint(1, min(self.max_days, 7))), key=DAYS_OF_WEEK.index)
+            event_type = 'daysOfWeek'
+
+        return {
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'event_type': event_type,
+            'days': days,
+            'start_minute': start_minute,
+            'end_minute': end_minute,
+            'created_at': datetime.now() - timedelta(days=rng.randint(0, 90), seconds=rng.randint(0, 86400))
+        }
+
+    def selections(self, grid):
+        """Yield (user_id, user_name, sorted slot indices) for each participant of an event"""
+        rng = self.random
+        count = rng.randint(max(1, self.participants // 2), max(1, self.participants * 3 // 2))
+        for participant in range(count):
+            indices = []
+            for day_index in range(len(grid.days)):
+                if rng.random() < 0.3:
+                    continue
+                start = rng.randrange(grid.slots_per_day)
+                length = rng.randint(1, grid.slots_per_day - start)
+                first = day_index * grid.slots_per_day + start
+                indices.extend(range(first, first + length))
+            user_id = f'seed-{participant}@example.com' if rng.random() < 0.3 else None
+            yield user_id, f'Participant {participant + 1}', indices
+
+
+def seed(storage, events, participants, max_days=7, batch_size=1000, seed=None, progress=None):
+    """
+    Generate `events` events with about `participants` participants each and
+    bulk load them, their availability ('rows' or 'bitmap' storage) and their
+    slot counts, committing every `batch_size` events. The change log is left
+    empty, so delta sync clients start from a full load. Returns the number of
+    rows written per table.
+    """
+    generator = DatasetGenerator(participants, max_days, seed)
+    totals = Counter()
+
+    # Responses reference slots, so slot IDs are assigned here rather than by the sequence
+    next_slot_id = (db.session.execute(select(func.max(AvailabilitySlot.id))).scalar() or 0) + 1
+
+    for batch_start in range(0, events, batch_size):
+        if db.engine.dialect.name == 'postgresql':
+            # Large COPYs can outlast DB_STATEMENT_TIMEOUT_MS; lift it for this transaction
+            db.session.execute(text("SET LOCAL statement_timeout = 0"))
+
+        event_rows, slot_rows, response_rows, bitmap_rows, count_rows = [], [], [], [], []
+
+        for _ in range(min(batch_size, events - batch_start)):
+            event = generator.event()
+            grid = SlotGrid(event['event_type'], event['days'], event['start_minute'], event['end_minute'])
+            specific = event['event_type'] == 'specificDays'
+            time_start = _twelve_hour(event['start_minute'])
+            time_end = _twelve_hour(event['end_minute'])
+            event_rows.append((
+                event['id'], f"Seeded event {batch_start + len(event_rows) + 1}", event['event_type'],
+                time_start, time_end, event['start_minute'], event['end_minute'], SLOT_MINUTES,
+                json.dumps(event['days']) if specific else None,
+                None if specific else json.dumps(event['days']),
+                event['created_at'], 'seed@example.com', 'Seed', 0
+            ))
+
+            # The per-day rows create_event adds
+            for day in event['days']:
+                slot_rows.append((
+                    next_slot_id, event['id'], date.fromisoformat(day) if specific else None, None if specific else day,
+                    time_start, time_end, None
+                ))
+                next_slot_id += 1
+
+            counts = Counter()
+            slot_ids = {}
+            for user_id, user_name, indices in generator.selections(grid):
+                counts.update(indices)
+                if storage == 'bitmap':
+                    mask = 0
+                    for index in indices:
+                        mask |= 1 << index
+                    bitmap_rows.append((event['id'], user_id, user_name, grid.pack(mask), event['created_at'], event['created_at']))
+                    continue
+                for index in indices:
+                    if index not in slot_ids:
+                        day, time_str = grid.slot_key(index)
+                        slot_ids[index] = next_slot_id
+                        slot_rows.append((
+                            next_slot_id, event['id'], date.fromisoformat(day) if specific else None,
+                            None if specific else day,
+                            time_str, format_time(grid.start_minute + (index % grid.slots_per_day + 1) * SLOT_MINUTES),
+                            index
+                        ))
+                        next_slot_id += 1
+                    response_rows.append((event['id'], slot_ids[index], user_id, user_name, True, event['created_at']))
+
+            count_rows.extend((event['id'], index, count) for index, count in sorted(counts.items()))
+
+        totals['events'] += copy_rows(Event, [
+            'id', 'name', 'event_type', 'time_start', 'time_end', 'start_minute', 'end_minute', 'slot_minutes',
+            'specific_days', 'days_of_week', 'created_at', 'created_by', 'creator_name', 'version'
+        ], event_rows)
+        totals['availability_slots'] += copy_rows(AvailabilitySlot, [
+            'id', 'event_id', 'date', 'day_of_week', 'start_time', 'end_time', 'slot_index'
+        ], slot_rows)
+        totals['responses'] += copy_rows(Response, [
+            'event_id', 'slot_id', 'user_id', 'user_name', 'is_available', 'created_at'
+        ], response_rows)
+        totals['availability_bitmaps'] += copy_rows(AvailabilityBitmap, [
+            'event_id', 'user_id', 'user_name', 'bits', 'created_at', 'updated_at'
+        ], bitmap_rows)
+        totals['slot_counts'] += copy_rows(SlotCount, ['event_id', 'slot_index', 'count'], count_rows)
+        db.session.commit()
+
+        if progress:
+            progress(batch_start + len(event_rows), totals)
+
+    if db.engine.dialect.name == 'postgresql':
+        # Move the ID sequence past the explicitly assigned slot IDs
+        db.session.execute(text(
+            "SELECT setval(pg_get_serial_sequence('availability_slots', 'id'), "
+            "(SELECT MAX(id) FROM availability_slots))"
+        ))
+        db.session.commit()
+    return totals
@@ -0,0 +1,122 @@
+from collections import Counter
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from availability_storage import anonymous_name
+from models import db, AvailabilityBitmap, AvailabilitySlot, Response, SlotCount
+from slot_grid import SlotGrid
+
+
+def _increment(event_id, indices):
+    """Add one to the count of each given slot of an event, creating the rows that do not exist yet"""
+    rows = [{'event_id': event_id, 'slot_index': index, 'count': 1} for index in indices]
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        statement = (postgresql if dialect == 'postgresql' else sqlite).insert(SlotCount)
+        statement = statement.on_conflict_do_update(
+            index_elements=[SlotCount.event_id, SlotCount.slot_index],
+            set_={'count': SlotCount.count + statement.excluded.count}
+        )
+        db.session.execute(statement, rows)
+        return
+
+    # No portable upsert: update the rows that exist, then insert the rest.
+    # Writers of an event are serialized by the version bump's row lock.
+    existing = set(db.session.scalars(
+        select(SlotCount.slot_index).where(SlotCount.event_id == event_id, SlotCount.slot_index.in_(indices))
+    ))
+    if existing:
+        db.session.execute(
+            update(SlotCount)
+            .where(SlotCount.event_id == event_id, SlotCount.slot_index.in_(existing))
+            .values(count=SlotCount.count + 1)
+        )
+    new_rows = [row for row in rows if row['slot_index'] not in existing]
+    if new_rows:
+        db.session.execute(insert(SlotCount), new_rows)
+
+
+def apply_deltas(event_id, added, removed):
+    """
+    Update the per-slot counts of an event in the current transaction after
+    a participant gained the `added` slot indices and lost the `removed` ones.
+    """
+    if added:
+        _increment(event_id, added)
+    if removed:
+        db.session.execute(
+            update(SlotCount)
+            .where(SlotCount.event_id == event_id, SlotCount.slot_index.in_(removed))
+            .values(count=SlotCount.count - 1)
+        )
+        db.session.execute(
+            delete(SlotCount).where(SlotCount.event_id == event_id, SlotCount.count <= 0)
+        )
+
+
+def read_counts(event_id):
+    """Get (slot index, count) for every slot of an event with at least one participant"""
+    return db.session.execute(
+        select(SlotCount.slot_index, SlotCount.count)
+        .where(SlotCount.event_id == event_id)
+        .order_by(SlotCount.slot_index)
+    ).all()
+
+
+def rebuild(storage, event_id=None):
+    """
+    Recompute slot_counts from the stored availability ('rows' or 'bitmap'
+    storage), for one event or all of them. Returns the number of rows written.
+    """
+    clear = delete(SlotCount)
+    if event_id:
+        clear = clear.where(SlotCount.event_id == event_id)
+    db.session.execute(clear)
+
+    if storage == 'bitmap':
+        bitmaps = AvailabilityBitmap.query
+        if event_id:
+            bitmaps = bitmaps.filter_by(event_id=event_id)
+
+        counts = Counter()
+        grids = {}
+        for bitmap in bitmaps.yield_per(1000):
+            if bitmap.event_id not in grids:
+                grids[bitmap.event_id] = SlotGrid.for_event(bitmap.event)
+            grid = grids[bitmap.event_id]
+            counts.update((bitmap.event_id, index) for index in grid.indices(SlotGrid.unpack(bitmap.bits)))
+
+        rows = [
+            {'event_id': bitmap_event_id, 'slot_index': index, 'count': count}
+            for (bitmap_event_id, index), count in counts.items()
+        ]
+        if rows:
+            db.session.execute(insert(SlotCount), rows)
+        return len(rows)
+
+    # One row per participant and slot. Participants are identified the same
+    # way as by the availability writes: signed-in users by ID, anonymous ones by name.
+    participants = (
+        select(
+            Response.event_id,
+            AvailabilitySlot.slot_index,
+            Response.user_id,
+            anonymous_name(Response).label('anonymous_name')
+        )
+        .join(AvailabilitySlot, Response.slot_id == AvailabilitySlot.id)
+        .where(AvailabilitySlot.slot_index.isnot(None))
+        .distinct()
+    )
+    if event_id:
+        participants = participants.where(Response.event_id == event_id)
+    participants = participants.subquery()
+
+    counts = (
+        select(participants.c.event_id, participants.c.slot_index, func.count())
+        .group_by(participants.c.event_id, participants.c.slot_index)
+    )
+    result = db.session.execute(
+        insert(SlotCount).from_select(['event_id', 'slot_index', 'count'], counts)
+    )
+    return result.rowcount
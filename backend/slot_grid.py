@@ -0,0 +1,157 @@
+import json
+from datetime import date, datetime, time, timedelta
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Width of a single cell in the availability grid (matches the frontend)
+SLOT_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+
+
+def parse_time(value):
+    """Parse 'HH:MM AM/PM' or 'HH:mm' into minutes since midnight"""
+    value = value.strip()
+    if value.upper().endswith(('AM', 'PM')):
+        parsed = datetime.strptime(value, '%I:%M %p')
+    else:
+        parsed = datetime.strptime(value, '%H:%M')
+    return parsed.hour * 60 + parsed.minute
+
+
+def format_time(minutes):
+    """Format minutes since midnight as 'HH:mm'"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class SlotGrid:
+    """
+    The dense grid of availability cells for an event: one row per day and one
+    column per SLOT_MINUTES step between the event's start and end time.
+    Slot index = day_index * slots_per_day + time_index.
+    """
+
+    def __init__(self, event_type, days, start_minute, end_minute, slot_minutes=SLOT_MINUTES):
+        # An end time of midnight means the end of the day
+        if end_minute == 0:
+            end_minute = MINUTES_PER_DAY
+
+        self.event_type = event_type
+        self.days = list(days)
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.slot_minutes = slot_minutes
+        self.times = [format_time(minute) for minute in range(start_minute, end_minute, slot_minutes)]
+        self.slots_per_day = len(self.times)
+        self.size = len(self.days) * self.slots_per_day
+
+        self._day_index = {day: index for index, day in enumerate(self.days)}
+        self._time_index = {time_str: index for index, time_str in enumerate(self.times)}
+
+    @classmethod
+    def for_event(cls, event):
+        """
+        Build the grid from an Event's days and its precomputed minute range,
+        falling back to parsing the time strings for events created before
+        the range was stored.
+        """
+        if event.event_type == 'daysOfWeek':
+            days = json.loads(event.days_of_week or '[]')
+        else:
+            days = json.loads(event.specific_days or '[]')
+        if event.start_minute is not None and event.end_minute is not None:
+            return cls(event.event_type, days, event.start_minute, event.end_minute, event.slot_minutes or SLOT_MINUTES)
+        return cls(event.event_type, days, parse_time(event.time_start), parse_time(event.time_end))
+
+    def split_slot_id(self, slot_id):
+        """Split a client slot ID into its (day, 'HH:mm') parts"""
+        if self.event_type == 'daysOfWeek':
+            # Format: "DAY-HH:mm", with a potential -undefined suffix
+            day, time_str = slot_id.split('-undefined')[0].split('-')
+            return day, time_str
+        # Format: "YYYY-MM-DD-HH:mm"
+        day, time_str = slot_id.rsplit('-', 1)
+        return day, time_str
+
+    def index(self, day, time_str):
+        """Return the slot index for a day and 'HH:mm' time, or raise ValueError if off the grid"""
+        try:
+            return self._day_index[str(day)] * self.slots_per_day + self._time_index[time_str]
+        except KeyError:
+            raise ValueError(f"Slot {day}-{time_str} is not part of this event")
+
+    def slot_index(self, slot_id):
+        """Return the slot index for a client slot ID, or raise ValueError if off the grid"""
+        return self.index(*self.split_slot_id(slot_id))
+
+    def slot_key(self, index):
+        """Return the (day, 'HH:mm') parts of a slot index"""
+        day_index, time_index = divmod(index, self.slots_per_day)
+        return self.days[day_index], self.times[time_index]
+
+    def slot_id(self, index):
+        """Return the client slot ID for a slot index"""
+        day_index, time_index = divmod(index, self.slots_per_day)
+        return f"{self.days[day_index]}-{self.times[time_index]}"
+
+    def day_dates(self, week_of):
+        """
+        Get the calendar date of each grid day. daysOfWeek events are placed in
+        the Monday-to-Sunday week containing `week_of`.
+        """
+        if self.event_type != 'daysOfWeek':
+            return [date.fromisoformat(day) for day in self.days]
+        monday = week_of - timedelta(days=week_of.weekday())
+        return [monday + timedelta(days=DAYS_OF_WEEK.index(day)) for day in self.days]
+
+    def slot_intervals(self, day_dates, tz):
+        """Get the (start, end) Unix epoch seconds of every slot, in slot index order"""
+        intervals = []
+        for day_date in day_dates:
+            midnight = datetime.combine(day_date, time(0), tzinfo=tz)
+            for minute in range(self.start_minute, self.end_minute, self.slot_minutes):
+                start = midnight + timedelta(minutes=minute)
+                intervals.append((int(start.timestamp()), int((start + timedelta(minutes=self.slot_minutes)).timestamp())))
+        return intervals
+
+    def busy_mask(self, slot_intervals, busy):
+        """
+        Build a bitmask of the slots that overlap any busy interval.
+        `busy` must be sorted and non-overlapping (see calendar_service.merge_intervals);
+        the intersection is a single sweep over both sorted lists.
+        """
+        mask = 0
+        position = 0
+        for start, end, index in sorted((start, end, index) for index, (start, end) in enumerate(slot_intervals)):
+            # Skip busy intervals that end before this slot starts
+            while position < len(busy) and busy[position][1] <= start:
+                position += 1
+            if position == len(busy):
+                break
+            if busy[position][0] < end:
+                mask |= 1 << index
+        return mask
+
+    def mask(self, slot_ids):
+        """Build an integer bitmask with one bit set per selected slot ID"""
+        mask = 0
+        for slot_id in slot_ids:
+            mask |= 1 << self.slot_index(slot_id)
+        return mask
+
+    def indices(self, mask):
+        """Return the sorted slot indices set in a bitmask"""
+        result = []
+        while mask:
+            low_bit = mask & -mask
+            result.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return result
+
+    def pack(self, mask):
+        """Serialize a bitmask to bytes (bit i of the mask is slot index i)"""
+        return mask.to_bytes((self.size + 7) // 8, 'little')
+
+    @staticmethod
+    def unpack(bits):
+        """Deserialize bytes produced by pack() back into an integer bitmask"""
+        return int.from_bytes(bits or b'', 'little')
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS_DIR = os.path.join(BACKEND_DIR, 'migrations')
+sys.path.insert(0, BACKEND_DIR)
+
+# Config reads the environment when it is imported
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.setdefault('CORS_ORIGINS', 'http://localhost')
+os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+from flask_migrate import Migrate, upgrade
+from google_auth_oauthlib.flow import Flow
+
+if not os.path.exists(os.path.join(BACKEND_DIR, 'client_secret.json')):
+    # The OAuth flow is never exercised by the tests
+    Flow.from_client_secrets_file = classmethod(lambda cls, **kwargs: None)
+
+from app import create_app
+from models import db
+
+
+@pytest.fixture(scope='session')
+def app():
+    """The app on a SQLite database built by the migrations"""
+    app = create_app()
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+    with app.app_context():
+        upgrade()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """A test client on empty tables and caches"""
+    with app.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    for name in ('event_cache', 'event_versions', 'crawler_pages'):
+        app.extensions[name].clear()
+    return app.test_client()
+
+
+@pytest.fixture
+def create_event(client):
+    """Create an event through the API and return its ID"""
+    def create(days=('Monday', 'Tuesday'), start='09:00 AM', end='11:00 AM', name='Team sync'):
+        payload = {
+            'eventName': name,
+            'createdBy': 'organizer@example.com',
+            'timeRange': {'start': start, 'end': end}
+        }
+        if days[0][0].isdigit():
+            payload.update(eventType='specificDays', specificDays=list(days))
+        else:
+            payload.update(eventType='daysOfWeek', daysOfWeek=list(days))
+        response = client.post('/api/events/create', json=payload)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['data']['eventId']
+    return create
+
+
+@pytest.fixture
+def signed_in(client):
+    """The test client with a signed-in Google user (a new one per test) and calendar credentials"""
+    with client.session_transaction() as session:
+        session.update(
+            google_id=f'google-{uuid.uuid4()}',
+            name='Ann',
+            email='ann@example.com',
+            credentials={
+                'token': 'token',
+                'refresh_token': 'refresh-token',
+                'token_uri': 'https://oauth2.googleapis.com/token',
+                'client_id': 'client-id',
+                'client_secret': 'client-secret',
+                'scopes': ['https://www.googleapis.com/auth/calendar.readonly']
+            }
+        )
+    return client
@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+
+from models import AvailabilitySlot
+
+
+def specific_days(count):
+    first = date(2026, 11, 2)
+    return [(first + timedelta(days=offset)).isoformat() for offset in range(count)]
+
+
+def test_submit_first_slot_of_each_day_on_a_24h_event(app, client, create_event):
+    # The per-day rows create_event adds hold the same (day, start time) as
+    # the first cell of each day when the range is sent in 24h format
+    days = specific_days(20)
+    event_id = create_event(days=days, start='09:00', end='11:00')
+    selected = [f'{day}-09:00' for day in days] + [f'{days[0]}-09:15']
+
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Ann', 'selectedSlots': selected})
+    assert response.status_code == 201, response.get_json()
+
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Bob', 'selectedSlots': selected[:2]})
+    assert response.status_code == 201, response.get_json()
+
+    responses = client.get(f'/api/events/{event_id}/responses').get_json()['data']['responses']
+    assert sorted(r['slotId'] for r in responses if r['userName'] == 'Ann') == sorted(selected)
+    assert sorted(r['slotId'] for r in responses if r['userName'] == 'Bob') == sorted(selected[:2])
+
+    # The per-day rows were adopted as grid cells rather than duplicated
+    with app.app_context():
+        slots = AvailabilitySlot.query.filter_by(event_id=event_id).all()
+    assert len(slots) == 21
+    assert all(slot.slot_index is not None for slot in slots)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from best_times import find_best_times
+from slot_grid import SlotGrid
+
+
+def grid_and_matrix(availability):
+    """A Monday/Tuesday 09:00-10:00 grid and the matrix of {user: [slot IDs]}"""
+    grid = SlotGrid('daysOfWeek', ['Monday', 'Tuesday'], 9 * 60, 10 * 60)
+    users = list(availability)
+    matrix = np.zeros((len(users), grid.size), dtype=bool)
+    for row, slot_ids in enumerate(availability.values()):
+        for slot_id in slot_ids:
+            matrix[row, grid.slot_index(slot_id)] = True
+    return grid, users, matrix
+
+
+AVAILABILITY = {
+    'Ann': ['Monday-09:00', 'Monday-09:15', 'Monday-09:30', 'Tuesday-09:30', 'Tuesday-09:45'],
+    'Bob': ['Monday-09:15', 'Monday-09:30', 'Tuesday-09:30', 'Tuesday-09:45'],
+    'Cat': ['Monday-09:00', 'Monday-09:15'],
+}
+
+
+def test_windows_are_ranked_by_attendees_then_grid_order():
+    grid, users, matrix = grid_and_matrix(AVAILABILITY)
+
+    windows = find_best_times(grid, users, matrix, 30)
+
+    assert [(window['slotId'], window['count']) for window in windows] == [
+        ('Monday-09:00', 2),
+        ('Monday-09:15', 2),
+        ('Tuesday-09:30', 2),
+    ]
+    assert windows[0]['attendees'] == ['Ann', 'Cat']
+    assert (windows[0]['startTime'], windows[0]['endTime']) == ('09:00', '09:30')
+
+
+def test_windows_never_span_two_days():
+    grid, users, matrix = grid_and_matrix({'Ann': ['Monday-09:45', 'Tuesday-09:00']})
+    assert find_best_times(grid, users, matrix, 30) == []
+
+
+def test_required_participants_and_minimum_attendees():
+    grid, users, matrix = grid_and_matrix(AVAILABILITY)
+
+    windows = find_best_times(grid, users, matrix, 30, required_users=['Bob'])
+    assert [window['slotId'] for window in windows] == ['Monday-09:15', 'Tuesday-09:30']
+
+    windows = find_best_times(grid, users, matrix, 15, min_attendees=3)
+    assert [window['slotId'] for window in windows] == ['Monday-09:15']
+
+    assert find_best_times(grid, users, matrix, 30, required_users=['Dan']) == []
+
+
+def test_limit_keeps_the_best_windows():
+    grid, users, matrix = grid_and_matrix(AVAILABILITY)
+    assert [window['slotId'] for window in find_best_times(grid, users, matrix, 15, limit=2)] == [
+        'Monday-09:15', 'Monday-09:00'
+    ]
+
+
+@pytest.mark.parametrize('duration, limit', [(0, 10), (20, 10), (30, 0), (30, -1)])
+def test_invalid_arguments_are_rejected(duration, limit):
+    grid, users, matrix = grid_and_matrix(AVAILABILITY)
+    with pytest.raises(ValueError):
+        find_best_times(grid, users, matrix, duration, limit=limit)
+
+
+@pytest.mark.parametrize('params', [{'limit': -1}, {'limit': 0}, {'limit': 101}, {'minAttendees': 0}, {'limit': 'x'}])
+def test_endpoint_rejects_bad_parameters(client, create_event, params):
+    event_id = create_event()
+    response = client.get(f'/api/events/{event_id}/best-times', query_string=params)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
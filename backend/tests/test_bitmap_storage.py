@@ -0,0 +1,78 @@
+import pytest
+
+from availability_storage import convert
+from models import db, AvailabilityBitmap, Response
+
+
+@pytest.fixture
+def bitmap_storage(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'AVAILABILITY_STORAGE', 'bitmap')
+
+
+def slots_by_user(client, event_id):
+    responses = client.get(f'/api/events/{event_id}/responses').get_json()['data']['responses']
+    users = {}
+    for response in responses:
+        users.setdefault(response['userName'], set()).add(response['slotId'])
+    return users
+
+
+def test_bitmap_storage_keeps_one_row_per_participant(app, client, create_event, bitmap_storage):
+    event_id = create_event()
+    for slots in (['Monday-09:00'], ['Monday-09:15', 'Tuesday-10:45']):
+        response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Ann', 'selectedSlots': slots})
+        assert response.status_code == 201
+    response = client.post(f'/api/events/{event_id}/availability', json={
+        'userName': 'Ann', 'userId': 'ann@example.com', 'selectedSlots': ['Monday-10:00']
+    })
+    assert response.status_code == 201
+    response = client.put(f'/api/events/{event_id}/availability', json={
+        'userName': 'Ann B.', 'userId': 'ann@example.com', 'selectedSlots': ['Monday-10:15']
+    })
+    assert response.status_code == 200
+
+    with app.app_context():
+        bitmaps = AvailabilityBitmap.query.filter_by(event_id=event_id).order_by(AvailabilityBitmap.id).all()
+        assert [(bitmap.user_id, bitmap.user_name) for bitmap in bitmaps] == [(None, 'Ann'), ('ann@example.com', 'Ann B.')]
+
+    assert slots_by_user(client, event_id) == {
+        'Ann': {'Monday-09:00', 'Monday-09:15', 'Tuesday-10:45'},
+        'Ann B.': {'Monday-10:15'}
+    }
+
+
+def test_bitmap_unique_indexes_reject_duplicates(app, client, create_event):
+    event_id = create_event()
+    with app.app_context():
+        db.session.add(AvailabilityBitmap(event_id=event_id, user_name='Ann', bits=b'\x01'))
+        db.session.commit()
+        db.session.add(AvailabilityBitmap(event_id=event_id, user_name='Ann', bits=b'\x02'))
+        with pytest.raises(Exception):
+            db.session.commit()
+        db.session.rollback()
+
+
+def test_convert_between_rows_and_bitmaps(app, client, create_event, monkeypatch):
+    event_id = create_event()
+    submissions = {
+        'Ann': ['Monday-09:00', 'Monday-09:15', 'Tuesday-10:45'],
+        'Bob': ['Tuesday-09:00']
+    }
+    for user_name, slots in submissions.items():
+        response = client.post(f'/api/events/{event_id}/availability', json={'userName': user_name, 'selectedSlots': slots})
+        assert response.status_code == 201
+    expected = {user_name: set(slots) for user_name, slots in submissions.items()}
+
+    with app.app_context():
+        assert convert('bitmap') == 2
+        db.session.execute(db.delete(Response))
+        db.session.commit()
+
+    monkeypatch.setitem(app.config, 'AVAILABILITY_STORAGE', 'bitmap')
+    assert slots_by_user(client, event_id) == expected
+
+    with app.app_context():
+        assert convert('rows', event_id) == 4
+
+    monkeypatch.setitem(app.config, 'AVAILABILITY_STORAGE', 'rows')
+    assert slots_by_user(client, event_id) == expected
@@ -0,0 +1,89 @@
+from datetime import date
+
+import pytest
+
+import app as backend_app
+from calendar_cache import CalendarCache, merge_events
+from test_calendar_service import FakeCalendarService
+
+
+def event(calendar, start, end, summary='Meeting'):
+    return {'calendar': calendar, 'summary': summary, 'start': start, 'end': end}
+
+
+def test_lookup_reuses_cached_days_and_returns_missing_spans():
+    cache = CalendarCache(ttl=300, max_users=10)
+    standup = event('work', '2026-11-03T09:00:00+00:00', '2026-11-03T09:15:00+00:00')
+    overnight = event('home', '2026-11-04T23:00:00+00:00', '2026-11-05T01:00:00+00:00')
+    cache.store('ann', date(2026, 11, 2), date(2026, 11, 5), [standup, overnight])
+
+    # A sub-range is served entirely from the cache
+    events, missing = cache.lookup('ann', date(2026, 11, 3), date(2026, 11, 4))
+    assert missing == []
+    assert events == [standup, overnight]
+
+    # A wider range only fetches the days around the cached ones
+    events, missing = cache.lookup('ann', date(2026, 11, 1), date(2026, 11, 7))
+    assert missing == [(date(2026, 11, 1), date(2026, 11, 1)), (date(2026, 11, 6), date(2026, 11, 7))]
+    # The overnight event is cached under both of its days and merged back into one
+    assert merge_events(events) == [standup, overnight]
+
+
+def test_event_ending_at_midnight_does_not_occupy_the_next_day():
+    cache = CalendarCache(ttl=300, max_users=10)
+    late = event('work', '2026-11-02T23:00:00+00:00', '2026-11-03T00:00:00+00:00')
+    cache.store('ann', date(2026, 11, 2), date(2026, 11, 3), [late])
+    assert cache.lookup('ann', date(2026, 11, 3), date(2026, 11, 3)) == ([], [])
+
+
+def test_expired_days_are_fetched_again(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('calendar_cache.time.monotonic', lambda: now[0])
+    cache = CalendarCache(ttl=60, max_users=10)
+    cache.store('ann', date(2026, 11, 2), date(2026, 11, 2), [])
+
+    now[0] += 59
+    assert cache.lookup('ann', date(2026, 11, 2), date(2026, 11, 2)) == ([], [])
+    now[0] += 1
+    assert cache.lookup('ann', date(2026, 11, 2), date(2026, 11, 2))[1] == [(date(2026, 11, 2), date(2026, 11, 2))]
+
+
+def test_least_recently_used_user_is_evicted():
+    cache = CalendarCache(ttl=300, max_users=2)
+    day = date(2026, 11, 2)
+    cache.store('ann', day, day, [])
+    cache.store('bob', day, day, [])
+    cache.lookup('ann', day, day)
+    cache.store('cat', day, day, [])
+
+    assert cache.lookup('ann', day, day)[1] == []
+    assert cache.lookup('bob', day, day)[1] == [(day, day)]
+    assert cache.stats()['users'] == 2
+
+
+@pytest.fixture
+def calendar_service(monkeypatch):
+    service = FakeCalendarService({'work': 0})
+    monkeypatch.setattr(backend_app, 'get_calendar_service', lambda root_url=None: service)
+    return service
+
+
+def test_endpoint_only_fetches_days_it_has_not_cached(signed_in, calendar_service):
+    def get(start, end):
+        response = signed_in.get('/api/calendar/events', query_string={'startDate': start, 'endDate': end})
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()['data']
+
+    first = get('2026-11-02', '2026-11-04')
+    assert calendar_service.event_queries == [('work', '2026-11-02T00:00:00Z', '2026-11-04T23:59:59Z')]
+
+    # Same range again: no upstream call, same events
+    assert get('2026-11-02', '2026-11-04') == first
+    assert len(calendar_service.event_queries) == 1
+
+    # A wider range fetches only the new days
+    get('2026-11-01', '2026-11-05')
+    assert calendar_service.event_queries[1:] == [
+        ('work', '2026-11-01T00:00:00Z', '2026-11-01T23:59:59Z'),
+        ('work', '2026-11-05T00:00:00Z', '2026-11-05T23:59:59Z')
+    ]
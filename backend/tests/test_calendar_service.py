@@ -0,0 +1,143 @@
+import time
+from datetime import datetime
+
+import app as backend_app
+from calendar_service import FREEBUSY_MAX_CALENDARS, fetch_busy_intervals, fetch_calendar_events
+
+
+class FakeRequest:
+    def __init__(self, result, delay=0):
+        self.result = result
+        self.delay = delay
+
+    def execute(self, http=None):
+        time.sleep(self.delay)
+        return self.result
+
+
+class FakeCalendarService:
+    """Calendar API client stub: calendar ID -> seconds its events.list takes"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.event_queries = []  # (calendar ID, timeMin, timeMax) of every events.list call
+
+    def calendarList(self):
+        return self
+
+    def events(self):
+        return self
+
+    def list(self, calendarId=None, **kwargs):
+        if calendarId is None:
+            return FakeRequest({'items': [{'id': cal_id, 'summary': cal_id} for cal_id in self.delays]})
+        self.event_queries.append((calendarId, kwargs.get('timeMin'), kwargs.get('timeMax')))
+        return FakeRequest({'items': [{
+            'summary': f'{calendarId} meeting',
+            'start': {'dateTime': '2026-11-02T09:00:00+00:00'},
+            'end': {'dateTime': '2026-11-02T10:00:00+00:00'}
+        }]}, self.delays[calendarId])
+
+
+def fetch(delays, max_workers, timeout):
+    events, failed = fetch_calendar_events(
+        FakeCalendarService(delays), None, '2026-11-02T00:00:00Z', '2026-11-03T00:00:00Z', max_workers, timeout
+    )
+    return [event['calendar'] for event in events], failed
+
+
+def test_slow_calendar_is_skipped():
+    assert fetch({'work': 0, 'slow': 2, 'home': 0}, max_workers=4, timeout=0.3) == (['work', 'home'], ['slow'])
+
+
+def test_timeout_starts_when_a_fetch_starts_running():
+    # 'second' waits 0.3s for the only thread and finishes after 0.6s, past the
+    # request's first 0.45s but within its own timeout; 'third' never gets to start
+    assert fetch({'first': 0.3, 'second': 0.3, 'third': 0}, max_workers=1, timeout=0.45) == (['first', 'second'], ['third'])
+
+
+class FakeFreeBusyService(FakeCalendarService):
+    """Calendar API client stub whose FreeBusy query answers from {calendar ID: busy list or errors}"""
+
+    def __init__(self, busy):
+        super().__init__({cal_id: 0 for cal_id in busy})
+        self.busy = busy
+        self.freebusy_queries = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.freebusy_queries.append(body)
+        calendars = {}
+        for item in body['items']:
+            busy = self.busy[item['id']]
+            calendars[item['id']] = {'errors': busy['errors']} if isinstance(busy, dict) else {
+                'busy': [{'start': start, 'end': end} for start, end in busy]
+            }
+        return FakeRequest({'calendars': calendars})
+
+
+def epoch(text):
+    return int(datetime.fromisoformat(text).timestamp())
+
+
+def test_busy_intervals_are_merged_across_calendars():
+    service = FakeFreeBusyService({
+        'work': [('2026-11-02T09:00:00Z', '2026-11-02T10:00:00Z'), ('2026-11-02T13:00:00Z', '2026-11-02T14:00:00Z')],
+        'home': [('2026-11-02T09:30:00Z', '2026-11-02T11:00:00Z'), ('2026-11-02T14:00:00Z', '2026-11-02T15:00:00Z')],
+    })
+
+    busy, failed = fetch_busy_intervals(service, None, '2026-11-02T00:00:00Z', '2026-11-03T00:00:00Z', timeout=1)
+
+    assert busy == [
+        [epoch('2026-11-02T09:00:00+00:00'), epoch('2026-11-02T11:00:00+00:00')],
+        [epoch('2026-11-02T13:00:00+00:00'), epoch('2026-11-02T15:00:00+00:00')]
+    ]
+    assert failed == []
+    # One query for every calendar
+    assert len(service.freebusy_queries) == 1
+
+
+def test_calendars_are_queried_in_chunks_and_failures_reported():
+    busy = {f'cal{number}': [] for number in range(FREEBUSY_MAX_CALENDARS + 1)}
+    busy['cal3'] = {'errors': [{'domain': 'global', 'reason': 'notFound'}]}
+    service = FakeFreeBusyService(busy)
+
+    intervals, failed = fetch_busy_intervals(service, None, '2026-11-02T00:00:00Z', '2026-11-03T00:00:00Z', timeout=1)
+
+    assert [len(query['items']) for query in service.freebusy_queries] == [FREEBUSY_MAX_CALENDARS, 1]
+    assert (intervals, failed) == ([], ['cal3'])
+
+
+def test_freebusy_mode_of_the_endpoint(signed_in, monkeypatch):
+    service = FakeFreeBusyService({
+        'work': [('2026-11-02T09:00:00Z', '2026-11-02T10:00:00Z')],
+        'shared': {'errors': [{'domain': 'global', 'reason': 'backendError'}]},
+    })
+    monkeypatch.setattr(backend_app, 'get_calendar_service', lambda root_url=None: service)
+
+    response = signed_in.get('/api/calendar/events', query_string={
+        'startDate': '2026-11-02', 'endDate': '2026-11-04', 'mode': 'freebusy'
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()['data'] == {
+        'busy': [[epoch('2026-11-02T09:00:00+00:00'), epoch('2026-11-02T10:00:00+00:00')]],
+        'partial': True,
+        'failedCalendars': ['shared']
+    }
+    # The whole of both end dates is covered, and no event resources are listed
+    assert [(query['timeMin'], query['timeMax']) for query in service.freebusy_queries] == [
+        ('2026-11-02T00:00:00Z', '2026-11-04T23:59:59Z')
+    ]
+    assert service.event_queries == []
+
+
+def test_calendar_endpoint_requires_sign_in(client):
+    assert client.get('/api/calendar/events?startDate=2026-11-02&endDate=2026-11-02&mode=freebusy').status_code == 401
+
+
+def test_calendar_endpoint_validates_the_date_range(signed_in):
+    assert signed_in.get('/api/calendar/events?startDate=2026-11-02&mode=freebusy').status_code == 400
+    assert signed_in.get('/api/calendar/events?startDate=2026-11-02&endDate=soon&mode=freebusy').status_code == 400
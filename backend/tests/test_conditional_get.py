@@ -0,0 +1,45 @@
+import pytest
+
+from test_query_budget import statement_count
+
+AVAILABILITY_READS = ['responses', 'heatmap', 'best-times']
+
+
+@pytest.fixture
+def event_id(client, create_event):
+    event_id = create_event()
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Ann', 'selectedSlots': ['Monday-09:00']})
+    assert response.status_code == 201
+    return event_id
+
+
+@pytest.mark.parametrize('read', AVAILABILITY_READS)
+def test_matching_etag_gets_304_without_reading_availability(client, event_id, read):
+    first = client.get(f'/api/events/{event_id}/{read}')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    etag = first.headers['ETag']
+
+    cached = client.get(f'/api/events/{event_id}/{read}', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag
+    # Event metadata and version both come from the per-worker caches
+    assert statement_count(cached) == 0
+
+
+@pytest.mark.parametrize('read', AVAILABILITY_READS)
+def test_availability_write_changes_the_etag(client, event_id, read):
+    etag = client.get(f'/api/events/{event_id}/{read}').headers['ETag']
+
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Bob', 'selectedSlots': ['Monday-09:15']})
+    assert response.status_code == 201
+
+    fresh = client.get(f'/api/events/{event_id}/{read}', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200
+    assert fresh.headers['ETag'] != etag
+
+
+def test_event_metadata_is_tagged_by_its_body(client, event_id):
+    first = client.get(f'/api/events/{event_id}')
+    assert first.status_code == 200
+    assert client.get(f'/api/events/{event_id}', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
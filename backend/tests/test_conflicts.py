@@ -0,0 +1,83 @@
+import base64
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import app as backend_app
+from slot_grid import SlotGrid
+
+
+def epoch(text):
+    return int(datetime.fromisoformat(text).timestamp())
+
+
+@pytest.fixture
+def grid():
+    """Monday and Tuesday, 09:00-10:00: slots 0-3 on Monday and 4-7 on Tuesday"""
+    return SlotGrid('daysOfWeek', ['Monday', 'Tuesday'], 9 * 60, 10 * 60)
+
+
+def busy_slots(grid, busy):
+    intervals = grid.slot_intervals(grid.day_dates(date(2026, 11, 4)), timezone.utc)
+    return grid.indices(grid.busy_mask(intervals, busy))
+
+
+def test_busy_interval_straddling_slot_boundaries_marks_every_slot_it_touches(grid):
+    # 09:10-09:20 overlaps the 09:00 and 09:15 slots
+    assert busy_slots(grid, [[epoch('2026-11-02T09:10:00+00:00'), epoch('2026-11-02T09:20:00+00:00')]]) == [0, 1]
+    # Monday 09:50 to Tuesday 09:05 covers the last Monday slot and the first Tuesday one
+    assert busy_slots(grid, [[epoch('2026-11-02T09:50:00+00:00'), epoch('2026-11-03T09:05:00+00:00')]]) == [3, 4]
+
+
+def test_intervals_touching_a_slot_boundary_do_not_mark_the_neighbour(grid):
+    assert busy_slots(grid, [
+        [epoch('2026-11-02T08:00:00+00:00'), epoch('2026-11-02T09:00:00+00:00')],
+        [epoch('2026-11-02T09:15:00+00:00'), epoch('2026-11-02T09:30:00+00:00')],
+        [epoch('2026-11-03T10:00:00+00:00'), epoch('2026-11-03T11:00:00+00:00')],
+    ]) == [1]
+
+
+def test_several_short_intervals_within_one_slot(grid):
+    assert busy_slots(grid, [
+        [epoch('2026-11-02T09:01:00+00:00'), epoch('2026-11-02T09:02:00+00:00')],
+        [epoch('2026-11-02T09:05:00+00:00'), epoch('2026-11-02T09:06:00+00:00')],
+        [epoch('2026-11-03T09:59:00+00:00'), epoch('2026-11-03T10:30:00+00:00')],
+    ]) == [0, 7]
+
+
+def test_endpoint_projects_busy_time_in_the_event_time_zone(signed_in, create_event, monkeypatch):
+    event_id = create_event(days=('Monday', 'Tuesday'), start='09:00 AM', end='10:00 AM')
+    queries = []
+
+    def fetch_busy_intervals(service, creds, time_min, time_max, timeout):
+        queries.append((time_min, time_max))
+        # 09:20-09:40 New York time on Monday, and a calendar that could not be read
+        return [[epoch('2026-11-02T14:20:00+00:00'), epoch('2026-11-02T14:40:00+00:00')]], ['shared']
+
+    monkeypatch.setattr(backend_app, 'fetch_busy_intervals', fetch_busy_intervals)
+    monkeypatch.setattr(backend_app, 'get_calendar_service', lambda root_url=None: None)
+
+    response = signed_in.get(f'/api/events/{event_id}/conflicts', query_string={
+        'timeZone': 'America/New_York', 'weekOf': '2026-11-04'
+    })
+
+    assert response.status_code == 200, response.get_json()
+    data = response.get_json()['data']
+    mask = SlotGrid.unpack(base64.b64decode(data['bitmap']))
+    assert [index for index in range(data['size']) if mask >> index & 1] == [1, 2]
+    assert (data['size'], data['slotsPerDay'], data['busyCount']) == (8, 4, 2)
+    assert (data['partial'], data['failedCalendars']) == (True, ['shared'])
+
+    # One query bounded by the first slot's start and the last slot's end
+    new_york = ZoneInfo('America/New_York')
+    assert queries == [(
+        datetime(2026, 11, 2, 9, tzinfo=new_york).astimezone(timezone.utc).isoformat(),
+        datetime(2026, 11, 3, 10, tzinfo=new_york).astimezone(timezone.utc).isoformat()
+    )]
+
+
+def test_endpoint_rejects_an_unknown_time_zone(signed_in, create_event):
+    event_id = create_event()
+    response = signed_in.get(f'/api/events/{event_id}/conflicts', query_string={'timeZone': 'Mars/Olympus'})
+    assert response.status_code == 400
@@ -0,0 +1,76 @@
+import hashlib
+import re
+
+from models import Event, db
+
+
+def statement_count(response):
+    return int(re.search(r'"(\d+) queries', response.headers['Server-Timing']).group(1))
+
+
+def test_page_is_tagged_for_crawlers_and_the_proxy_cache(app, client, create_event):
+    event_id = create_event(name='Team <sync>')
+
+    response = client.get(f'/e/{event_id}')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/html'
+    body = response.get_data()
+    assert b'<meta property="og:title" content="Team &lt;sync&gt;">' in body
+    assert response.headers['Cache-Control'] == f"public, max-age={app.config['CRAWLER_PAGE_MAX_AGE']}"
+    assert response.headers['ETag'] == f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def test_repeated_hits_are_served_from_the_page_cache(client, create_event):
+    event_id = create_event()
+    first = client.get(f'/e/{event_id}')
+
+    again = client.get(f'/e/{event_id}')
+
+    assert again.get_data() == first.get_data()
+    assert statement_count(again) == 0
+
+
+def test_matching_etag_gets_a_304(client, create_event):
+    event_id = create_event()
+    etag = client.get(f'/e/{event_id}').headers['ETag']
+
+    response = client.get(f'/e/{event_id}', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == etag
+    assert statement_count(response) == 0
+
+
+def test_pages_are_cached_per_host(client, create_event):
+    event_id = create_event()
+    first = client.get(f'/e/{event_id}', base_url='https://whenly.example')
+    second = client.get(f'/e/{event_id}', base_url='https://other.example')
+
+    assert b'https://whenly.example/e/' in first.get_data()
+    assert b'https://other.example/e/' in second.get_data()
+    assert first.headers['ETag'] != second.headers['ETag']
+
+
+def test_invalidation_rerenders_the_page(app, client, create_event):
+    event_id = create_event(name='Before')
+    client.get(f'/e/{event_id}')
+    with app.app_context():
+        # Invalidations go out when the transaction commits
+        db.session.get(Event, event_id).name = 'After'
+        app.extensions['cache_invalidator'].publish(event_id, 'event')
+        db.session.commit()
+
+    again = client.get(f'/e/{event_id}')
+
+    assert b'content="After"' in again.get_data()
+    assert statement_count(again) > 0
+
+
+def test_unknown_event_is_not_cached(app, client):
+    misses = app.extensions['crawler_pages'].stats()['misses']
+
+    assert client.get('/e/missing').status_code == 404
+    assert client.get('/e/missing').status_code == 404
+    assert app.extensions['crawler_pages'].stats()['misses'] == misses + 2
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from change_log import prune
+from models import db, AvailabilityChange
+
+
+def responses(client, event_id, **params):
+    return client.get(f'/api/events/{event_id}/responses', query_string=params)
+
+
+def submit(client, event_id, method='post', **payload):
+    response = getattr(client, method)(f'/api/events/{event_id}/availability', json=payload)
+    assert response.status_code in (200, 201), response.get_json()
+
+
+def test_since_returns_latest_change_per_participant_and_slot(client, create_event):
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', selectedSlots=['Monday-09:00', 'Monday-09:15'])
+    cursor = responses(client, event_id).get_json()['data']['cursor']
+
+    submit(client, event_id, 'put', userName='Ann', selectedSlots=['Monday-09:15', 'Tuesday-09:00'])
+    submit(client, event_id, userName='Bob', selectedSlots=['Monday-09:00'])
+
+    data = responses(client, event_id, since=cursor).get_json()['data']
+    assert sorted((change['userName'], change['slotId'], change['isAvailable']) for change in data['changes']) == [
+        ('Ann', 'Monday-09:00', False),
+        ('Ann', 'Tuesday-09:00', True),
+        ('Bob', 'Monday-09:00', True)
+    ]
+    assert data['cursor'] > cursor
+    assert responses(client, event_id, since=data['cursor']).get_json()['data']['changes'] == []
+
+
+def test_since_keeps_participants_with_the_same_name_apart(client, create_event):
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', selectedSlots=['Monday-09:00', 'Monday-09:15'])
+    submit(client, event_id, userName='Ann', userId='a@example.com', selectedSlots=['Monday-09:00'])
+
+    changes = responses(client, event_id, since=0).get_json()['data']['changes']
+    assert sorted((change['userId'] or '', change['slotId'], change['isAvailable']) for change in changes) == [
+        ('', 'Monday-09:00', True),
+        ('', 'Monday-09:15', True),
+        ('a@example.com', 'Monday-09:00', True)
+    ]
+
+
+@pytest.mark.parametrize('storage', ['rows', 'bitmap'])
+def test_rename_is_sent_to_delta_clients(app, client, create_event, monkeypatch, storage):
+    monkeypatch.setitem(app.config, 'AVAILABILITY_STORAGE', storage)
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', userId='a@example.com', selectedSlots=['Monday-09:00', 'Monday-09:15'])
+    cursor = responses(client, event_id).get_json()['data']['cursor']
+
+    submit(client, event_id, 'put', userName='Ann B.', userId='a@example.com', selectedSlots=['Monday-09:00', 'Monday-09:15'])
+
+    data = responses(client, event_id, since=cursor).get_json()['data']
+    assert data['cursor'] > cursor
+    assert sorted((change['userName'], change['slotId'], change['isAvailable']) for change in data['changes']) == [
+        ('Ann B.', 'Monday-09:00', True),
+        ('Ann B.', 'Monday-09:15', True)
+    ]
+
+
+def test_unchanged_submission_leaves_version_and_log_alone(app, client, create_event):
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', userId='ann@example.com', selectedSlots=['Monday-09:00'])
+    first = responses(client, event_id)
+
+    submit(client, event_id, userName='Ann', userId='ann@example.com', selectedSlots=['Monday-09:00'])
+    submit(client, event_id, 'put', userName='Ann', userId='ann@example.com', selectedSlots=['Monday-09:00'])
+
+    assert responses(client, event_id).headers['ETag'] == first.headers['ETag']
+    with app.app_context():
+        assert AvailabilityChange.query.filter_by(event_id=event_id).count() == 1
+
+    # A rename changes what readers see, so it is a new version
+    submit(client, event_id, 'put', userName='Ann B.', userId='ann@example.com', selectedSlots=['Monday-09:00'])
+    assert responses(client, event_id).headers['ETag'] != first.headers['ETag']
+
+
+def test_pruned_cursor_is_refused(app, client, create_event):
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', selectedSlots=['Monday-09:00'])
+    submit(client, event_id, userName='Bob', selectedSlots=['Monday-09:15'])
+    cursor = responses(client, event_id).get_json()['data']['cursor']
+
+    with app.app_context():
+        db.session.execute(db.update(AvailabilityChange).values(created_at=datetime.utcnow() - timedelta(days=40)))
+        db.session.commit()
+        assert prune(30, batch_size=1) == 2
+        assert AvailabilityChange.query.count() == 0
+
+    assert responses(client, event_id, since=0).status_code == 410
+    # The full load still hands out the last cursor, which stays valid
+    assert responses(client, event_id).get_json()['data']['cursor'] == cursor
+    assert responses(client, event_id, since=cursor).get_json()['data']['changes'] == []
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from event_cache import EventCache
+
+
+def test_read_through_with_lru_eviction():
+    loads = []
+    cache = EventCache(lambda key: loads.append(key) or key.upper(), max_size=2, ttl=60)
+
+    assert [cache.get(key) for key in ('a', 'b', 'a', 'c', 'b')] == ['A', 'B', 'A', 'C', 'B']
+    # 'b' was the least recently used when 'c' was added
+    assert loads == ['a', 'b', 'c', 'b']
+    assert cache.stats() == {'hits': 1, 'misses': 4, 'hitRatio': 0.2, 'size': 2}
+
+
+def test_missing_values_are_not_cached():
+    values = {}
+    cache = EventCache(values.get, max_size=10, ttl=60)
+
+    assert cache.get('e1') is None
+    values['e1'] = 'created elsewhere'
+    assert cache.get('e1') == 'created elsewhere'
+
+
+def test_invalidate_drops_every_key_of_an_event():
+    cache = EventCache(None, max_size=10, ttl=60)
+    cache.put('e1', 'metadata')
+    cache.put(('e1', 'https://a/'), 'page a')
+    cache.put(('e2', 'https://a/'), 'other event')
+
+    cache.invalidate('e1')
+
+    assert cache.get('e1', lambda: 'reloaded') == 'reloaded'
+    assert cache.get(('e1', 'https://a/'), lambda: 'page a v2') == 'page a v2'
+    assert cache.get(('e2', 'https://a/'), lambda: 'unexpected') == 'other event'
+
+
+def test_concurrent_misses_share_one_load():
+    loads = []
+
+    def load(key):
+        loads.append(key)
+        time.sleep(0.1)
+        return 'value'
+
+    cache = EventCache(load, max_size=10, ttl=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('e1'))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['value'] * 5
+    assert loads == ['e1']
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = EventCache(None, max_size=10, ttl=60)
+
+    def load():
+        cache.invalidate('e1')  # A write commits while the old value is being read
+        return 'stale'
+
+    assert cache.get('e1', load) == 'stale'
+    assert cache.get('e1', lambda: 'fresh') == 'fresh'
@@ -0,0 +1,44 @@
+import pytest
+
+
+def submit(client, event_id, **payload):
+    response = client.post(f'/api/events/{event_id}/availability', json=payload)
+    assert response.status_code == 201, response.get_json()
+
+
+@pytest.mark.parametrize('storage', ['rows', 'bitmap'])
+def test_heatmap_counts_and_roster(app, client, create_event, monkeypatch, storage):
+    monkeypatch.setitem(app.config, 'AVAILABILITY_STORAGE', storage)
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', selectedSlots=['Monday-09:00', 'Monday-09:15'])
+    submit(client, event_id, userName='Bob', selectedSlots=['Monday-09:15', 'Tuesday-10:45'])
+    submit(client, event_id, userName='Cat', userId='cat@example.com', selectedSlots=['Monday-09:15'])
+
+    data = client.get(f'/api/events/{event_id}/heatmap').get_json()['data']
+
+    # Roster in order of first response; slots list indices into it
+    assert data['users'] == ['Ann', 'Bob', 'Cat']
+    assert data['uniqueUsers'] == 3
+    assert sorted((slot['slotId'], slot['count'], slot['users']) for slot in data['slots']) == [
+        ('Monday-09:00', 1, [0]),
+        ('Monday-09:15', 3, [0, 1, 2]),
+        ('Tuesday-10:45', 1, [1])
+    ]
+
+    summary = client.get(f'/api/events/{event_id}/heatmap', query_string={'participants': 'false'}).get_json()['data']
+    assert sorted((slot['slotId'], slot['count']) for slot in summary['slots']) == \
+        sorted((slot['slotId'], slot['count']) for slot in data['slots'])
+
+
+def test_heatmap_follows_updates(client, create_event):
+    event_id = create_event()
+    submit(client, event_id, userName='Ann', selectedSlots=['Monday-09:00'])
+    response = client.put(f'/api/events/{event_id}/availability', json={'userName': 'Ann', 'selectedSlots': ['Tuesday-09:00']})
+    assert response.status_code == 200
+
+    data = client.get(f'/api/events/{event_id}/heatmap').get_json()['data']
+    assert [(slot['slotId'], slot['count']) for slot in data['slots']] == [('Tuesday-09:00', 1)]
+
+
+def test_heatmap_of_unknown_event(client):
+    assert client.get('/api/events/missing/heatmap').status_code == 404
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+
+
+def run_worker(directory, code):
+    """Run `code` in a fresh process sharing the multiprocess directory, as a gunicorn worker would"""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(directory))
+    result = subprocess.run(
+        [sys.executable, '-c', 'import os, metrics\n' + code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+
+def sample(body, line_prefix):
+    return [float(line.rsplit(' ', 1)[1]) for line in body.splitlines() if line.startswith(line_prefix)]
+
+
+def test_metrics_aggregate_every_worker_process(tmp_path):
+    directory = tmp_path / 'prometheus_multiproc'  # created by metrics.py on import
+    pids = []
+    for errors, capacity in ((2, 12), (3, 12)):
+        pids.append(int(run_worker(directory, (
+            f"metrics.CALENDAR_ERRORS.labels(operation='events.list', reason='error').inc({errors})\n"
+            f"metrics.DB_POOL_CAPACITY.set({capacity})\n"
+            "print(os.getpid())"
+        ))))
+
+    render = "print(metrics.render()[0].decode())"
+    body = run_worker(directory, render)
+    assert sample(body, 'whenly_calendar_errors_total{operation="events.list",reason="error"}') == [5.0]
+    assert sample(body, 'whenly_db_pool_capacity ') == [24.0]
+
+    # gunicorn's child_exit hook drops the gauges of a dead worker; its counters stay
+    run_worker(directory, f"from prometheus_client import multiprocess\nmultiprocess.mark_process_dead({pids[0]})")
+    body = run_worker(directory, render)
+    assert sample(body, 'whenly_db_pool_capacity ') == [12.0]
+    assert sample(body, 'whenly_calendar_errors_total{operation="events.list",reason="error"}') == [5.0]
+
+
+def test_endpoint_exports_request_metrics(client, create_event):
+    event_id = create_event()
+    client.get(f'/api/events/{event_id}')
+
+    response = client.get('/api/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+    body = response.get_data(as_text=True)
+    assert sample(body, 'whenly_http_requests_total{endpoint="get_event",method="GET",status="200"}')[0] >= 1
+    assert 'whenly_http_request_duration_seconds_bucket' in body
+
+
+def test_endpoint_requires_the_token_when_set(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'secret')
+    assert client.get('/api/metrics').status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
@@ -0,0 +1,118 @@
+from datetime import datetime
+
+import pytest
+from alembic.script import ScriptDirectory
+from flask import Flask
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import inspect, text
+
+from conftest import MIGRATIONS_DIR
+from models import db
+
+
+@pytest.fixture
+def migration_app(tmp_path):
+    """A bare app on an empty SQLite database, for running migrations only"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'migrations.db'}"
+    db.init_app(app)
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+    with app.app_context():
+        yield app
+
+
+def test_migrations_create_every_model_table(migration_app):
+    upgrade()
+
+    tables = set(inspect(db.engine).get_table_names())
+    assert set(db.metadata.tables) <= tables
+
+
+def test_upgrade_backfills_a_database_from_before_the_new_tables(migration_app):
+    # A database at the original schema, with one participant's responses
+    upgrade(revision='fe943ea809fa')
+    db.session.execute(text(
+        "INSERT INTO events (id, name, event_type, time_start, time_end, days_of_week, created_at, created_by) "
+        "VALUES ('e1', 'Sync', 'daysOfWeek', '09:00 AM', '10:00 AM', '[\"Monday\"]', :now, 'a@example.com')"
+    ), {'now': datetime(2025, 1, 1)})
+    db.session.execute(text(
+        "INSERT INTO availability_slots (id, event_id, day_of_week, start_time, end_time) VALUES "
+        "(1, 'e1', 'Monday', '09:00 AM', '10:00 AM'), "
+        "(2, 'e1', 'Monday', '09:15', '09:30'), "
+        "(3, 'e1', 'Monday', '09:30', '09:45')"
+    ))
+    db.session.execute(text(
+        "INSERT INTO responses (event_id, slot_id, user_name, is_available, created_at) VALUES "
+        "('e1', 2, 'Ann', 1, :now), ('e1', 3, 'Ann', 1, :now), ('e1', 3, 'Bob', 1, :now)"
+    ), {'now': datetime(2025, 1, 1)})
+    # A signed-in participant with the same name as an anonymous one
+    db.session.execute(text(
+        "INSERT INTO responses (event_id, slot_id, user_id, user_name, is_available, created_at) VALUES "
+        "('e1', 3, 'ann@example.com', 'Ann', 1, :now)"
+    ), {'now': datetime(2025, 1, 2)})
+    db.session.commit()
+
+    upgrade()
+
+    assert db.session.execute(text(
+        "SELECT user_name FROM availability_bitmaps ORDER BY user_name"
+    )).scalars().all() == ['Ann', 'Ann', 'Bob']
+    assert db.session.execute(text(
+        "SELECT slot_index, count FROM slot_counts ORDER BY slot_index"
+    )).all() == [(1, 1), (2, 3)]
+    assert db.session.execute(text("SELECT version FROM events")).scalar() == 0
+
+
+def test_upgrade_adopts_a_database_built_by_create_all(migration_app):
+    # create_all() left the original schema without any migration history
+    upgrade(revision='fe943ea809fa')
+    db.session.execute(text(
+        "INSERT INTO events (id, name, event_type, time_start, time_end, days_of_week, created_at, creator_name) "
+        "VALUES ('e1', 'Sync', 'daysOfWeek', '09:00 AM', '10:00 AM', '[\"Monday\"]', :now, 'Ann')"
+    ), {'now': datetime(2025, 1, 1)})
+    db.session.execute(text("DROP TABLE alembic_version"))
+    db.session.commit()
+
+    upgrade()
+
+    assert db.session.execute(text("SELECT creator_name FROM events")).scalar() == 'Ann'
+    assert set(db.metadata.tables) <= set(inspect(db.engine).get_table_names())
+
+
+def test_upgrade_refuses_unknown_tables_without_history(migration_app):
+    db.session.execute(text("CREATE TABLE events (id VARCHAR(36) PRIMARY KEY)"))
+    db.session.execute(text("CREATE TABLE slot_counts (event_id VARCHAR(36))"))
+    db.session.commit()
+
+    # flask_migrate logs the migration's error and exits
+    with pytest.raises(SystemExit):
+        upgrade()
+    assert 'availability_slots' not in inspect(db.engine).get_table_names()
+
+
+def test_upgrade_merges_duplicate_bitmaps(migration_app):
+    upgrade(revision='e8d06b5f3a17')
+    db.session.execute(text(
+        "INSERT INTO events (id, name, event_type, time_start, time_end, days_of_week, created_at, created_by) "
+        "VALUES ('e1', 'Sync', 'daysOfWeek', '09:00 AM', '10:00 AM', '[\"Monday\"]', :now, 'a@example.com')"
+    ), {'now': datetime(2025, 1, 1)})
+    db.session.execute(text(
+        "INSERT INTO availability_bitmaps (id, event_id, user_id, user_name, bits) VALUES "
+        "(1, 'e1', NULL, 'Ann', :one), (2, 'e1', NULL, 'Ann', :two), "
+        "(3, 'e1', 'ann@example.com', 'Ann', :two), (4, 'e1', 'ann@example.com', 'Ann B.', :four)"
+    ), {'one': b'\x01', 'two': b'\x02', 'four': b'\x04'})
+    db.session.commit()
+
+    upgrade()
+
+    assert db.session.execute(text(
+        "SELECT id, user_id, bits FROM availability_bitmaps ORDER BY id"
+    )).all() == [(1, None, b'\x03'), (3, 'ann@example.com', b'\x06')]
+
+
+def test_app_startup_leaves_the_schema_to_migrations(app):
+    # The session app was created on an empty database and then upgraded;
+    # that only succeeds if create_app() did not create any tables itself
+    head = ScriptDirectory(MIGRATIONS_DIR).get_current_head()
+    with app.app_context():
+        assert db.session.execute(text("SELECT version_num FROM alembic_version")).scalar() == head
@@ -0,0 +1,27 @@
+import re
+
+from test_availability import specific_days
+
+
+def statement_count(response):
+    return int(re.search(r'"(\d+) queries', response.headers['Server-Timing']).group(1))
+
+
+def test_availability_writes_stay_within_budget_on_a_multi_day_event(client, create_event):
+    # 24h times make every day's first cell collide with a per-day row
+    days = specific_days(20)
+    event_id = create_event(days=days, start='09:00', end='17:00')
+    every_slot = [f'{day}-{hour:02d}:{minute:02d}' for day in days for hour in range(9, 17) for minute in (0, 15, 30, 45)]
+
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Ann', 'selectedSlots': every_slot})
+    assert response.status_code == 201
+    assert statement_count(response) <= 12
+
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Bob', 'selectedSlots': every_slot[::2]})
+    assert response.status_code == 201
+    assert statement_count(response) <= 12
+
+    response = client.put(f'/api/events/{event_id}/availability', json={'userName': 'Bob', 'selectedSlots': every_slot[1::2]})
+    assert response.status_code == 200
+    assert statement_count(response) <= 12
+
@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from replay import load_log, replay
+
+
+@pytest.fixture
+def server():
+    """A local HTTP server that records when each request arrived"""
+    arrivals = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            arrivals.append((time.perf_counter(), self.path))
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", arrivals
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_load_log_reads_recorded_times(tmp_path):
+    access_log = tmp_path / 'access.log'
+    access_log.write_text(
+        '10.0.0.1 - - [17/Oct/2026:12:00:02 +0000] "GET /api/events/b HTTP/1.1" 200 12\n'
+        '10.0.0.1 - - [17/Oct/2026:12:00:00 +0000] "GET /api/events/a HTTP/1.1" 200 12\n'
+        '10.0.0.1 - - [17/Oct/2026:12:00:01 +0000] "POST /api/events/a/availability HTTP/1.1" 201 12\n'
+    )
+    assert [(entry['path'], entry['offset']) for entry in load_log(access_log)] == [
+        ('/api/events/a', 0.0), ('/api/events/b', 2.0)
+    ]
+
+    json_log = tmp_path / 'requests.jsonl'
+    json_log.write_text('\n'.join(json.dumps(entry) for entry in [
+        {'path': '/a', 'timestamp': '2026-10-17T12:00:00.500+00:00'},
+        {'path': '/b', 'timestamp': 1792238400.0}
+    ]))
+    assert [entry['offset'] for entry in load_log(json_log)] == [0.0, 0.5]
+
+    untimed_log = tmp_path / 'untimed.jsonl'
+    untimed_log.write_text(json.dumps({'path': '/a'}) + '\n' + json.dumps({'path': '/b', 'offset': 1}))
+    assert [entry['offset'] for entry in load_log(untimed_log)] == [None, None]
+
+
+def test_replay_follows_the_recorded_times(server):
+    base_url, arrivals = server
+    entries = [{'method': 'GET', 'path': f'/{number}', 'body': None, 'offset': number * 0.1} for number in range(4)]
+
+    result = replay(base_url, entries, concurrency=2, speed=0.5)
+
+    assert result['completed'] == 4 and result['skipped'] == 0 and result['statuses'] == {200: 4}
+    assert [path for _, path in sorted(arrivals)] == ['/0', '/1', '/2', '/3']
+    # At half speed the recorded 0.3s span takes 0.6s
+    assert arrivals[-1][0] - arrivals[0][0] >= 0.55
+
+
+def test_replay_at_a_fixed_rate_cycles_through_the_log(server):
+    base_url, arrivals = server
+    entries = [{'method': 'GET', 'path': '/a', 'body': None, 'offset': None}]
+
+    result = replay(base_url, entries, rate=20, duration=0.25, concurrency=4)
+
+    assert result['scheduled'] == 5
+    assert result['completed'] + result['skipped'] == 5
+    assert len(arrivals) == result['completed']
+
+
+def test_replay_needs_a_rate_for_a_log_without_times():
+    with pytest.raises(ValueError):
+        replay('http://127.0.0.1:9', [{'method': 'GET', 'path': '/', 'body': None, 'offset': None}])
@@ -0,0 +1,73 @@
+import pytest
+
+from models import db, SlotCount
+from slot_counts import apply_deltas, read_counts, rebuild
+
+
+def stored_counts(app, event_id):
+    with app.app_context():
+        return [tuple(row) for row in read_counts(event_id)]
+
+
+@pytest.fixture
+def submissions(client, create_event):
+    """An event where an anonymous and a signed-in participant share a name"""
+    event_id = create_event()
+    for payload in (
+        {'userName': 'Ann', 'selectedSlots': ['Monday-09:00', 'Monday-09:15']},
+        {'userName': 'Ann', 'userId': 'ann@example.com', 'selectedSlots': ['Monday-09:00']},
+        {'userName': 'Bob', 'selectedSlots': ['Monday-09:15', 'Tuesday-09:00']},
+    ):
+        assert client.post(f'/api/events/{event_id}/availability', json=payload).status_code == 201
+    return event_id
+
+
+def test_counts_follow_submissions_and_updates(app, client, submissions):
+    event_id = submissions
+    assert stored_counts(app, event_id) == [(0, 2), (1, 2), (8, 1)]
+
+    response = client.put(f'/api/events/{event_id}/availability', json={'userName': 'Bob', 'selectedSlots': ['Monday-09:00']})
+    assert response.status_code == 200
+    assert stored_counts(app, event_id) == [(0, 3), (1, 1)]
+
+
+def test_rebuild_matches_the_incremental_counts(app, submissions):
+    event_id = submissions
+    incremental = stored_counts(app, event_id)
+    with app.app_context():
+        db.session.execute(db.delete(SlotCount))
+        assert rebuild('rows', event_id) == len(incremental)
+        db.session.commit()
+    assert stored_counts(app, event_id) == incremental
+
+
+def test_portable_increment_without_upsert(app, client, create_event, monkeypatch):
+    event_id = create_event()
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, 'name', 'other')
+        apply_deltas(event_id, [0, 1], [])
+        apply_deltas(event_id, [1, 2], [0])
+        monkeypatch.undo()
+        db.session.commit()
+    assert stored_counts(app, event_id) == [(1, 2), (2, 1)]
+
+
+@pytest.mark.parametrize('storage', ['rows', 'bitmap'])
+def test_readers_count_participants_like_the_summary(app, client, create_event, monkeypatch, storage):
+    monkeypatch.setitem(app.config, 'AVAILABILITY_STORAGE', storage)
+    event_id = create_event()
+    for payload in (
+        {'userName': 'Ann', 'selectedSlots': ['Monday-09:00', 'Monday-09:15']},
+        {'userName': 'Ann', 'userId': 'ann@example.com', 'selectedSlots': ['Monday-09:00', 'Monday-09:15']},
+    ):
+        assert client.post(f'/api/events/{event_id}/availability', json=payload).status_code == 201
+
+    heatmap = client.get(f'/api/events/{event_id}/heatmap').get_json()['data']
+    summary = client.get(f'/api/events/{event_id}/heatmap', query_string={'participants': 'false'}).get_json()['data']
+    assert heatmap['users'] == ['Ann', 'Ann']
+    assert {slot['slotId']: slot['count'] for slot in heatmap['slots']} == \
+        {slot['slotId']: slot['count'] for slot in summary['slots']} == {'Monday-09:00': 2, 'Monday-09:15': 2}
+
+    best = client.get(f'/api/events/{event_id}/best-times', query_string={'duration': 30, 'required': 'Ann'}).get_json()['data']
+    assert best['uniqueUsers'] == 2
+    assert best['windows'][0]['count'] == 2
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def one_stream_per_worker(app, monkeypatch):
+    """Shrink the worker's stream pool to a single slot"""
+    monkeypatch.setitem(app.extensions, 'stream_slots', threading.BoundedSemaphore(1))
+
+
+def test_stream_pushes_committed_changes(client, create_event):
+    event_id = create_event()
+    stream = client.get(f'/api/events/{event_id}/stream')
+    assert next(stream.response) == b'retry: 3000\n\n'
+
+    response = client.post(f'/api/events/{event_id}/availability', json={'userName': 'Ann', 'selectedSlots': ['Monday-09:00']})
+    assert response.status_code == 201
+
+    message = next(stream.response).decode()
+    assert message.startswith('event: changes\nid: ')
+    assert '"userName":"Ann","added":["Monday-09:00"],"removed":[]' in message
+    stream.close()
+
+
+def test_streams_beyond_the_worker_limit_get_503(client, create_event, one_stream_per_worker):
+    event_id = create_event()
+
+    stream = client.get(f'/api/events/{event_id}/stream')
+    assert stream.status_code == 200
+    assert stream.mimetype == 'text/event-stream'
+    assert next(stream.response) == b'retry: 3000\n\n'
+
+    refused = client.get(f'/api/events/{event_id}/stream')
+    assert refused.status_code == 503
+    assert refused.headers['Retry-After'] == '30'
+
+    # Closing the first stream frees its slot
+    stream.close()
+    again = client.get(f'/api/events/{event_id}/stream')
+    assert again.status_code == 200
+    again.close()
+
+
+def test_stream_that_never_started_releases_its_slot(client, create_event, one_stream_per_worker):
+    event_id = create_event()
+    for _ in range(3):
+        response = client.get(f'/api/events/{event_id}/stream')
+        assert response.status_code == 200
+        response.close()
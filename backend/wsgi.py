@@ -1,3 +1,6 @@
+import os
+
 from app import create_app
 
-app = create_app()
+# The image sets FLASK_CONFIG=production; see config.config for the choices
+app = create_app(os.getenv("FLASK_CONFIG", "production"))
@@ -149,6 +149,7 @@ export const updateAvailability = async (eventId: string, data: {
 };
 
 export const getEventResponses = async (eventId: string): Promise<{
+  cursor: number;
   totalResponses: number;
   uniqueUsers: number;
   responses: any[];
@@ -166,4 +167,51 @@ export const getEventResponses = async (eventId: string): Promise<{
     console.error('Error getting responses:', error);
     throw error;
   }
-}; 
\ No newline at end of file
+}; 
+export interface ResponseChange {
+  slotId: string;
+  userId: string | null;
+  userName: string;
+  isAvailable: boolean;
+}
+
+// Resolves to null when the cursor has expired and the responses must be reloaded in full
+export const getEventResponseChanges = async (eventId: string, since: number): Promise<{
+  cursor: number;
+  changes: ResponseChange[];
+} | null> => {
+  try {
+    const response = await fetch(`${config.apiUrl}/api/events/${eventId}/responses?since=${since}`);
+    if (response.status === 410) {
+      return null;
+    }
+    const result = await response.json();
+    
+    if (!response.ok) {
+      throw new Error(result.message || 'Failed to get response changes');
+    }
+
+    return result.data;
+  } catch (error) {
+    console.error('Error getting response changes:', error);
+    throw error;
+  }
+};
+
+export const subscribeToEvent = (eventId: string, since: number, handlers: {
+  onChanges: (change: { cursor: number; userId: string | null; userName: string; added: string[]; removed: string[] }) => void;
+  onResync: () => void;
+  onClosed: () => void;
+}): (() => void) => {
+  // The browser reconnects on its own and resumes from the last event id;
+  // it gives up for good on an error status such as the 503 of a full worker
+  const source = new EventSource(`${config.apiUrl}/api/events/${eventId}/stream?since=${since}`);
+  source.addEventListener('changes', (event) => handlers.onChanges(JSON.parse((event as MessageEvent).data)));
+  source.addEventListener('resync', () => handlers.onResync());
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED) {
+      handlers.onClosed();
+    }
+  };
+  return () => source.close();
+};
@@ -50,8 +50,11 @@ import {
   getEventById,
   submitAvailability,
   getEventResponses,
+  getEventResponseChanges,
+  subscribeToEvent,
   updateAvailability,
 } from "../api/eventService";
+import type { ResponseChange } from "../api/eventService";
 import config from "../config";
 import { useAuth } from "../contexts/AuthContext";
 import SignInModal from "./SignInModal";
@@ -89,6 +92,59 @@ interface GroupedSlots {
   [key: string]: TimeSlot[];
 }
 
+interface EventResponses {
+  cursor: number;
+  totalResponses: number;
+  uniqueUsers: number;
+  responses: any[];
+}
+
+// How often to poll for changes when the live stream is unavailable
+const RESPONSES_POLL_INTERVAL_MS = 30000;
+
+// Apply delta-sync changes to the loaded responses. Participants are matched
+// the way the backend stores them: signed-in users by ID, anonymous ones by name.
+const applyResponseChanges = (
+  current: EventResponses,
+  changes: ResponseChange[],
+  cursor: number
+): EventResponses => {
+  const isSameParticipant = (response: any, change: ResponseChange) =>
+    change.userId
+      ? response.userId === change.userId
+      : !response.userId && response.userName === change.userName;
+
+  let responses = current.responses;
+  changes.forEach((change) => {
+    responses = responses
+      .filter(
+        (response) =>
+          !(isSameParticipant(response, change) && response.slotId === change.slotId)
+      )
+      // A signed-in participant may have changed their display name
+      .map((response) =>
+        isSameParticipant(response, change)
+          ? { ...response, userName: change.userName }
+          : response
+      );
+    if (change.isAvailable) {
+      responses.push({
+        slotId: change.slotId,
+        userId: change.userId,
+        userName: change.userName,
+        isAvailable: true,
+      });
+    }
+  });
+
+  return {
+    cursor,
+    totalResponses: responses.length,
+    uniqueUsers: new Set(responses.map((response) => response.userName)).size,
+    responses,
+  };
+};
+
 // Main component
 const EventPage: React.FC = () => {
   const { eventId } = useParams<{ eventId: string }>();
@@ -102,11 +158,7 @@ const EventPage: React.FC = () => {
   const [selectedSlots, setSelectedSlots] = useState<string[]>([]);
   const [name, setName] = useState<string>(user?.name || "");
   const [isSubmitting, setIsSubmitting] = useState<boolean>(false);
-  const [responses, setResponses] = useState<{
-    totalResponses: number;
-    uniqueUsers: number;
-    responses: any[];
-  } | null>(null);
+  const [responses, setResponses] = useState<EventResponses | null>(null);
   const [snackbar, setSnackbar] = useState<{
     open: boolean;
     message: string;
@@ -473,6 +525,92 @@ const EventPage: React.FC = () => {
     fetchData();
   }, [eventId, user]);
 
+  // 2. Keep responses live once loaded: apply pushed changes and catch up
+  // through delta sync, polling instead when the stream is unavailable
+  const cursorRef = useRef<number | null>(null);
+  useEffect(() => {
+    cursorRef.current = responses?.cursor ?? null;
+  }, [responses]);
+
+  const responsesLoaded = responses !== null;
+  useEffect(() => {
+    if (!eventId || !responsesLoaded || cursorRef.current === null) return;
+
+    let cancelled = false;
+    let syncing = false;
+    let syncAgain = false;
+    let pollTimer: number | undefined;
+
+    const catchUp = async () => {
+      if (syncing) {
+        syncAgain = true;
+        return;
+      }
+      syncing = true;
+      try {
+        do {
+          syncAgain = false;
+          const delta = await getEventResponseChanges(eventId, cursorRef.current!);
+          if (cancelled) return;
+          if (delta === null) {
+            // The cursor has expired; reload everything
+            const responsesData = await getEventResponses(eventId);
+            if (cancelled) return;
+            cursorRef.current = responsesData.cursor;
+            setResponses(responsesData);
+          } else if (delta.cursor !== cursorRef.current) {
+            cursorRef.current = delta.cursor;
+            setResponses(
+              (prev) => prev && applyResponseChanges(prev, delta.changes, delta.cursor)
+            );
+          }
+        } while (syncAgain && !cancelled);
+      } catch (err) {
+        console.error("Error syncing responses:", err);
+      } finally {
+        syncing = false;
+      }
+    };
+
+    const unsubscribe = subscribeToEvent(eventId, cursorRef.current, {
+      onChanges: (change) => {
+        if (change.cursor <= cursorRef.current!) return;
+        // Changes pushed mid-sync may be older than what the sync returns
+        if (syncing) {
+          syncAgain = true;
+          return;
+        }
+        cursorRef.current = change.cursor;
+        const toChanges = (slotIds: string[], isAvailable: boolean) =>
+          slotIds.map((slotId) => ({
+            slotId,
+            userId: change.userId,
+            userName: change.userName,
+            isAvailable,
+          }));
+        setResponses(
+          (prev) =>
+            prev &&
+            applyResponseChanges(
+              prev,
+              [...toChanges(change.removed, false), ...toChanges(change.added, true)],
+              change.cursor
+            )
+        );
+      },
+      onResync: catchUp,
+      onClosed: () => {
+        pollTimer = window.setInterval(catchUp, RESPONSES_POLL_INTERVAL_MS);
+      },
+    });
+
+    return () => {
+      cancelled = true;
+      unsubscribe();
+      window.clearInterval(pollTimer);
+    };
+  }, [eventId, responsesLoaded]);
+
   // Derive all unique users for the hover panel
   const allUniqueUsers = useMemo(() => {
     if (!responses?.responses) return new Set<string>();
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Benchmark the event endpoints against synthetic events.
+
+Seeds --events events of --days days x --slots-per-day 15-minute slots with
+--participants participants each (every participant picks about half of the
+slots), then sends --requests requests to each of:
+
+    create_event           POST /api/events/create
+    submit_availability    POST /api/events/<id>/availability (new participants)
+    update_availability    PUT  /api/events/<id>/availability (seeded participants)
+    get_event_responses    GET  /api/events/<id>/responses
+    event_page             GET  /e/<id>
+
+and reports throughput, latency percentiles and the SQL statements per
+request (read from the Server-Timing header). The workload only depends on
+--seed, so two runs with the same options send the same requests.
+
+By default the backend runs in this process through the Flask test client,
+on a throwaway SQLite database (or --database-url, e.g. a local Postgres,
+which is migrated to the latest schema first). With --base-url the same
+requests go over HTTP to a running instance instead.
+
+    python scripts/benchmark.py --save-baseline
+    python scripts/benchmark.py --compare    # exits 1 on a regression
+
+--save-baseline stores the results, by default in
+scripts/benchmark_baseline.json. --compare checks them against a stored
+baseline and exits with status 1 if an endpoint issues more statements per
+request, if its p95 latency grows by more than --threshold, or if any
+request fails; it exits with status 2 if the baseline was recorded with
+other options. Latency is only comparable on the same machine, so record
+the baseline where the check runs.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'backend')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+OPERATIONS = ['create_event', 'submit_availability', 'update_availability', 'get_event_responses', 'event_page']
+
+QUERIES_PATTERN = re.compile(r'(\d+) queries')
+
+FIRST_DAY = date(2030, 1, 7)
+
+
+class Workload:
+    """The synthetic events and the requests sent for each operation"""
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.days = [(FIRST_DAY + timedelta(days=offset)).isoformat() for offset in range(args.days)]
+        self.times = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(0, args.slots_per_day * 15, 15)]
+        self.slot_ids = [f"{day}-{time_str}" for day in self.days for time_str in self.times]
+
+    def event_payload(self, index):
+        end_minute = len(self.times) * 15
+        return {
+            'eventName': f'Benchmark event {index}',
+            'eventType': 'specificDays',
+            'createdBy': f'benchmark-{index}@example.com',
+            'creatorName': 'Benchmark',
+            'timeRange': {'start': '00:00', 'end': f"{end_minute // 60 % 24:02d}:{end_minute % 60:02d}"},
+            'specificDays': self.days
+        }
+
+    def selection(self):
+        """About half of the event's slots, in runs like a dragged selection"""
+        selected = []
+        for day in self.days:
+            start = self.random.randrange(len(self.times))
+            length = self.random.randint(len(self.times) // 4, len(self.times) * 3 // 4)
+            selected.extend(f"{day}-{time_str}" for time_str in self.times[start:start + length])
+        return selected
+
+    def availability_payload(self, participant):
+        return {'userName': f'Participant {participant}', 'selectedSlots': self.selection()}
+
+    def requests(self, operation, event_ids):
+        """(method, path, body) for every request of an operation, round-robin over the seeded events"""
+        count = self.args.requests
+        if operation == 'create_event':
+            return [('POST', '/api/events/create', self.event_payload(index)) for index in range(count)]
+        if operation == 'submit_availability':
+            return [
+                ('POST', f'/api/events/{event_ids[index % len(event_ids)]}/availability',
+                 self.availability_payload(self.args.participants + index))
+                for index in range(count)
+            ]
+        if operation == 'update_availability':
+            return [
+                ('PUT', f'/api/events/{event_ids[index % len(event_ids)]}/availability',
+                 self.availability_payload(self.random.randrange(self.args.participants)))
+                for index in range(count)
+            ]
+        if operation == 'get_event_responses':
+            return [('GET', f'/api/events/{event_ids[index % len(event_ids)]}/responses', None) for index in range(count)]
+        return [('GET', f'/e/{event_ids[index % len(event_ids)]}', None) for index in range(count)]
+
+
+class InProcessTarget:
+    """Sends requests to an app created in this process through the Flask test client"""
+
+    def __init__(self, database_url):
+        os.environ['DATABASE_URL'] = database_url
+        os.environ.setdefault('CORS_ORIGINS', 'http://localhost')
+        sys.path.insert(0, BACKEND_DIR)
+
+        if not os.path.exists(os.path.join(BACKEND_DIR, 'client_secret.json')):
+            # The OAuth flow is never used here, so run without Google credentials
+            from google_auth_oauthlib.flow import Flow
+            Flow.from_client_secrets_file = classmethod(lambda cls, **kwargs: None)
+
+        from app import create_app
+        from flask_migrate import Migrate, upgrade
+        from models import db
+
+        self.app = create_app()
+        Migrate(self.app, db, directory=os.path.join(BACKEND_DIR, 'migrations'))
+        with self.app.app_context():
+            upgrade()
+
+    def session(self):
+        return self.app.test_client()
+
+    def send(self, client, method, path, body):
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.headers.get('Server-Timing', ''), response.get_json(silent=True)
+
+
+class HttpTarget:
+    """Sends requests to a running instance"""
+
+    def __init__(self, base_url):
+        import requests
+
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+
+    def session(self):
+        return self.requests.Session()
+
+    def send(self, client, method, path, body):
+        response = client.request(method, f'{self.base_url}{path}', json=body, timeout=60)
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return response.status_code, response.headers.get('Server-Timing', ''), data
+
+
+def seed(target, workload, args):
+    """Create the events and their participants; return the event IDs"""
+    client = target.session()
+    event_ids = []
+    for index in range(args.events):
+        status, _, data = target.send(client, 'POST', '/api/events/create', workload.event_payload(index))
+        if status != 201:
+            raise SystemExit(f"Could not create a benchmark event (HTTP {status}): {data}")
+        event_id = data['data']['eventId']
+        event_ids.append(event_id)
+        for participant in range(args.participants):
+            status, _, data = target.send(
+                client, 'POST', f'/api/events/{event_id}/availability', workload.availability_payload(participant)
+            )
+            if status != 201:
+                raise SystemExit(f"Could not seed availability (HTTP {status}): {data}")
+    return event_ids
+
+
+def run_operation(target, requests_to_send, concurrency):
+    """Send the requests from `concurrency` threads; return (latencies, queries, errors, elapsed seconds)"""
+    latencies = []
+    queries = []
+    errors = []
+    lock = threading.Lock()
+    pending = iter(requests_to_send)
+
+    def worker():
+        client = target.session()
+        while True:
+            with lock:
+                item = next(pending, None)
+            if item is None:
+                return
+            method, path, body = item
+            started = time.perf_counter()
+            try:
+                status, server_timing, _ = target.send(client, method, path, body)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            elapsed = time.perf_counter() - started
+            match = QUERIES_PATTERN.search(server_timing)
+            with lock:
+                if status >= 400:
+                    errors.append(f"HTTP {status} for {method} {path}")
+                else:
+                    latencies.append(elapsed)
+                    if match:
+                        queries.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, queries, errors, time.perf_counter() - started
+
+
+def summarize(latencies, queries, errors, elapsed):
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2)
+
+    return {
+        'requests': len(ordered),
+        'errors': len(errors),
+        'throughput': round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        'p50Ms': percentile(50),
+        'p95Ms': percentile(95),
+        'p99Ms': percentile(99),
+        'maxMs': round(ordered[-1] * 1000, 2) if ordered else None,
+        'meanQueries': round(sum(queries) / len(queries), 2) if queries else None,
+        'maxQueries': max(queries) if queries else None
+    }
+
+
+def compare(results, baseline, threshold, slack_ms):
+    """Return a list of regressions against the baseline results"""
+    regressions = []
+    for operation, expected in baseline['results'].items():
+        actual = results.get(operation)
+        if actual is None:
+            continue
+        if actual['errors']:
+            regressions.append(f"{operation}: {actual['errors']} failed requests")
+        if actual['maxQueries'] is not None and expected.get('maxQueries') is not None \
+                and actual['maxQueries'] > expected['maxQueries']:
+            regressions.append(f"{operation}: {actual['maxQueries']} queries per request (baseline {expected['maxQueries']})")
+        if actual['p95Ms'] is not None and expected.get('p95Ms') is not None:
+            limit = expected['p95Ms'] * (1 + threshold) + slack_ms
+            if actual['p95Ms'] > limit:
+                regressions.append(f"{operation}: p95 {actual['p95Ms']}ms (baseline {expected['p95Ms']}ms, limit {limit:.1f}ms)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', help='benchmark a running instance over HTTP instead of in-process')
+    parser.add_argument('--database-url', help='database for the in-process app (default: a temporary SQLite file)')
+    parser.add_argument('--events', type=int, default=5)
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--slots-per-day', type=int, default=32, help='15-minute slots per day (at most 96)')
+    parser.add_argument('--participants', type=int, default=20, help='participants seeded per event')
+    parser.add_argument('--requests', type=int, default=200, help='requests per operation')
+    parser.add_argument('--concurrency', type=int, default=1, help='client threads (SQLite serializes writes)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--operations', default=','.join(OPERATIONS), help='comma separated subset to run')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help='store these results as the baseline (default: %(const)s)')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help='compare against a stored baseline and exit 1 on a regression (default: %(const)s)')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed p95 growth for --compare (0.25 = 25%%)')
+    parser.add_argument('--latency-slack-ms', type=float, default=2.0, help='absolute p95 growth always allowed')
+    parser.add_argument('--output', help='also write the results as JSON to this file')
+    args = parser.parse_args()
+
+    if args.save_baseline and args.compare:
+        parser.error('--save-baseline and --compare are mutually exclusive')
+    if args.compare and not os.path.exists(args.compare):
+        parser.error(f"no baseline at {args.compare}; record one with --save-baseline")
+    if not 1 <= args.slots_per_day <= 96:
+        parser.error('--slots-per-day must be between 1 and 96')
+    operations = [operation.strip() for operation in args.operations.split(',') if operation.strip()]
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    if args.base_url:
+        target = HttpTarget(args.base_url)
+    else:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmark.db')}"
+        target = InProcessTarget(database_url)
+
+    workload = Workload(args)
+    print(f"Seeding {args.events} events x {args.participants} participants "
+          f"({args.days} days x {args.slots_per_day} slots)...")
+    event_ids = seed(target, workload, args)
+
+    results = {}
+    for operation in operations:
+        requests_to_send = workload.requests(operation, event_ids)
+        results[operation] = summarize(*run_operation(target, requests_to_send, args.concurrency))
+
+    print()
+    print(f"{'operation':<22} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}")
+    for operation, result in results.items():
+        def cell(value):
+            return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+        print(
+            f"{operation:<22} {result['throughput']:8.1f} {cell(result['p50Ms'])} {cell(result['p95Ms'])} "
+            f"{cell(result['p99Ms'])} {cell(result['meanQueries'])} {result['errors']:7d}"
+        )
+
+    report = {
+        'config': {
+            'target': args.base_url or 'in-process',
+            'events': args.events,
+            'days': args.days,
+            'slotsPerDay': args.slots_per_day,
+            'participants': args.participants,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"\nSaved baseline to {args.save_baseline}")
+        return
+    if not args.compare:
+        return
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    if baseline['config'] != report['config']:
+        print(f"\nThe baseline was recorded with different options: {baseline['config']}")
+        sys.exit(2)
+
+    regressions = compare(results, baseline, args.threshold, args.latency_slack_ms)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Load test: do slow Google Calendar calls stall event reads?
+
+Starts a local Calendar API stub that answers after --calendar-delay seconds,
+then measures GET /api/events/<id> latency twice: alone, and while
+--calendar-clients clients keep /api/calendar/events busy. With a single sync
+gunicorn worker the second run queues behind the calendar calls; with the
+gthread settings in backend/gunicorn.conf.py it should stay flat.
+
+Run the backend against the stub with the calendar cache off, e.g.:
+
+    CALENDAR_API_ROOT_URL=http://127.0.0.1:8765/ CALENDAR_CACHE_TTL=0 \\
+        gunicorn -c gunicorn.conf.py wsgi:app
+
+    python scripts/load_test_calendar.py --base-url http://127.0.0.1:5000 \\
+        --secret-key "$FLASK_SECRET_KEY"
+
+The secret key is used to sign session cookies for fake Google users, so only
+point this at a test deployment.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse, parse_qs
+
+import requests
+
+
+def start_calendar_stub(port, delay, calendars):
+    """Serve the Calendar API endpoints the backend uses, answering event lists after `delay` seconds"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, body):
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.endswith('/users/me/calendarList'):
+                return self.send_json({'items': [
+                    {'id': f'calendar-{index}', 'summary': f'Calendar {index}'} for index in range(calendars)
+                ]})
+
+            time.sleep(delay)
+            parts = url.path.split('/')
+            calendar_id = unquote(parts[parts.index('calendars') + 1])
+            day = parse_qs(url.query)['timeMin'][0][:10]
+            self.send_json({'items': [{
+                'summary': f'{calendar_id} meeting',
+                'start': {'dateTime': f'{day}T10:00:00Z'},
+                'end': {'dateTime': f'{day}T11:00:00Z'}
+            }]})
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def session_cookie(secret_key, google_id):
+    """Sign a Flask session cookie for a fake signed-in Google user"""
+    from flask import Flask
+    from flask.sessions import SecureCookieSessionInterface
+
+    app = Flask(__name__)
+    app.secret_key = secret_key
+    serializer = SecureCookieSessionInterface().get_signing_serializer(app)
+    return serializer.dumps({
+        'google_id': google_id,
+        'name': 'Load Test',
+        'credentials': {
+            'token': 'load-test',
+            'refresh_token': 'load-test',
+            'token_uri': 'https://oauth2.googleapis.com/token',
+            'client_id': 'load-test',
+            'client_secret': 'load-test',
+            'scopes': ['https://www.googleapis.com/auth/calendar.readonly']
+        }
+    })
+
+
+def create_event(base_url):
+    response = requests.post(f'{base_url}/api/events/create', json={
+        'eventName': 'Load test',
+        'eventType': 'daysOfWeek',
+        'createdBy': 'load-test@example.com',
+        'timeRange': {'start': '09:00 AM', 'end': '05:00 PM'},
+        'daysOfWeek': ['Monday', 'Tuesday', 'Wednesday']
+    })
+    response.raise_for_status()
+    return response.json()['data']['eventId']
+
+
+def run_clients(count, duration, request_once):
+    """Call request_once() in a loop from `count` threads for `duration` seconds; return latencies and errors"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        with requests.Session() as http:
+            iteration = 0
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                try:
+                    request_once(http, index, iteration).raise_for_status()
+                    with lock:
+                        latencies.append(time.monotonic() - started)
+                except requests.RequestException as e:
+                    with lock:
+                        errors.append(str(e))
+                iteration += 1
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def summarize(name, latencies, errors):
+    if not latencies:
+        print(f"{name:<28} no successful requests ({len(errors)} errors)")
+        return
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    print(
+        f"{name:<28} n={len(ordered):<6} p50={percentile(50):7.1f}ms p95={percentile(95):7.1f}ms "
+        f"p99={percentile(99):7.1f}ms max={ordered[-1] * 1000:7.1f}ms mean={statistics.mean(ordered) * 1000:7.1f}ms "
+        f"errors={len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--secret-key', required=True, help='FLASK_SECRET_KEY of the backend under test')
+    parser.add_argument('--stub-port', type=int, default=8765)
+    parser.add_argument('--calendar-delay', type=float, default=2.0, help='seconds the stub takes per calendar')
+    parser.add_argument('--calendars', type=int, default=3, help='calendars per fake user')
+    parser.add_argument('--calendar-clients', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds per phase')
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    start_calendar_stub(args.stub_port, args.calendar_delay, args.calendars)
+    event_id = create_event(base_url)
+    cookies = [session_cookie(args.secret_key, f'load-test-{index}') for index in range(args.calendar_clients)]
+
+    def read_event(http, index, iteration):
+        return http.get(f'{base_url}/api/events/{event_id}', timeout=60)
+
+    def read_calendar(http, index, iteration):
+        # A different user and range on every call so nothing is served from cache
+        day = 1 + (index * 7 + iteration) % 28
+        return http.get(
+            f'{base_url}/api/calendar/events',
+            params={'startDate': f'2030-01-{day:02d}', 'endDate': f'2030-01-{day:02d}'},
+            cookies={'session': cookies[index]},
+            timeout=60
+        )
+
+    print(f"Event reads alone ({args.readers} readers, {args.duration:.0f}s)...")
+    baseline = run_clients(args.readers, args.duration, read_event)
+
+    print(f"Event reads with {args.calendar_clients} calendar clients ({args.calendar_delay}s upstream)...")
+    calendar_result = {}
+    calendar_thread = threading.Thread(target=lambda: calendar_result.update(
+        result=run_clients(args.calendar_clients, args.duration, read_calendar)
+    ))
+    calendar_thread.start()
+    time.sleep(min(1.0, args.duration / 10))  # let the calendar calls pile up first
+    loaded = run_clients(args.readers, args.duration, read_event)
+    calendar_thread.join()
+
+    print()
+    summarize('event reads (baseline)', *baseline)
+    summarize('event reads (under load)', *loaded)
+    summarize('calendar requests', *calendar_result['result'])
+
+
+if __name__ == '__main__':
+    main()